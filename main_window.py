@@ -1,24 +1,29 @@
 import os
+import copy
 import json
 import logging
 import re
+import time
 import pickle
 from path_manager import PathManager
 from datetime import datetime
+from bisect import bisect_left
 from collections import Counter
+from functools import cached_property
+from itertools import islice
 from PyQt5.QtWidgets import (QMainWindow, QVBoxLayout, QHBoxLayout, QWidget,
                              QPushButton, QTextEdit, QLabel, QMessageBox, QRadioButton,
                              QProgressBar, QFileDialog, QListWidget,
-                             QListWidgetItem, QToolBar, QStatusBar, QAction,
+                             QListWidgetItem, QAction,
                              QTreeWidget, QTreeWidgetItem, QInputDialog,
-                             QGroupBox, QSplitter, QMenu, QMenuBar, QDialog, QDialogButtonBox,
-                             QLineEdit, QFormLayout, QComboBox, QCheckBox, QTabWidget,
-                             QDoubleSpinBox, QFrame, QStackedWidget,
-                             QApplication, QHeaderView)
-from PyQt5.QtCore import Qt, QSettings, QThread, pyqtSignal, QTimer, QRegularExpression, QEvent, QMimeData, QAbstractNativeEventFilter
-from PyQt5.QtWidgets import QShortcut
-from PyQt5.QtGui import QFont, QColor, QTextCursor, QIcon, QKeySequence, QCursor
-from typing import Dict, List, Any, Optional
+                             QGroupBox, QSplitter, QMenu, QDialog, QDialogButtonBox,
+                             QLineEdit, QFormLayout, QComboBox, QCheckBox,
+                             QDoubleSpinBox, QStackedWidget,
+                             QApplication, QHeaderView, QShortcut)
+from PyQt5.QtCore import (Qt, QThread, QThreadPool, QRunnable, QObject, pyqtSignal, QTimer,
+                          QEvent, QAbstractNativeEventFilter)
+from PyQt5.QtGui import QFont, QColor, QTextCursor, QTextCharFormat, QKeySequence, QCursor
+from typing import Dict, List, Any, Optional, Tuple
 import traceback
 import ctypes
 from ctypes import wintypes
@@ -28,21 +33,59 @@ from model_manager import EnhancedModelManager
 from data_processor import DataProcessor
 from enhanced_coding_generator import EnhancedCodingGenerator
 from standard_answer_manager import StandardAnswerManager
-from training_manager import EnhancedTrainingManager
 from text_navigator import TextNavigator
 from grounded_theory_coder import GroundedTheoryCoder
-from word_exporter import WordExporter
-from model_downloader import ModelDownloader
 from manual_coding_dialog import ManualCodingDialog
 from config import Config
 from project_manager import ProjectManager
-from bert_finetuner import BERTFineTuner
-from bert_dataset import GroundedTheoryDataset, get_label_mapping
-from hyperparameter_optimizer import HyperparameterOptimizer
-import re
 
 logger = logging.getLogger(__name__)
 
+# Word 文档扩展名（按 read_word_file 读取）
+_WORD_EXTS = frozenset({'.docx', '.doc'})
+# 扩展名 -> loaded_files 中的 file_type，未知扩展名按 txt 处理
+_EXT_TO_TYPE = {'.docx': 'docx', '.doc': 'doc', '.txt': 'txt'}
+
+# 编码树 / 文本标记热路径使用的预编译正则
+_RE_CODE_PREFIX = re.compile(r'^[A-Z]\d+')                  # 编码编号前缀，如 "C01"
+# 一阶编码显示内容的前缀："A01 "、"1, 58 "（文件索引, 句子索引）、"[68] "/"68 "，按此顺序各至多一次
+_RE_LEADING_JUNK = re.compile(r'^(?:[A-Z]\d+\s+)?(?:\d+\s*,\s*\d+\s*)?(?:\[\d+\]\s+|\d+\s+)?')
+_RE_CODE_TAG_TOKEN = re.compile(r'\[[A-Z]\d+\]')            # 编码标记本身（不含前导空白）
+_RE_CODE_TAG = re.compile(r'\s*\[[A-Z]\d+\]')               # 编码标记及其前导空白
+_RE_ANY_TAG = re.compile(r'\s*\[[A-Z]?\d+\]')               # 编码标记 [A01] 或句子编号 [12]
+_RE_NUM_TAG = re.compile(r'\s*\[\d+\]')                     # 句子编号 [12] 及其前导空白
+_RE_LEADING_CODE = re.compile(r'^[A-Z]\d+\s+')              # 开头的编码编号及空白，如 "A01 "
+_RE_SID_MARKER = re.compile(r'\[(\d+)\]')                   # 句子编号（捕获数字）
+_RE_LEADING_SID = re.compile(r'^\s*\[(\d+)\]')              # 开头的句子编号
+_RE_TRAILING_SID = re.compile(r'^[。！？!?]?\s*\[(\d+)\]')     # 紧跟句子（可隔标点）的编号
+_RE_WS = re.compile(r'\s+')
+_RE_CODE_TAG_RUN = re.compile(r'(?:\s*\[[A-Z]\d+\])+')        # 连续的编码标记 [A01][B02]
+_RE_CODE_TAG_RUN_WS = re.compile(r'(?:\s*\[[A-Z]\d+\])+\s*')  # 同上，并吞掉其后的空白
+_RE_NON_BMP = re.compile('[\U00010000-\U0010FFFF]')       # 在 Qt 文档中占两个位置的字符
+
+
+def _to_utf16_spans(text: str, spans: List[Tuple[int, int]]) -> List[Tuple[int, int]]:
+    """把 text 上的 Python 下标区间换算为 QTextDocument 位置（按 UTF-16 计数，BMP 以外字符占两个位置）"""
+    wide = [m.start() for m in _RE_NON_BMP.finditer(text)]
+    if not wide:
+        return spans
+    return [(start + bisect_left(wide, start), end + bisect_left(wide, end)) for start, end in spans]
+
+# “关于”对话框内容
+_ABOUT_HTML = """
+<h2>扎根理论编码分析系统 v3.0</h2>
+<p>基于人工智能的扎根理论三级编码分析工具</p>
+<p>主要功能：</p>
+<ul>
+<li>支持多文件导入（TXT、Word）</li>
+<li>手动和自动编码生成</li>
+<li>模型训练和优化</li>
+<li>标准答案管理</li>
+<li>多种格式导出</li>
+</ul>
+<p>© 2025 质性研究实验室</p>
+"""
+
 
 # Windows 鼠标滚轮消息
 WM_MOUSEWHEEL = 0x020A
@@ -110,6 +153,8 @@ class DragDropTreeWidget(QTreeWidget):
         self.setAcceptDrops(True)
         self.setDropIndicatorShown(True)
         self.setDragDropMode(QTreeWidget.InternalMove)
+        # 各行均为单行文本、同一字体，统一行高可让展开/滚动时跳过逐行测量
+        self.setUniformRowHeights(True)
         
         font = QFont()
         font.setPixelSize(18)
@@ -377,6 +422,28 @@ class DragDropTreeWidget(QTreeWidget):
         return False, None
 
 
+class _WorkerSignals(QObject):
+    """后台任务信号（QRunnable 本身不是 QObject，不能定义信号）"""
+
+    finished = pyqtSignal(bool, str)
+
+
+class _FunctionWorker(QRunnable):
+    """在 QThreadPool 中执行一个返回 (success, message) 的函数"""
+
+    def __init__(self, fn):
+        super().__init__()
+        self.fn = fn
+        self.signals = _WorkerSignals()
+
+    def run(self):
+        try:
+            success, message = self.fn()
+        except Exception as e:
+            success, message = False, str(e)
+        self.signals.finished.emit(success, message)
+
+
 class ModelInitializationThread(QThread):
     """模型初始化线程"""
 
@@ -388,11 +455,6 @@ class ModelInitializationThread(QThread):
         self.model_downloader = model_downloader
         self.model_manager = model_manager
 
-        # 添加自定义信号
-        from PyQt5.QtCore import pyqtSignal
-        self._update_model_status_signal = pyqtSignal(bool, str)
-        self._update_model_status_signal.connect(self._on_model_initialization_finished)
-
     def run(self):
         try:
             self.progress_updated.emit("正在初始化模型...")
@@ -585,9 +647,17 @@ class TrainingConfigDialog(QDialog):
 class MainWindow(QMainWindow):
     """主窗口 - 扎根理论编码分析系统"""
 
+    PROGRESS_MIN_INTERVAL = 0.033  # 进度条两次刷新的最小间隔（秒）
+    HIGHLIGHT_DEBOUNCE_MS = 150  # 编码树单击高亮的防抖间隔（毫秒）
+    HIGHLIGHT_CACHE_SIZE = 32  # 内容定位缓存的最大条目数
+    MAX_HIGHLIGHT_MATCHES = 2000  # 单次高亮收集的最大匹配数
+    MIN_HIGHLIGHT_QUERY_LEN = 3  # 短于此长度的内容不做全文高亮
+
     def __init__(self, settings):
         super().__init__()
         self.settings = settings
+        # 缓存状态栏引用（statusBar() 每次调用都要查找/惰性创建）
+        self._status = self.statusBar()
         self.setup_managers()
         self.init_ui()
         self.load_settings()
@@ -596,38 +666,109 @@ class MainWindow(QMainWindow):
         # 启动模型初始化
         self.initialize_models_async()
 
-    def setup_managers(self):
-        """设置管理器"""
-        self.model_manager = EnhancedModelManager()
-        self.data_processor = DataProcessor()
-        # ===== 使用原有的 EnhancedCodingGenerator =====
-        self.coding_generator = EnhancedCodingGenerator()
+    # ===== 管理器：首次访问时创建（cached_property），缩短窗口启动时间 =====
+
+    @cached_property
+    def model_manager(self):
+        return EnhancedModelManager()
+
+    @cached_property
+    def data_processor(self):
+        return DataProcessor()
+
+    @cached_property
+    def coding_generator(self):
+        # 使用原有的 EnhancedCodingGenerator
         logger.info("使用原有的 EnhancedCodingGenerator")
-        # ===== 回退完成 =====
-        self.text_navigator = TextNavigator()
-        self.grounded_coder = GroundedTheoryCoder()
-        self.standard_answer_manager = StandardAnswerManager()
-        self.enhanced_training_manager = EnhancedTrainingManager()
-        self.word_exporter = WordExporter()
-        self.model_downloader = ModelDownloader()
+        return EnhancedCodingGenerator()
+
+    @cached_property
+    def text_navigator(self):
+        return TextNavigator()
+
+    @cached_property
+    def grounded_coder(self):
+        return GroundedTheoryCoder()
+
+    @cached_property
+    def standard_answer_manager(self):
+        return StandardAnswerManager()
 
+    @cached_property
+    def enhanced_training_manager(self):
+        from training_manager import EnhancedTrainingManager
+        manager = EnhancedTrainingManager()
         # 设置训练管理器的标准答案管理器
-        self.enhanced_training_manager.set_standard_answer_manager(self.standard_answer_manager)
+        manager.set_standard_answer_manager(self.standard_answer_manager)
+        return manager
 
-        # 初始化项目管理器
-        self.project_manager = ProjectManager()
+    @cached_property
+    def word_exporter(self):
+        from word_exporter import WordExporter
+        return WordExporter()
 
+    @cached_property
+    def model_downloader(self):
+        from model_downloader import ModelDownloader
+        return ModelDownloader()
+
+    @cached_property
+    def project_manager(self):
+        return ProjectManager()
+
+    def setup_managers(self):
+        """设置管理器状态（管理器实例见上方 cached_property，按需创建）"""
         # 数据存储
         self.loaded_files = {}
         self.structured_codes = {}
         self.current_model_type = "offline"
         self.model_initialized = False
 
+        # 文件列表索引：file_path -> QListWidgetItem
+        self._file_list_index: Dict[str, QListWidgetItem] = {}
+
+        # 进度条节流：上次刷新时间
+        self._last_progress_flush = 0.0
+
+        # 合并文本缓存：((文件名, 内容), ...) 与对应的合并结果
+        self._combined_text_cache: Optional[Tuple[tuple, str]] = None
+
+        # 句子查找：file_path -> (numbered_content, 去空白后的文本)
+        self._file_no_space_cache = {}
+
+        # 句子高亮：file_path -> (显示文本, {句子编号: [(起始, 结束), ...]})
+        self._sid_positions: Dict[str, Tuple[str, Dict[str, List[Tuple[int, int]]]]] = {}
+
+        # 当前 text_display 显示的文件（由 _display_file / 编码标记显示维护，切换页面时置 None），用于跳过重复切换
+        self._current_displayed_file: Optional[str] = None
+
+        # 文本框文档内容每变化一次加一，用于判断按文档内容记录的缓存是否仍然有效
+        self._document_generation = 0
+
+        # 进行中的后台任务（导出、项目读写；持有引用直到完成）
+        self._background_workers = set()
+        # 项目读写与导出专用线程池（单线程，按提交顺序执行）；关闭窗口时只等待这些任务，
+        # 不受全局线程池中重排序模型预加载等任务的影响
+        self._io_pool = QThreadPool(self)
+        self._io_pool.setMaxThreadCount(1)
+
+        # 自动编码编号缓存 - file_path -> ((内容, 文件名, 起始编号), 编号文本, 编号映射, 结束编号)
+        self._number_cache: Dict[str, Tuple[Tuple[str, str, int], str, Dict[int, str], int]] = {}
+
         # 自动编码缓存 - 用于存储自动编码生成的文本内容
         self.auto_coding_cache = {}
         # 编码标记映射 - 用于存储一阶编码与文本位置的映射
         self.code_markers_map = {}
 
+        # 编码树构建时收集的文本标记 [{'clean_content', 'code_id'}]，按内容长度降序
+        self._all_code_marks = []
+
+        # 上次编码标记显示：((文件, 原文, 标记), 显示文本)，用于跳过无变化的重复标记
+        self._last_display_key: Tuple[Optional[tuple], str] = (None, '')
+
+        # 编码ID -> 一阶编码内容，供 get_content_by_code_id 直接查表
+        self._code_id_to_content: Dict[str, str] = {}
+
         # 撤回功能状态
         self._is_undo_operation = False
         self._undo_stack = []
@@ -644,6 +785,8 @@ class MainWindow(QMainWindow):
 
         # 文件列表
         self.file_list = QListWidget()
+        # 各项均为单行文件名，统一尺寸，免去逐项计算尺寸
+        self.file_list.setUniformItemSizes(True)
         self.file_list.itemClicked.connect(self.on_file_selected)
         file_layout.addWidget(self.file_list)
 
@@ -881,7 +1024,7 @@ class MainWindow(QMainWindow):
         except Exception as e:
             error_message = f"查看编码库失败: {str(e)}"
             QMessageBox.critical(self, "错误", error_message)
-            self.statusBar().showMessage(f"查看编码库失败: {str(e)}")
+            self._status.showMessage(f"查看编码库失败: {str(e)}")
 
     def edit_coding_library(self):
         """编辑编码库内容"""
@@ -1228,7 +1371,7 @@ class MainWindow(QMainWindow):
         except Exception as e:
             error_message = f"编辑编码库失败: {str(e)}"
             QMessageBox.critical(self, "错误", error_message)
-            self.statusBar().showMessage(f"编辑编码库失败: {str(e)}")
+            self._status.showMessage(f"编辑编码库失败: {str(e)}")
 
     def visualize_training_results(self):
         """读取训练模型并生成可视化结果图"""
@@ -1741,68 +1884,18 @@ class MainWindow(QMainWindow):
             self.init_model_btn.setEnabled(True)
 
     def _do_model_initialization(self):
-        """执行模型初始化"""
+        """执行模型初始化（后台线程：初始化失败时自动尝试下载）"""
         try:
-            # 尝试初始化模型
-            model_success = self.model_manager.initialize_models()
-
-            if model_success:
-                self.model_initialized = True
-                self.model_status_label.setText("模型状态: 已就绪")
-                self.statusBar().showMessage("模型初始化成功")
-                logger.info("模型初始化成功")
-
-                # 可选：启动即预加载“一阶抽象候选重排序”模型（独立于二/三阶分类模型）
-                self._preload_abstract_reranker_async()
-            else:
-                # 模型初始化失败，尝试下载
-                self.statusBar().showMessage("模型不存在，尝试下载...")
-                self._download_models_async()
+            self._init_thread = ModelInitializationThread(self.model_downloader, self.model_manager)
+            self._init_thread.progress_updated.connect(self.update_status)
+            self._init_thread.initialization_finished.connect(self._on_model_initialization_finished)
+            self._init_thread.start()
 
         except Exception as e:
             logger.error(f"模型初始化异常: {e}")
             self.model_status_label.setText("模型状态: 初始化异常")
             self.init_model_btn.setEnabled(True)
-            self.statusBar().showMessage(f"模型初始化异常: {str(e)}")
-
-    def _download_models_async(self):
-        """异步下载模型"""
-        try:
-            from PyQt5.QtCore import QThread, pyqtSignal
-            import threading
-
-            # 创建本地信号用于线程安全更新UI
-            update_signal = pyqtSignal(bool, str)
-            update_signal.connect(self._on_model_initialization_finished)
-
-            def download_in_thread():
-                try:
-                    logger.info("开始下载模型...")
-                    success = self.model_downloader.download_all_models()
-                    if success:
-                        # 下载成功后重新初始化
-                        model_success = self.model_manager.initialize_models()
-                        if model_success:
-                            # 下载并初始化成功后，也尝试预加载抽象重排序模型
-                            self._preload_abstract_reranker_async()
-                            # 使用信号更新UI
-                            update_signal.emit(True, "模型下载并初始化成功")
-                        else:
-                            update_signal.emit(False, "模型下载成功但初始化失败")
-                    else:
-                        update_signal.emit(False, "模型下载失败")
-                except Exception as e:
-                    update_signal.emit(False, f"模型下载异常: {str(e)}")
-
-            # 创建线程下载
-            download_thread = threading.Thread(target=download_in_thread)
-            download_thread.daemon = True
-            download_thread.start()
-
-        except Exception as e:
-            logger.error(f"启动模型下载失败: {e}")
-            self.model_status_label.setText("模型状态: 下载失败")
-            self.init_model_btn.setEnabled(True)
+            self._status.showMessage(f"模型初始化异常: {str(e)}")
 
     def _preload_abstract_reranker_async(self):
         """可选预加载一阶抽象重排序模型（后台线程，避免卡UI）。"""
@@ -1810,25 +1903,25 @@ class MainWindow(QMainWindow):
             if not bool(getattr(Config, 'ENABLE_ABSTRACT_RERANKER', False)):
                 return
 
-            import threading
-
             def _load():
-                try:
-                    ok = self.model_manager.load_abstract_reranker_model()
-                    if ok:
-                        logger.info("抽象重排序模型预加载成功")
-                    else:
-                        logger.info("抽象重排序模型未加载（可能未训练/目录不存在/依赖不可用）")
-                except Exception as e:
-                    logger.warning(f"抽象重排序模型预加载异常: {e}")
+                if self.model_manager.load_abstract_reranker_model():
+                    return True, "抽象重排序模型预加载成功"
+                return False, "抽象重排序模型未加载（可能未训练/目录不存在/依赖不可用）"
 
-            t = threading.Thread(target=_load)
-            t.daemon = True
-            t.start()
+            self._reranker_worker = _FunctionWorker(_load)
+            self._reranker_worker.signals.finished.connect(self._on_abstract_reranker_preloaded)
+            QThreadPool.globalInstance().start(self._reranker_worker)
 
         except Exception as e:
             logger.warning(f"启动抽象重排序模型预加载失败: {e}")
 
+    def _on_abstract_reranker_preloaded(self, success, message):
+        """抽象重排序模型预加载完成"""
+        if success:
+            logger.info(message)
+        else:
+            logger.info(f"抽象重排序模型预加载: {message}")
+
     # 添加信号处理
     def _on_model_initialization_finished(self, success, message):
         """模型初始化完成"""
@@ -1836,10 +1929,14 @@ class MainWindow(QMainWindow):
         if success:
             self.model_status_label.setText("模型状态: 已就绪")
             self.model_initialized = True
-            self.statusBar().showMessage("模型初始化成功")
+            self._status.showMessage(message or "模型初始化成功")
+            logger.info(message or "模型初始化成功")
+
+            # 可选：预加载“一阶抽象候选重排序”模型（独立于二/三阶分类模型）
+            self._preload_abstract_reranker_async()
         else:
             self.model_status_label.setText("模型状态: 初始化失败")
-            self.statusBar().showMessage(f"模型初始化失败: {message}")
+            self._status.showMessage(f"模型初始化失败: {message}")
             # 不显示警告框，避免阻塞
             logger.warning(f"模型初始化失败: {message}")
 
@@ -1849,15 +1946,15 @@ class MainWindow(QMainWindow):
         if success:
             self.model_status_label.setText("模型状态: 已就绪")
             self.model_initialized = True
-            self.statusBar().showMessage("模型初始化成功")
+            self._status.showMessage("模型初始化成功")
         else:
             self.model_status_label.setText("模型状态: 初始化失败")
-            self.statusBar().showMessage(f"模型初始化失败: {message}")
+            self._status.showMessage(f"模型初始化失败: {message}")
             QMessageBox.warning(self, "模型初始化失败", message)
 
     def update_status(self, message):
         """更新状态"""
-        self.statusBar().showMessage(message)
+        self._status.showMessage(message)
 
     def import_files(self):
         """导入文件"""
@@ -1869,38 +1966,43 @@ class MainWindow(QMainWindow):
         if not file_paths:
             return
 
-        for file_path in file_paths:
-            try:
-                # 读取文件
-                file_lower = file_path.lower()
-                if file_lower.endswith('.docx') or file_lower.endswith('.doc'):
-                    content = self.data_processor.read_word_file(file_path)
-                else:
-                    content = self.data_processor.read_text_file(file_path)
+        # 批量插入：暂停列表刷新与信号，循环结束后统一重绘
+        self.file_list.setUpdatesEnabled(False)
+        self.file_list.blockSignals(True)
+        try:
+            for file_path in file_paths:
+                try:
+                    # 读取文件
+                    ext = os.path.splitext(file_path)[1].lower()
+                    if ext in _WORD_EXTS:
+                        content = self.data_processor.read_word_file(file_path)
+                    else:
+                        content = self.data_processor.read_text_file(file_path)
 
-                filename = os.path.basename(file_path)
+                    filename = os.path.basename(file_path)
 
-                # 存储文件数据
-                self.loaded_files[file_path] = {
-                    'filename': filename,
-                    'file_path': file_path,
-                    'content': content,
-                    'file_type': 'docx' if file_path.lower().endswith('.docx') else 'doc' if file_path.lower().endswith(
-                        '.doc') else 'txt'
-                }
+                    # 存储文件数据
+                    self.loaded_files[file_path] = {
+                        'filename': filename,
+                        'file_path': file_path,
+                        'content': content,
+                        'file_type': _EXT_TO_TYPE.get(ext, 'txt')
+                    }
 
-                # 添加到文件列表
-                item = QListWidgetItem(filename)
-                item.setData(Qt.UserRole, file_path)
-                self.file_list.addItem(item)
+                    # 添加到文件列表
+                    self._add_file_list_item(file_path, filename)
 
-                logger.info(f"成功导入文件: {filename}")
+                    logger.info(f"成功导入文件: {filename}")
 
-            except Exception as e:
-                logger.error(f"导入文件失败 {file_path}: {e}")
-                QMessageBox.critical(self, "导入错误", f"导入文件失败: {str(e)}")
+                except Exception as e:
+                    logger.error(f"导入文件失败 {file_path}: {e}")
+                    QMessageBox.critical(self, "导入错误", f"导入文件失败: {str(e)}")
+        finally:
+            self.file_list.blockSignals(False)
+            self.file_list.setUpdatesEnabled(True)
+            self.file_list.viewport().update()
 
-        self.statusBar().showMessage(f"成功导入 {len(file_paths)} 个文件")
+        self._status.showMessage(f"成功导入 {len(file_paths)} 个文件")
 
     def _import_files_from_paths(self, file_paths):
         """通过文件路径列表导入文件（供 workspace 拖拽调用）"""
@@ -1916,6 +2018,46 @@ class MainWindow(QMainWindow):
         if hasattr(self.data_processor, 'loaded_files'):
             self.loaded_files.update(self.data_processor.loaded_files)
 
+    def _add_file_list_item(self, file_path: str, filename: str) -> QListWidgetItem:
+        """向文件列表添加一项并登记到索引"""
+        item = QListWidgetItem(filename)
+        item.setData(Qt.UserRole, file_path)
+        self.file_list.addItem(item)
+        self._file_list_index[file_path] = item
+        return item
+
+    def _clear_file_list(self):
+        """清空文件列表及其索引"""
+        self.file_list.clear()
+        self._file_list_index.clear()
+        self._current_displayed_file = None
+
+    def _rebuild_file_list(self, files):
+        """用 (文件路径, 文件名) 序列整体重建文件列表，期间暂停重绘、信号与排序"""
+        file_list = self.file_list
+        prev_sort = file_list.isSortingEnabled()
+        file_list.setUpdatesEnabled(False)
+        file_list.blockSignals(True)
+        file_list.setSortingEnabled(False)
+        try:
+            self._clear_file_list()
+            paths, names = [], []
+            for file_path, filename in files:
+                paths.append(file_path)
+                names.append(filename)
+            # 一次性添加全部文件名，再补挂路径数据并登记索引
+            file_list.addItems(names)
+            index = self._file_list_index
+            for row, file_path in enumerate(paths):
+                item = file_list.item(row)
+                item.setData(Qt.UserRole, file_path)
+                index[file_path] = item
+        finally:
+            file_list.setSortingEnabled(prev_sort)
+            file_list.blockSignals(False)
+            file_list.setUpdatesEnabled(True)
+            file_list.viewport().update()
+
     def remove_selected_file(self):
         """移除选中的文件"""
         current_item = self.file_list.currentItem()
@@ -1925,28 +2067,50 @@ class MainWindow(QMainWindow):
         file_path = current_item.data(Qt.UserRole)
         if file_path in self.loaded_files:
             del self.loaded_files[file_path]
+        self._number_cache.pop(file_path, None)
+        self._file_no_space_cache.pop(file_path, None)
+        self._sid_positions.pop(file_path, None)
+
+        self._file_list_index.pop(file_path, None)
 
         self.file_list.takeItem(self.file_list.currentRow())
         self.text_display.clear()
+        self._current_displayed_file = None
 
-        self.statusBar().showMessage("文件已移除")
+        self._status.showMessage("文件已移除")
 
     def on_file_selected(self, item):
         """文件选择事件"""
-        file_path = item.data(Qt.UserRole)
+        self._display_file(item.data(Qt.UserRole))
+
+    def _switch_to_file(self, file_path: str) -> bool:
+        """选中并同步显示指定文件（不触发列表信号、不重入事件循环），文件不在列表中时返回 False"""
+        item = self._file_list_index.get(file_path)
+        if item is None:
+            return False
+        self.file_list.blockSignals(True)
+        try:
+            self.file_list.setCurrentItem(item)
+        finally:
+            self.file_list.blockSignals(False)
+        self._display_file(file_path)
+        return True
 
+    def _display_file(self, file_path: str):
+        """在文本框中显示指定文件的内容"""
+        self._current_displayed_file = file_path
         # 优先显示自动编码缓存的内容（带有一阶编码标记）
         if hasattr(self, 'auto_coding_cache') and file_path in self.auto_coding_cache:
-            self.text_display.setText(self.auto_coding_cache[file_path])
+            self.text_display.setPlainText(self.auto_coding_cache[file_path])
             return
 
         if file_path in self.loaded_files:
             file_data = self.loaded_files[file_path]
             # 优先显示编号内容，如果存在的话
             if 'numbered_content' in file_data and file_data['numbered_content']:
-                self.text_display.setText(file_data['numbered_content'])
+                self.text_display.setPlainText(file_data['numbered_content'])
             else:
-                self.text_display.setText(file_data['content'])
+                self.text_display.setPlainText(file_data['content'])
 
     def on_model_type_changed(self, model_type):
         """模型类型改变"""
@@ -1955,9 +2119,9 @@ class MainWindow(QMainWindow):
                 QMessageBox.warning(self, "警告", "没有训练过的模型可用，请先训练模型")
                 self.model_type_combo.setCurrentText("离线编码")
             else:
-                self.statusBar().showMessage("切换到训练模型编码模式")
+                self._status.showMessage("切换到训练模型编码模式")
         else:
-            self.statusBar().showMessage("切换到离线编码模式")
+            self._status.showMessage("切换到离线编码模式")
 
     def _check_files_for_coding(self):
         """检查是否有可用的文件进行编码"""
@@ -1989,8 +2153,10 @@ class MainWindow(QMainWindow):
             for file_path, file_data in self.loaded_files.items():
                 if not isinstance(file_data, dict):
                     continue
-                    
-                processed_file_data = file_data.copy()
+
+                # 浅拷贝：文本字符串共享引用，不复制内容；
+                # 手动编码对话框会向各文件条目写入界面状态（content_with_marks），不能直接引用原字典
+                processed_file_data = dict(file_data)
 
                 if 'content' not in processed_file_data:
                     if 'original_content' in processed_file_data:
@@ -2001,11 +2167,13 @@ class MainWindow(QMainWindow):
                         processed_file_data['content'] = processed_file_data['original_text']
                     else:
                         try:
-                            file_lower = file_path.lower() if isinstance(file_path, str) else ""
-                            if file_lower.endswith('.docx') or file_lower.endswith('.doc'):
+                            ext = os.path.splitext(file_path)[1].lower() if isinstance(file_path, str) else ""
+                            if ext in _WORD_EXTS:
                                 content = self.data_processor.read_word_file(file_path)
                             else:
                                 content = self.data_processor.read_text_file(file_path)
+                            # 回写到原数据，后续调用不再重复读取文件
+                            file_data['content'] = content
                             processed_file_data['content'] = content
                         except Exception as e:
                             logger.error(f"重新读取文件失败 {file_path}: {e}")
@@ -2156,17 +2324,28 @@ class MainWindow(QMainWindow):
             self.progress_bar.setValue(0)
 
             # 第一步：按说话人块分句并编号（与 DataProcessor 分句逻辑一致，确保编号与编码单元对齐）
-            self.data_processor.numbering_manager.reset()
+            numbering_manager = self.data_processor.numbering_manager
+            numbering_manager.reset()
             for file_path, file_data in self.loaded_files.items():
                 content = file_data.get('content', '')
                 if content:
                     filename = file_data.get('filename', os.path.basename(file_path))
-                    sentences = self.data_processor.get_speaker_block_sentences(content, filename, clean=False)
-                    sentence_texts = [s['content'] for s in sentences]
-                    numbered_content, number_mapping = self.data_processor.numbering_manager.number_sentences(
-                        sentence_texts, filename)
+                    # 编号跨文件连续，结果取决于 (内容, 文件名, 起始编号)；键中保存内容本身（只是引用），
+                    # 比较时内容未被替换则按身份直接相等，哈希碰撞不会误用他人的编号结果
+                    cache_key = (content, filename, numbering_manager.sentence_counter)
+                    cached = self._number_cache.get(file_path)
+                    if cached is not None and cached[0] == cache_key:
+                        _, numbered_content, number_mapping, end_counter = cached
+                        numbering_manager.sentence_counter = end_counter
+                    else:
+                        sentences = self.data_processor.get_speaker_block_sentences(content, filename, clean=False)
+                        sentence_texts = [s['content'] for s in sentences]
+                        numbered_content, number_mapping = numbering_manager.number_sentences(
+                            sentence_texts, filename)
+                        self._number_cache[file_path] = (cache_key, numbered_content, number_mapping,
+                                                         numbering_manager.sentence_counter)
                     file_data['numbered_content'] = numbered_content
-                    file_data['numbered_mapping'] = number_mapping
+                    file_data['numbered_mapping'] = dict(number_mapping)
 
             self.progress_bar.setValue(10)
 
@@ -2291,7 +2470,7 @@ class MainWindow(QMainWindow):
             if self.file_list.currentItem():
                 self.on_file_selected(self.file_list.currentItem())
 
-            self.statusBar().showMessage("自动编码生成完成")
+            self._status.showMessage("自动编码生成完成")
 
         except Exception as e:
             self.progress_bar.setVisible(False)
@@ -2299,8 +2478,11 @@ class MainWindow(QMainWindow):
             QMessageBox.critical(self, "生成错误", f"生成编码失败: {str(e)}")
 
     def update_progress(self, value):
-        """更新进度"""
-        self.progress_bar.setValue(value)
+        """更新进度（约 30Hz 节流，合并高频回调引起的重绘）"""
+        now = time.monotonic()
+        if value >= 100 or now - self._last_progress_flush >= self.PROGRESS_MIN_INTERVAL:
+            self._last_progress_flush = now
+            self.progress_bar.setValue(value)
 
     def save_auto_coding_to_cache(self):
         """保存自动编码生成的文本内容到缓存"""
@@ -2349,7 +2531,6 @@ class MainWindow(QMainWindow):
                                                 first_level_codes.append((code_id, original_sentence))
 
                 # 为每个一阶编码添加标记
-                import re
                 for code_id, original_sentence in first_level_codes:
                     # 清理句子中的编码标记
                     clean_sentence = re.sub(r'\s*\[A\d+\]', '', original_sentence).strip()
@@ -2427,176 +2608,144 @@ class MainWindow(QMainWindow):
 
     def _count_codes(self, coding_structure):
         """统计编码结构中的三阶、二阶和一阶编码数量"""
-        count = {
-            'third': 0,
-            'second': 0,
-            'first': 0
-        }
-
-        if coding_structure:
-            count['third'] = len(coding_structure)
-            for third_cat, second_cats in coding_structure.items():
-                count['second'] += len(second_cats)
-                for second_cat, first_contents in second_cats.items():
-                    count['first'] += len(first_contents)
+        if not coding_structure:
+            return {'third': 0, 'second': 0, 'first': 0}
 
-        return count
+        values = coding_structure.values()
+        return {
+            'third': len(coding_structure),
+            'second': sum(map(len, values)),
+            'first': sum(len(first_contents) for second_cats in values
+                         for first_contents in second_cats.values())
+        }
 
     def _merge_coding_results(self, auto_codes, manual_codes):
         """合并手动编码结果和自动编码结构，保留自动编码，添加手动编码"""
         merged_codes = auto_codes.copy()
+        # 每个 (三阶, 二阶) 桶已有内容的集合，O(1) 判重
+        seen_sets: Dict[Tuple[str, str], set] = {}
 
         # 遍历手动编码结果，添加到自动编码结构中
         for third_cat, second_cats in manual_codes.items():
-            if third_cat not in merged_codes:
-                merged_codes[third_cat] = {}
+            merged_seconds = merged_codes.setdefault(third_cat, {})
 
             for second_cat, first_contents in second_cats.items():
-                if second_cat not in merged_codes[third_cat]:
-                    merged_codes[third_cat][second_cat] = []
+                bucket = merged_seconds.setdefault(second_cat, [])
 
                 # 添加新的一阶编码，避免重复
-                existing_contents = [content.get('content', '') for content in merged_codes[third_cat][second_cat] if
-                                     isinstance(content, dict)]
+                existing_contents = seen_sets.get((third_cat, second_cat))
+                if existing_contents is None:
+                    existing_contents = {self._merge_dedup_key(content.get('content', '')) for content in bucket
+                                         if isinstance(content, dict)}
+                    seen_sets[(third_cat, second_cat)] = existing_contents
                 for first_content in first_contents:
+                    # 字典按其 content 判重，其他格式按自身判重；键均可哈希，列表等值不会使集合判重抛 TypeError
                     if isinstance(first_content, dict):
-                        content_str = first_content.get('content', '')
-                        if content_str not in existing_contents:
-                            merged_codes[third_cat][second_cat].append(first_content)
-                            existing_contents.append(content_str)
+                        content_key = self._merge_dedup_key(first_content.get('content', ''))
                     else:
-                        # 处理非字典格式的内容
-                        if first_content not in existing_contents:
-                            merged_codes[third_cat][second_cat].append(first_content)
-                            existing_contents.append(first_content)
+                        content_key = self._merge_dedup_key(first_content)
+                    if content_key not in existing_contents:
+                        bucket.append(first_content)
+                        existing_contents.add(content_key)
 
         return merged_codes
 
+    @staticmethod
+    def _merge_dedup_key(content):
+        """一阶编码的判重键：可哈希值直接使用，否则退化为 (类型名, 规范化 JSON 串)，不会与字符串内容相撞"""
+        try:
+            hash(content)
+            return content
+        except TypeError:
+            return type(content).__name__, json.dumps(content, sort_keys=True, ensure_ascii=False, default=str)
+
     def update_coding_tree(self, target_tree=None):
         """更新编码树 - v4.0 支持指定目标树"""
         tree = target_tree or self.coding_tree
-        tree.clear()
 
-        if not self.structured_codes:
-            return
+        # 批量重建：暂停重绘/信号/排序/按内容调整列宽，整体挂载后一次性刷新
+        sorting_enabled = tree.isSortingEnabled()
+        tree.setSortingEnabled(False)
+        header = tree.header()
+        resize_modes = [header.sectionResizeMode(i) for i in range(header.count())]
+        for i, mode in enumerate(resize_modes):
+            if mode == QHeaderView.ResizeToContents:
+                header.setSectionResizeMode(i, QHeaderView.Fixed)
+        tree.setUpdatesEnabled(False)
+        tree.blockSignals(True)
+        try:
+            tree.clear()
 
-        for third_cat, second_cats in self.structured_codes.items():
-            third_item = QTreeWidgetItem(tree)
-            third_item.setText(0, third_cat)
-            third_item.setText(1, "三阶编码")
+            if not self.structured_codes:
+                return
 
-            # 计算三阶编码的统计数据
-            third_first_count = 0
-            third_file_sources = set()
-            third_sentence_sources = set()
-            third_code_ids = []
+            tree.addTopLevelItems(self._build_coding_tree_items())
+            tree.expandAll()
+        finally:
+            tree.blockSignals(False)
+            for i, mode in enumerate(resize_modes):
+                if mode == QHeaderView.ResizeToContents:
+                    header.setSectionResizeMode(i, mode)
+            tree.setSortingEnabled(sorting_enabled)
+            tree.setUpdatesEnabled(True)
 
-            for second_cat, first_contents in second_cats.items():
-                for content_data in first_contents:
-                    third_first_count += 1
-
-                    if isinstance(content_data, dict):
-                        code_id = content_data.get('code_id', '')
-                        sentence_details = content_data.get('sentence_details', [])
-
-                        # 添加编码ID
-                        if code_id:
-                            third_code_ids.append(code_id)
-
-                        # 添加文件来源和句子来源
-                        for sentence in sentence_details:
-                            if isinstance(sentence, dict):
-                                file_path = sentence.get('file_path', '')
-                                sentence_id = sentence.get('sentence_id', '')
-
-                                if file_path:
-                                    third_file_sources.add(file_path)
-                                if sentence_id:
-                                    third_sentence_sources.add(str(sentence_id))
-                    else:
-                        # 处理非字典格式的内容
-                        third_code_ids.append("")
+        # 更新统计
+        total_third = len(self.structured_codes)
+        total_second = sum(len(cats) for cats in self.structured_codes.values())
+        total_first = sum(len(contents) for cats in self.structured_codes.values() for contents in cats.values())
 
-            # 设置三阶编码的统计信息
-            third_item.setText(2, str(len(second_cats)))  # 二阶编码数量
-            third_item.setText(3, str(len(third_file_sources)))  # 文件来源数
-            # 暂时设置为0，后面会根据子二阶编码累加更新
-            third_item.setText(4, "0")  # 句子来源数（稍后更新）
+        self._status.showMessage(f"编码结构: {total_third}三阶, {total_second}二阶, {total_first}一阶")
 
-            # Extracts ID like "C01" from "C01 Category"
-            third_id_match = re.match(r'^[A-Z]\d+', third_cat)
-            third_id_display = third_id_match.group(0) if third_id_match else ""
-            third_item.setText(5, third_id_display)  # 关联编号显示自身编号
+        # 更新语义健康摘要 (Phase 3)
+        self._update_semantic_health_summary()
 
-            third_item.setData(0, Qt.UserRole, {"level": 3, "name": third_cat})
+        # 更新文本显示，添加编号标记
+        self.update_text_display_with_codes()
+
+    def _build_coding_tree_items(self) -> List[QTreeWidgetItem]:
+        """根据 structured_codes 构建编码树的顶层节点列表（节点未挂载到树上）"""
+        top_items = []
+        sentence_index = self._build_sentence_id_index()
+        all_code_marks = []
+        code_content_index = {}
+
+        # 预先将非字典格式的一阶内容规范化为统一字典，后续循环直接按字典访问
+        normalized = {
+            third_cat: {
+                second_cat: [
+                    c if isinstance(c, dict) else {
+                        'content': str(c), 'numbered_content': str(c),
+                        'code_id': '', 'sentence_details': []
+                    }
+                    for c in contents
+                ]
+                for second_cat, contents in second_cats.items()
+            }
+            for third_cat, second_cats in self.structured_codes.items()
+        }
+
+        # 各层节点先计算完统计数据，再用列文本列表一次性构造
+        for third_cat, second_cats in normalized.items():
+            # 三阶编码的文件来源由各一阶编码的文件来源合并而来（见下方一阶循环）
+            third_file_sources = set()
 
             # 用于累加三阶编码的句子来源数
             third_total_sentence_count = 0
 
+            second_items = []
             for second_cat, first_contents in second_cats.items():
-                second_item = QTreeWidgetItem(third_item)
-                second_item.setText(0, second_cat)
-                second_item.setText(1, "二阶编码")
-
-                # 计算二阶编码的统计数据
-                second_first_count = len(first_contents)
-                second_file_sources = set()
-                second_sentence_sources = set()
-                second_code_ids = []
-
-                for content_data in first_contents:
-                    if isinstance(content_data, dict):
-                        code_id = content_data.get('code_id', '')
-                        sentence_details = content_data.get('sentence_details', [])
-
-                        # 添加编码ID
-                        if code_id:
-                            second_code_ids.append(code_id)
-
-                        # 添加文件来源和句子来源
-                        for sentence in sentence_details:
-                            if isinstance(sentence, dict):
-                                file_path = sentence.get('file_path', '')
-                                sentence_id = sentence.get('sentence_id', '')
-
-                                if file_path:
-                                    second_file_sources.add(file_path)
-                                if sentence_id:
-                                    second_sentence_sources.add(str(sentence_id))
-                    else:
-                        # 处理非字典格式的内容
-                        second_code_ids.append("")
-
-                # 设置二阶编码的统计信息
-                second_item.setText(2, str(second_first_count))  # 一阶编码数量
-                second_item.setText(3, "")  # 二阶编码不显示文件来源数
-                # 暂时设置为0，后面会根据子一阶编码累加更新
-                second_item.setText(4, "0")  # 句子来源数（稍后更新）
-
-                # Extracts ID like "B01" from "B01 Category"
-                second_id_match = re.match(r'^[A-Z]\d+', second_cat)
-                second_id_display = second_id_match.group(0) if second_id_match else ""
-                second_item.setText(5, second_id_display)  # 关联编号显示自身编号
-
-                second_item.setData(0, Qt.UserRole, {"level": 2, "name": second_cat, "parent": third_cat})
-
                 # 用于累加二阶编码的句子来源数
                 second_total_sentence_count = 0
 
+                first_items = []
                 for content_data in first_contents:
-                    first_item = QTreeWidgetItem(second_item)
-
-                    if isinstance(content_data, dict):
-                        # 显示带编号的完整内容
-                        numbered_content = content_data.get('numbered_content', '')
-                        content = content_data.get('content', '')
-                        code_id = content_data.get('code_id', '')
-                        sentence_details = content_data.get('sentence_details', [])
-                    else:
-                        numbered_content = str(content_data)
-                        content = str(content_data)
-                        code_id = ""
-                        sentence_details = []
+                    # 显示带编号的完整内容
+                    numbered_content = content_data.get('numbered_content', '')
+                    content = content_data.get('content', '')
+                    code_id = content_data.get('code_id', '')
+                    sentence_details = content_data.get('sentence_details', [])
+                    if code_id and content:
+                        code_content_index.setdefault(code_id, content)
 
                     # 计算一阶编码的统计数据
                     first_file_sources = set()
@@ -2611,6 +2760,7 @@ class MainWindow(QMainWindow):
                                 first_file_sources.add(file_path)
                             if sentence_id:
                                 first_sentence_sources.add(str(sentence_id))
+                    third_file_sources |= first_file_sources
 
                     # 修复：将句子编号替换为所属一阶编码的编号
                     if code_id and numbered_content:
@@ -2624,23 +2774,14 @@ class MainWindow(QMainWindow):
                         else:
                             original_content = content_text
 
-                        # 移除可能的类似 A1, A01 的前缀
-                        original_content = re.sub(r'^[A-Z]\d+\s+', '', original_content)
-                        # 移除 "1, 58 " 这种格式 (文件索引, 句子索引)
-                        original_content = re.sub(r'^\d+\s*,\s*\d+\s*', '', original_content)
-                        # 移除 "68 " 或 "[68] " 或 "1 " 这种格式
-                        original_content = re.sub(r'^(?:\[\d+\]|\d+)\s+', '', original_content)
+                        # 依次移除 "A01 "、"1, 58 "（文件索引, 句子索引）、"68 "/"[68] " 前缀（单次扫描）
+                        original_content = _RE_LEADING_JUNK.sub('', original_content, count=1)
 
                         # 使用一阶编码编号作为前缀
                         display_content = f"{code_id} {original_content}"
                     else:
                         display_content = numbered_content
 
-                    # 在树中显示带编号的内容
-                    first_item.setText(0, display_content)
-                    first_item.setText(1, "一阶编码")
-                    first_item.setText(2, "1")
-
                     # 提取句子编号用于关联编号列
                     extracted_sentence_ids = []
 
@@ -2653,66 +2794,37 @@ class MainWindow(QMainWindow):
                                 continue
 
                             # 清理内容：移除所有标记，只保留纯文本
-                            sent_content_clean = re.sub(r'\s*\[[A-Z]\d+\]', '', sent_content)
-                            sent_content_clean = re.sub(r'\s*\[\d+\]', '', sent_content_clean)
+                            sent_content_clean = _RE_ANY_TAG.sub('', sent_content)
                             sent_content_clean = sent_content_clean.strip()
 
+                            # 顺带收集文本标记，供 update_text_display_with_codes 复用
+                            if sent_content_clean and code_id:
+                                all_code_marks.append({
+                                    'clean_content': sent_content_clean,
+                                    'code_id': code_id
+                                })
+
                             # 如果清理后的内容太短，跳过
                             if len(sent_content_clean) < 5:
                                 continue
 
-                            # 在所有已加载文件的numbered_content中查找
-                            for file_path_iter, file_data_iter in self.loaded_files.items():
-                                file_numbered = file_data_iter.get('numbered_content', '')
-                                if not file_numbered:
-                                    continue
-
-                                # 尝试查找句子内容
-                                # 方法1：直接查找
-                                pos = file_numbered.find(sent_content_clean)
-
-                                # 方法2：如果方法1失败，尝试查找前50个字符
-                                if pos < 0 and len(sent_content_clean) > 50:
-                                    pos = file_numbered.find(sent_content_clean[:50])
-
-                                # 方法3：如果还失败，尝试去除所有空白后查找
-                                if pos < 0:
-                                    sent_no_space = re.sub(r'\s+', '', sent_content_clean)
-                                    file_no_space = re.sub(r'\s+', '', file_numbered)
-                                    pos_no_space = file_no_space.find(sent_no_space)
-                                    if pos_no_space >= 0:
-                                        # 找到了，但需要转换回原始位置
-                                        # 简化处理：直接在原文中用正则匹配
-                                        pattern = re.escape(sent_content_clean[:min(30, len(sent_content_clean))])
-                                        match = re.search(pattern, file_numbered)
-                                        if match:
-                                            pos = match.start()
-
-                                if pos >= 0:
-                                    # 向后查找紧跟在句子后的编号 [N]
-                                    text_after_start = pos + len(sent_content_clean)
-                                    text_after = file_numbered[text_after_start:text_after_start + 100]
-
-                                    # 查找紧跟的第一个 [数字]
-                                    # 允许中间有标点符号
-                                    match = re.search(r'^[。！？!?]?\s*\[(\d+)\]', text_after)
-                                    if match:
-                                        sentence_id = match.group(1)
-                                        if sentence_id not in extracted_sentence_ids:
-                                            extracted_sentence_ids.append(sentence_id)
-                                        break  # 找到了就不再查找其他文件
+                            # 先查句子索引，未命中再在各文件 numbered_content 中逐一查找
+                            sentence_id = sentence_index.get(sent_content_clean)
+                            if sentence_id is None:
+                                sentence_id = self._search_sentence_id_in_files(
+                                    sent_content_clean, match_without_whitespace=True)
+                            if sentence_id and sentence_id not in extracted_sentence_ids:
+                                extracted_sentence_ids.append(sentence_id)
 
                     # 方法2：如果方法1失败，尝试从numbered_content开头提取
                     if not extracted_sentence_ids and numbered_content:
-                        match = re.search(r'^\s*\[(\d+)\]', numbered_content.strip())
+                        match = _RE_LEADING_SID.search(numbered_content.strip())
                         if match:
                             extracted_sentence_ids.append(match.group(1))
 
                     # 修复：确保文件来源和句子来源至少为1（自动编码时）
                     file_source_count = len(first_file_sources) if first_file_sources else 1
                     sentence_source_count = len(first_sentence_sources) if first_sentence_sources else 1
-                    first_item.setText(3, str(file_source_count))  # 文件来源数
-                    first_item.setText(4, str(sentence_source_count))  # 句子来源数
 
                     # 累加到二阶编码的句子来源数
                     second_total_sentence_count += sentence_source_count
@@ -2741,14 +2853,15 @@ class MainWindow(QMainWindow):
 
                     if all_ids:
                         # 格式化显示句子编号，纯数字格式（如 1, 2, 3）
-                        ids = sorted(all_ids, key=lambda x: int(x) if x.isdigit() else float('inf'))
-                        # 移除可能的括号，只保留数字
-                        clean_ids = [sid.strip('[]') if isinstance(sid, str) else str(sid) for sid in ids]
-                        associated_id_display = ", ".join(clean_ids)
-
-                    first_item.setText(5, associated_id_display)  # 关联编号
-
-                    first_item.setData(0, Qt.UserRole, {
+                        associated_id_display = self._format_sentence_ids(all_ids)
+
+                    # 列：带编号的内容、类型、数量、文件来源数、句子来源数、关联编号
+                    first_item = QTreeWidgetItem([
+                        display_content, "一阶编码", "1",
+                        str(file_source_count), str(sentence_source_count), associated_id_display
+                    ])
+                    first_items.append(first_item)
+                    first_data = {
                         "level": 1,
                         "content": content,  # 原始内容，用于搜索
                         "numbered_content": numbered_content,  # 带编号的内容
@@ -2757,7 +2870,8 @@ class MainWindow(QMainWindow):
                         "core_category": third_cat,
                         "sentence_details": sentence_details,
                         "sentence_ids": list(all_ids)  # 存储句子编号列表，用于导航
-                    })
+                    }
+                    first_item.setData(0, Qt.UserRole, first_data)
 
                     # Grounding gate: red-mark severe drift nodes
                     trace = self.coding_generator.get_first_level_trace_meta()
@@ -2768,35 +2882,49 @@ class MainWindow(QMainWindow):
                             f"严重语义漂移 (drift={drift_score:.2f})\n"
                             f"原文: {trace[code_id].get('normalized', content)[:80]}...")
 
-                # 更新二阶编码的句子来源数（所有子一阶编码的句子来源数之和）
-                second_item.setText(4, str(second_total_sentence_count))
+                # Extracts ID like "B01" from "B01 Category"
+                second_id_match = _RE_CODE_PREFIX.match(second_cat)
+                second_id_display = second_id_match.group(0) if second_id_match else ""
+
+                # 二阶编码不显示文件来源数；句子来源数为所有子一阶编码的句子来源数之和；关联编号显示自身编号
+                second_item = QTreeWidgetItem([
+                    second_cat, "二阶编码", str(len(first_contents)),
+                    "", str(second_total_sentence_count), second_id_display
+                ])
+                second_items.append(second_item)
+                second_item.setData(0, Qt.UserRole, {"level": 2, "name": second_cat, "parent": third_cat})
+                second_item.addChildren(first_items)
+
                 # 累加到三阶编码的句子来源数
                 third_total_sentence_count += second_total_sentence_count
 
-            # 更新三阶编码的句子来源数（所有子二阶编码的句子来源数之和）
-            third_item.setText(2, str(len(second_cats)))  # 二阶编码数量
-            third_item.setText(4, str(third_total_sentence_count))  # 句子来源数
+            # Extracts ID like "C01" from "C01 Category"
+            third_id_match = _RE_CODE_PREFIX.match(third_cat)
+            third_id_display = third_id_match.group(0) if third_id_match else ""
+
+            # 句子来源数为所有子二阶编码的句子来源数之和；关联编号显示自身编号
+            third_item = QTreeWidgetItem([
+                third_cat, "三阶编码", str(len(second_cats)),
+                str(len(third_file_sources)), str(third_total_sentence_count), third_id_display
+            ])
+            top_items.append(third_item)
+            third_item.setData(0, Qt.UserRole, {"level": 3, "name": third_cat})
+            third_item.addChildren(second_items)
 
         # 显示未分类的一阶编码（直接在树根）
-        for third_cat, second_cats in self.structured_codes.items():
+        for third_cat, second_cats in normalized.items():
             if third_cat != "__unclassified__":
                 continue
             for second_cat, first_contents in second_cats.items():
                 if second_cat != "__unclassified_second__":
                     continue
                 for content_data in first_contents:
-                    first_item = QTreeWidgetItem(tree)
-
-                    if isinstance(content_data, dict):
-                        numbered_content = content_data.get('numbered_content', '')
-                        content = content_data.get('content', '')
-                        code_id = content_data.get('code_id', '')
-                        sentence_details = content_data.get('sentence_details', [])
-                    else:
-                        numbered_content = str(content_data)
-                        content = str(content_data)
-                        code_id = ""
-                        sentence_details = []
+                    numbered_content = content_data.get('numbered_content', '')
+                    content = content_data.get('content', '')
+                    code_id = content_data.get('code_id', '')
+                    sentence_details = content_data.get('sentence_details', [])
+                    if code_id and content:
+                        code_content_index.setdefault(code_id, content)
 
                     first_file_sources = set()
                     first_sentence_sources = set()
@@ -2811,12 +2939,6 @@ class MainWindow(QMainWindow):
                             if sentence_id:
                                 first_sentence_sources.add(str(sentence_id))
 
-                    display_content = numbered_content
-
-                    first_item.setText(0, display_content)
-                    first_item.setText(1, "一阶编码")
-                    first_item.setText(2, str(len(sentence_details)) if sentence_details else "1")
-
                     extracted_sentence_ids = []
 
                     for sentence in sentence_details:
@@ -2824,37 +2946,23 @@ class MainWindow(QMainWindow):
                             sent_content = sentence.get('original_content', '') or sentence.get('content', '')
                             if not sent_content:
                                 continue
-                            sent_content_clean = re.sub(r'\s*\[[A-Z]\d+\]', '', sent_content)
-                            sent_content_clean = re.sub(r'\s*\[\d+\]', '', sent_content_clean)
+                            sent_content_clean = _RE_ANY_TAG.sub('', sent_content)
                             sent_content_clean = sent_content_clean.strip()
                             if len(sent_content_clean) < 5:
                                 continue
-                            for file_path_iter, file_data_iter in self.loaded_files.items():
-                                file_numbered = file_data_iter.get('numbered_content', '')
-                                if not file_numbered:
-                                    continue
-                                pos = file_numbered.find(sent_content_clean)
-                                if pos < 0 and len(sent_content_clean) > 50:
-                                    pos = file_numbered.find(sent_content_clean[:50])
-                                if pos >= 0:
-                                    text_after_start = pos + len(sent_content_clean)
-                                    text_after = file_numbered[text_after_start:text_after_start + 100]
-                                    match = re.search(r'^[。！？!?]?\s*\[(\d+)\]', text_after)
-                                    if match:
-                                        sentence_id = match.group(1)
-                                        if sentence_id not in extracted_sentence_ids:
-                                            extracted_sentence_ids.append(sentence_id)
-                                        break
+                            sentence_id = sentence_index.get(sent_content_clean)
+                            if sentence_id is None:
+                                sentence_id = self._search_sentence_id_in_files(sent_content_clean)
+                            if sentence_id and sentence_id not in extracted_sentence_ids:
+                                extracted_sentence_ids.append(sentence_id)
 
                     if not extracted_sentence_ids and numbered_content:
-                        match = re.search(r'^\s*\[(\d+)\]', numbered_content.strip())
+                        match = _RE_LEADING_SID.search(numbered_content.strip())
                         if match:
                             extracted_sentence_ids.append(match.group(1))
 
                     file_source_count = len(first_file_sources) if first_file_sources else 1
                     sentence_source_count = len(first_sentence_sources) if first_sentence_sources else 1
-                    first_item.setText(3, str(file_source_count))
-                    first_item.setText(4, str(sentence_source_count))
 
                     all_ids = set()
                     all_ids.update(first_sentence_sources)
@@ -2872,13 +2980,15 @@ class MainWindow(QMainWindow):
 
                     associated_id_display = ""
                     if all_ids:
-                        ids = sorted(all_ids, key=lambda x: int(x) if x.isdigit() else float('inf'))
-                        clean_ids = [sid.strip('[]') if isinstance(sid, str) else str(sid) for sid in ids]
-                        associated_id_display = ", ".join(clean_ids)
-
-                    first_item.setText(5, associated_id_display)
-
-                    first_item.setData(0, Qt.UserRole, {
+                        associated_id_display = self._format_sentence_ids(all_ids)
+
+                    first_item = QTreeWidgetItem([
+                        numbered_content, "一阶编码",
+                        str(len(sentence_details)) if sentence_details else "1",
+                        str(file_source_count), str(sentence_source_count), associated_id_display
+                    ])
+                    top_items.append(first_item)
+                    first_data = {
                         "level": 1,
                         "content": content,
                         "numbered_content": numbered_content,
@@ -2886,22 +2996,83 @@ class MainWindow(QMainWindow):
                         "sentence_details": sentence_details,
                         "sentence_ids": list(all_ids),
                         "classified": False
-                    })
+                    }
+                    first_item.setData(0, Qt.UserRole, first_data)
 
-        tree.expandAll()
+        # 按内容长度降序，长句优先打标记
+        all_code_marks.sort(key=lambda x: len(x['clean_content']), reverse=True)
+        self._all_code_marks = all_code_marks
+        self._code_id_to_content = code_content_index
 
-        # 更新统计
-        total_third = len(self.structured_codes)
-        total_second = sum(len(cats) for cats in self.structured_codes.values())
-        total_first = sum(len(contents) for cats in self.structured_codes.values() for contents in cats.values())
+        return top_items
 
-        self.statusBar().showMessage(f"编码结构: {total_third}三阶, {total_second}二阶, {total_first}一阶")
+    @staticmethod
+    def _format_sentence_ids(ids) -> str:
+        """句子编号排序后拼接显示：数字编号按数值升序在前，其余按字符串排序在后"""
+        num_ids = sorted((x for x in ids if x.isdigit()), key=int)
+        other_ids = sorted(x.strip('[]') for x in ids if not x.isdigit())
+        return ", ".join(num_ids + other_ids)
 
-        # 更新语义健康摘要 (Phase 3)
-        self._update_semantic_health_summary()
+    def _build_sentence_id_index(self) -> Dict[str, str]:
+        """一次遍历各文件 numbered_content，建立 句子文本 -> 紧随其后的句子编号 索引"""
+        index = {}
+        for file_data in self.loaded_files.values():
+            file_numbered = file_data.get('numbered_content', '')
+            if not file_numbered:
+                continue
+            prev_end = 0
+            for match in _RE_SID_MARKER.finditer(file_numbered):
+                sentence = file_numbered[prev_end:match.start()].strip()
+                prev_end = match.end()
+                if not sentence:
+                    continue
+                sentence_id = match.group(1)
+                index.setdefault(sentence, sentence_id)
+                # 句末标点可出现在句子与编号之间，去掉标点的写法同样可命中
+                if len(sentence) > 1 and sentence[-1] in '。！？!?':
+                    index.setdefault(sentence[:-1], sentence_id)
+        return index
+
+    def _search_sentence_id_in_files(self, sent_content_clean, match_without_whitespace=False):
+        """在各文件 numbered_content 中查找句子，返回紧跟其后的句子编号 [N]，未找到返回 None"""
+        for file_path_iter, file_data_iter in self.loaded_files.items():
+            file_numbered = file_data_iter.get('numbered_content', '')
+            if not file_numbered:
+                continue
 
-        # 更新文本显示，添加编号标记
-        self.update_text_display_with_codes()
+            # 方法1：直接查找
+            pos = file_numbered.find(sent_content_clean)
+
+            # 方法2：如果方法1失败，尝试查找前50个字符
+            if pos < 0 and len(sent_content_clean) > 50:
+                pos = file_numbered.find(sent_content_clean[:50])
+
+            # 方法3：如果还失败，尝试去除所有空白后查找
+            if pos < 0 and match_without_whitespace:
+                sent_no_space = _RE_WS.sub('', sent_content_clean)
+                # 去空白后的文件文本按文件缓存，内容对象变化时重新计算
+                cached = self._file_no_space_cache.get(file_path_iter)
+                if cached is None or cached[0] is not file_numbered:
+                    cached = (file_numbered, _RE_WS.sub('', file_numbered))
+                    self._file_no_space_cache[file_path_iter] = cached
+                file_no_space = cached[1]
+                pos_no_space = file_no_space.find(sent_no_space)
+                if pos_no_space >= 0:
+                    # 找到了，但需要转换回原始位置
+                    # 简化处理：直接在原文中用正则匹配
+                    pattern = re.escape(sent_content_clean[:min(30, len(sent_content_clean))])
+                    match = re.search(pattern, file_numbered)
+                    if match:
+                        pos = match.start()
+
+            if pos >= 0:
+                # 向后查找紧跟在句子后的编号 [N]，允许中间有标点符号
+                text_after_start = pos + len(sent_content_clean)
+                text_after = file_numbered[text_after_start:text_after_start + 100]
+                match = _RE_TRAILING_SID.search(text_after)
+                if match:
+                    return match.group(1)  # 找到了就不再查找其他文件
+        return None
 
     def update_text_display_with_codes(self):
         """更新文本显示，添加编码编号标记"""
@@ -2937,7 +3108,7 @@ class MainWindow(QMainWindow):
                     return
 
                 # 检查 content 是否包含编号
-                if re.search(r'\[\d+\]', original_text):
+                if _RE_SID_MARKER.search(original_text):
                     marked_text = original_text
                 else:
                     # 尝试自动编号（按说话人块分句，与编码分句一致）
@@ -2952,39 +3123,25 @@ class MainWindow(QMainWindow):
                         # 降级：使用原始内容
                         marked_text = original_text
 
-            # 收集所有编码标记
-            all_code_marks = []
-
-            for third_cat, second_cats in self.structured_codes.items():
-                for second_cat, first_contents in second_cats.items():
-                    for content_data in first_contents:
-                        if isinstance(content_data, dict):
-                            code_id = content_data.get('code_id', '')
-                            sentence_details = content_data.get('sentence_details', [])
+            # 编码标记已在构建编码树时收集并按内容长度排序
+            all_code_marks = self._all_code_marks
 
-                            for sentence in sentence_details:
-                                if isinstance(sentence, dict):
-                                    original_content = sentence.get('original_content', '')
-                                    if not original_content:
-                                        original_content = sentence.get('content', '')
-
-                                    # 清理可能已有的标记（编码标记和句子编号都清理，得到纯文本）
-                                    original_content_clean = re.sub(r'\s*\[[A-Z]\d+\]', '', original_content)
-                                    original_content_clean = re.sub(r'\s*\[\d+\]', '', original_content_clean)
-                                    original_content_clean = original_content_clean.strip()
-
-                                    if original_content_clean and code_id:
-                                        all_code_marks.append({
-                                            'clean_content': original_content_clean,
-                                            'code_id': code_id
-                                        })
+            # 文件、原文和编码标记都未变化且显示内容仍是上次结果时，无需重新标记
+            display_key = (file_path, marked_text,
+                           tuple((m['clean_content'], m['code_id']) for m in all_code_marks))
+            last_key, last_text = self._last_display_key
+            if display_key == last_key and self.text_display.toPlainText() == last_text:
+                return
 
-            # 按内容长度排序
-            all_code_marks.sort(key=lambda x: len(x['clean_content']), reverse=True)
+            # 文本中已出现的编码标记（含原有标记及本轮追加的标记）
+            applied_tags = set(_RE_CODE_TAG_TOKEN.findall(marked_text))
 
             # 应用所有标记
             for mark in all_code_marks:
                 clean = mark['clean_content']
+                # 标记来自所有文件，先用子串检查跳过不在当前文本中的句子（两种策略都要求原文出现）
+                if clean not in marked_text:
+                    continue
                 code_tag = f"[{mark['code_id']}]"
 
                 # 使用转义来匹配文本
@@ -3013,23 +3170,67 @@ class MainWindow(QMainWindow):
                 try:
                     # 先尝试策略1（带句子编号）
                     new_text = re.sub(pattern1, replace_func, marked_text)
+                    if new_text == marked_text:
+                        # 如果策略1没有匹配，尝试策略2（纯文本）
+                        new_text = re.sub(pattern2, replace_func, marked_text)
                     if new_text != marked_text:
                         marked_text = new_text
-                    else:
-                        # 如果策略1没有匹配，尝试策略2（纯文本）
-                        marked_text = re.sub(pattern2, replace_func, marked_text)
+                        applied_tags.add(code_tag)
                 except Exception as e:
                     logger.warning(f"正则替换失败: {e}，尝试简单替换")
                     # 如果正则失败，回退到简单替换
-                    if clean in marked_text and code_tag not in marked_text:
+                    if code_tag not in applied_tags:
                         marked_text = marked_text.replace(clean, f"{clean} {code_tag}")
+                        applied_tags.add(code_tag)
 
             # 更新文本显示
-            self.text_display.setPlainText(marked_text)
+            self._replace_display_text(marked_text)
+            self._last_display_key = (display_key, self.text_display.toPlainText())
+            self._current_displayed_file = file_path
 
         except Exception as e:
             logger.error(f"更新文本显示失败: {e}")
 
+    @staticmethod
+    def _common_prefix_len(a: str, b: str) -> int:
+        """两个字符串公共前缀长度（二分 + 切片比较）"""
+        lo, hi = 0, min(len(a), len(b))
+        while lo < hi:
+            mid = (lo + hi + 1) // 2
+            if a[:mid] == b[:mid]:
+                lo = mid
+            else:
+                hi = mid - 1
+        return lo
+
+    def _replace_display_text(self, new_text: str):
+        """更新文本显示：改动集中在局部时只替换变化的区间，否则整体 setPlainText"""
+        old_text = self.text_display.toPlainText()
+        if old_text == new_text:
+            return
+
+        min_len = min(len(old_text), len(new_text))
+        prefix = self._common_prefix_len(old_text, new_text)
+        suffix = self._common_prefix_len(old_text[prefix:][::-1], new_text[prefix:][::-1])
+        if (not old_text or prefix + suffix < min_len * 0.9
+                or _RE_NON_BMP.search(old_text, 0, len(old_text) - suffix)):
+            self.text_display.setPlainText(new_text)
+            return
+
+        # 与 setPlainText 一致：不把这次程序修改留在撤销栈中
+        document = self.text_display.document()
+        undo_enabled = document.isUndoRedoEnabled()
+        document.setUndoRedoEnabled(False)
+        try:
+            cursor = QTextCursor(document)
+            cursor.beginEditBlock()
+            cursor.setPosition(prefix)
+            cursor.setPosition(len(old_text) - suffix, QTextCursor.KeepAnchor)
+            cursor.insertText(new_text[prefix:len(new_text) - suffix], QTextCharFormat())
+            cursor.endEditBlock()
+        finally:
+            document.setUndoRedoEnabled(undo_enabled)
+
     # ── Phase 3: Semantic Health Visualization ──────────────────────────
 
     def _update_semantic_health_summary(self):
@@ -3069,6 +3270,13 @@ class MainWindow(QMainWindow):
             else:
                 color = "#c62828"
 
+            # Cache for dialog
+            self._cached_health_metrics = metrics
+
+            # 右侧面板尚未构建（工作台模式）时只缓存指标
+            if getattr(self, '_right_panel', None) is None:
+                return
+
             self.health_score_label.setText(f"健康分: {health:.0f}/100")
             self.health_score_label.setStyleSheet(
                 f"font-size: 14px; font-weight: bold; color: {color};")
@@ -3078,9 +3286,6 @@ class MainWindow(QMainWindow):
 
             self.semantic_health_btn.setEnabled(True)
 
-            # Cache for dialog
-            self._cached_health_metrics = metrics
-
         except Exception as e:
             logger.debug("语义健康摘要更新跳过: %s", e)
 
@@ -3202,30 +3407,38 @@ class MainWindow(QMainWindow):
         hierarchy = hdata.get("hierarchy", {})
         mappings = hdata.get("mappings", {})
 
-        # Build the tree: third → second → anchors
+        # Build the tree: third → second → anchors (detached, then attached in bulk)
+        third_items = []
         for third_name in sorted(hierarchy.keys()):
-            third_item = QTreeWidgetItem(tree)
+            third_item = QTreeWidgetItem()
+            third_items.append(third_item)
             second_map = hierarchy[third_name]
             total_anchors = sum(len(anchors) for anchors in second_map.values())
             third_item.setText(0, third_name)
             third_item.setText(1, str(total_anchors))
             third_item.setText(2, "三阶理论")
 
+            second_items = []
             for second_name, anchors in sorted(second_map.items()):
-                second_item = QTreeWidgetItem(third_item)
+                second_item = QTreeWidgetItem()
+                second_items.append(second_item)
                 second_item.setText(0, second_name)
                 second_item.setText(1, str(len(anchors)))
                 second_item.setText(2, "二阶主题")
 
+                anchor_items = []
                 for anchor in sorted(anchors):
-                    anchor_item = QTreeWidgetItem(second_item)
+                    anchor_item = QTreeWidgetItem()
+                    anchor_items.append(anchor_item)
                     anchor_item.setText(0, anchor)
                     entry = mappings.get(anchor, {})
                     anchor_item.setText(2, entry.get("source", "?"))
                     anchor_item.setText(3, str(entry.get("confidence", "?")))
+                second_item.addChildren(anchor_items)
 
-            third_item.setExpanded(False)
+            third_item.addChildren(second_items)
 
+        tree.addTopLevelItems(third_items)
         tree.expandAll()
 
         # Search filter
@@ -3286,10 +3499,22 @@ class MainWindow(QMainWindow):
         if not item_data:
             return
 
-        level = item_data.get("level")
-        if level == 1:  # 一阶编码
+        if item_data.get("level") == 1:  # 一阶编码
+            # 记录目标文本区（工作台会临时替换 text_display），稍后统一执行高亮
+            self._pending_highlight = (self.text_display, item_data)
+            self._highlight_timer.start(self.HIGHLIGHT_DEBOUNCE_MS)
+
+    def _do_pending_highlight(self):
+        """执行防抖后最后一次编码树单击对应的高亮"""
+        if self._pending_highlight is None:
+            return
+        text_display, item_data = self._pending_highlight
+        self._pending_highlight = None
+
+        saved_text_display = self.text_display
+        self.text_display = text_display
+        try:
             sentence_ids = item_data.get("sentence_ids", [])
-            code_id = item_data.get("code_id", "")
             content = item_data.get("content", "")
             sentence_details = item_data.get("sentence_details", [])
 
@@ -3316,6 +3541,8 @@ class MainWindow(QMainWindow):
             elif content:
                 # 最后的降级方案：使用内容匹配
                 self.navigate_to_sentence_content(content, "")
+        finally:
+            self.text_display = saved_text_display
 
     def on_tree_item_double_clicked(self, item, column):
         """树节点双击事件 - 双击一阶编码时弹出句子详情对话框"""
@@ -3347,6 +3574,48 @@ class MainWindow(QMainWindow):
         except Exception as e:
             logger.error(f"主界面双击树项目时出错: {e}")
 
+    @staticmethod
+    def _scan_sentence_positions(text: str) -> Dict[str, List[Tuple[int, int]]]:
+        """单次扫描文本，计算每个句子编号 [N] 对应句子的 (起始, 结束) 位置（QTextDocument 位置，按 UTF-16 计数）"""
+        positions: Dict[str, List[Tuple[int, int]]] = {}
+        prev_end = -1
+        for match in _RE_SID_MARKER.finditer(text):
+            pos = match.start()
+            # 句子开始：上一个 [数字] 标记之后，跳过前一句可能的编码标记 [Axx]
+            if prev_end < 0:
+                sentence_start = 0
+            else:
+                code_tags_match = _RE_CODE_TAG_RUN_WS.match(text, prev_end, pos)
+                sentence_start = code_tags_match.end() if code_tags_match else prev_end
+            prev_end = match.end()
+
+            # 句子结束：编号标记之后（可能还有编码标记 [Axx]）
+            sentence_end = match.end()
+            code_match = _RE_CODE_TAG_RUN.match(text, sentence_end, sentence_end + 20)
+            if code_match:
+                sentence_end = code_match.end()
+
+            positions.setdefault(match.group(1), []).append((sentence_start, sentence_end))
+
+        # 以上为 Python 下标；含 BMP 以外字符时统一换算一次，供 setPosition 直接使用
+        if _RE_NON_BMP.search(text) is not None:
+            sids = [sid for sid, spans in positions.items() for _ in spans]
+            converted = _to_utf16_spans(text, [span for spans in positions.values() for span in spans])
+            positions = {}
+            for sid, span in zip(sids, converted):
+                positions.setdefault(sid, []).append(span)
+        return positions
+
+    def _get_sentence_positions(self, text: str) -> Dict[str, List[Tuple[int, int]]]:
+        """获取当前显示文本的句子位置表，按文件缓存，文本变化时重新扫描"""
+        file_path = self.get_current_file_path() or ''
+        cached = self._sid_positions.get(file_path)
+        if cached is not None and cached[0] == text:
+            return cached[1]
+        positions = self._scan_sentence_positions(text)
+        self._sid_positions[file_path] = (text, positions)
+        return positions
+
     def highlight_text_by_sentence_ids(self, sentence_ids: list):
         """通过句子编号列表高亮文本并导航"""
         try:
@@ -3373,21 +3642,9 @@ class MainWindow(QMainWindow):
                     break
 
             # 如果找到目标文件且不是当前显示的文件，切换文件
-            if target_file:
-                current_items = self.file_list.selectedItems()
-                current_file = current_items[0].data(Qt.UserRole) if current_items else None
-
-                if current_file != target_file:
-                    # 在文件列表中查找并选中目标文件
-                    for i in range(self.file_list.count()):
-                        item = self.file_list.item(i)
-                        if item.data(Qt.UserRole) == target_file:
-                            self.file_list.setCurrentItem(item)
-                            # 显式触发文件加载
-                            self.on_file_selected(item)
-                            # 等待文件显示更新
-                            QApplication.processEvents()
-                            break
+            if target_file and target_file != self._current_displayed_file:
+                # 通过索引直接定位并同步显示目标文件
+                self._switch_to_file(target_file)
 
             # 获取当前显示的文本
             current_text = self.text_display.toPlainText()
@@ -3400,62 +3657,15 @@ class MainWindow(QMainWindow):
             # 查找并高亮所有匹配的句子编号
             found_count = 0
             first_match_position = None
+            sentence_positions = self._get_sentence_positions(current_text)
 
-            for sid in clean_ids:
-                # 查找句子编号标记 [N]
-                sentence_tag = f"[{sid}]"
-
-                # 从文本开始查找
-                search_pos = 0
-                while True:
-                    pos = current_text.find(sentence_tag, search_pos)
-                    if pos < 0:
-                        break
-
-                    # 找到句子编号，现在需要高亮整个句子
-                    # 从编号位置向前查找句子开始（前一个句子的结束位置）
-                    sentence_start = 0
-                    # 向前查找上一个 [数字] 标记
-                    text_before = current_text[:pos]
-                    prev_tags = list(re.finditer(r'\[(\d+)\]', text_before))
-                    if prev_tags:
-                        # 从上一个标记的结束位置开始
-                        prev_end = prev_tags[-1].end()
-                        # 跳过前一句可能的编码标记 [Axx], [Bxx] 等
-                        text_between = current_text[prev_end:pos]
-                        code_tags_match = re.match(r'^(\s*\[[A-Z]\d+\])+\s*', text_between)
-                        if code_tags_match:
-                            sentence_start = prev_end + code_tags_match.end()
-                        else:
-                            sentence_start = prev_end
-
-                    # 句子结束位置：编号标记之后（可能还有编码标记 [Axx]）
-                    sentence_end = pos + len(sentence_tag)
-                    # 查找编号后是否有编码标记
-                    text_after = current_text[sentence_end:sentence_end + 20]
-                    code_match = re.match(r'^(\s*\[[A-Z]\d+\])+', text_after)
-                    if code_match:
-                        sentence_end += code_match.end()
-
-                    # 创建光标并选择这段文本
-                    cursor = self.text_display.textCursor()
-                    cursor.setPosition(sentence_start)
-                    cursor.setPosition(sentence_end, QTextCursor.KeepAnchor)
-
-                    # 设置浅蓝色高亮
-                    highlight_format = cursor.charFormat()
-                    highlight_format.setBackground(QColor(173, 216, 230))  # 浅蓝色背景
-                    highlight_format.setForeground(QColor(0, 0, 139))  # 深蓝色文字
-                    cursor.mergeCharFormat(highlight_format)
-
-                    found_count += 1
-
-                    # 记录第一个匹配位置
-                    if first_match_position is None:
-                        first_match_position = sentence_start
-
-                    # 移动搜索位置
-                    search_pos = sentence_end
+            spans = [span for sid in clean_ids for span in sentence_positions.get(sid, ())]
+            if spans:
+                found_count = len(spans)
+                first_match_position = spans[0][0]
+                # 浅蓝色背景、深蓝色文字，一次性设置为 ExtraSelection，不修改文档格式
+                self.text_display.setExtraSelections(self._make_extra_selections(
+                    spans, QColor(173, 216, 230), QColor(0, 0, 139)))
 
             if found_count > 0 and first_match_position is not None:
                 # 定位到第一个匹配位置
@@ -3464,13 +3674,13 @@ class MainWindow(QMainWindow):
                 self.text_display.setTextCursor(cursor)
                 self.text_display.ensureCursorVisible()
 
-                self.statusBar().showMessage(f"已高亮 {found_count} 个句子")
+                self._status.showMessage(f"已高亮 {found_count} 个句子")
             else:
-                self.statusBar().showMessage(f"未找到句子编号: {', '.join(clean_ids)}")
+                self._status.showMessage(f"未找到句子编号: {', '.join(clean_ids)}")
 
         except Exception as e:
             logger.error(f"按句子编号高亮失败: {e}", exc_info=True)
-            self.statusBar().showMessage(f"高亮失败: {str(e)}")
+            self._status.showMessage(f"高亮失败: {str(e)}")
 
     def highlight_single_sentence_by_id(self, sentence_id):
         """仅高亮单一句子编号对应的文本（单一高亮模式）"""
@@ -3488,37 +3698,16 @@ class MainWindow(QMainWindow):
             if not current_text:
                 return
 
-            # 查找句子编号标记 [N]
-            sentence_tag = f"[{sid}]"
-            pos = current_text.find(sentence_tag)
-
-            if pos < 0:
-                self.statusBar().showMessage(f"未找到句子编号: {sid}")
+            # 查找句子编号 [N] 对应的句子范围（取首次出现）
+            ranges = self._get_sentence_positions(current_text).get(sid)
+            if not ranges:
+                self._status.showMessage(f"未找到句子编号: {sid}")
                 return
 
             # 清除之前的高亮
             self.clear_text_highlights()
 
-            # 计算句子范围
-            # 从编号位置向前查找句子开始
-            sentence_start = 0
-            text_before = current_text[:pos]
-            prev_tags = list(re.finditer(r'\[(\d+)\]', text_before))
-            if prev_tags:
-                prev_end = prev_tags[-1].end()
-                text_between = current_text[prev_end:pos]
-                code_tags_match = re.match(r'^(\s*\[[A-Z]\d+\])+\s*', text_between)
-                if code_tags_match:
-                    sentence_start = prev_end + code_tags_match.end()
-                else:
-                    sentence_start = prev_end
-
-            # 句子结束位置
-            sentence_end = pos + len(sentence_tag)
-            text_after = current_text[sentence_end:sentence_end + 20]
-            code_match = re.match(r'^(\s*\[[A-Z]\d+\])+', text_after)
-            if code_match:
-                sentence_end += code_match.end()
+            sentence_start, sentence_end = ranges[0]
 
             # 使用 ExtraSelection 进行单一高亮
             from PyQt5.QtWidgets import QTextEdit
@@ -3539,11 +3728,11 @@ class MainWindow(QMainWindow):
             self.text_display.setTextCursor(cursor)
             self.text_display.ensureCursorVisible()
 
-            self.statusBar().showMessage(f"已高亮句子 [{sid}]")
+            self._status.showMessage(f"已高亮句子 [{sid}]")
 
         except Exception as e:
             logger.error(f"单一句子高亮失败: {e}", exc_info=True)
-            self.statusBar().showMessage(f"高亮失败: {str(e)}")
+            self._status.showMessage(f"高亮失败: {str(e)}")
 
     def highlight_text_by_code_id(self, code_id: str):
         """通过编码ID高亮文本"""
@@ -3555,194 +3744,97 @@ class MainWindow(QMainWindow):
         if not current_text:
             return
 
-        # 查找编码标记模式： [A11], [B22] 等
-        pattern = f"\\[{code_id}\\]"
-
-        # 移动光标到文本开始
-        cursor = self.text_display.textCursor()
-        cursor.movePosition(cursor.Start)
-        self.text_display.setTextCursor(cursor)
-
         # 清除之前的高亮
         self.clear_text_highlights()
 
-        # 查找并高亮所有匹配项
-        found = False
-        search_cursor = self.text_display.textCursor()
-        search_cursor.movePosition(cursor.Start)
-
-        # 使用while循环查找所有匹配项，但添加安全计数器防止无限循环
-        search_count = 0
-        max_searches = 100  # 设置最大搜索次数防止无限循环
-
-        # 首先高亮编码标记
-        while search_count < max_searches:
-            # 查找编码标记
-            search_cursor = self.text_document.find(pattern, search_cursor)
-            if search_cursor.isNull():
-                break
-
-            # 设置高亮格式
-            highlight_format = search_cursor.charFormat()
-            highlight_format.setBackground(QColor(255, 255, 0))  # 黄色背景
-            highlight_format.setForeground(QColor(255, 0, 0))  # 红色文字
-
-            # 应用高亮
-            search_cursor.mergeCharFormat(highlight_format)
-            found = True
-
-            # 记录第一个匹配项的位置
-            if search_count == 0:  # 第一次匹配
-                self.text_display.setTextCursor(search_cursor)
-
-            # 移动光标到找到的内容之后，防止重复匹配
-            search_cursor.movePosition(search_cursor.Right, search_cursor.MoveAnchor, len(pattern))
-            search_count += 1
-
-        # 然后高亮与编码ID相关的一阶编码内容
-        # 遍历树形结构，找到对应编码ID的一阶编码内容
+        # 单次扫描纯文本，收集编码标记 [A11], [B22] 等的位置
+        tag_spans = [m.span() for m in re.finditer(re.escape(f"[{code_id}]"), current_text)]
+
+        # 然后收集与编码ID相关的一阶编码内容的位置（过短的内容跳过，匹配数设上限）
+        content_spans = []
         content_to_highlight = self.get_content_by_code_id(code_id)
         if content_to_highlight:
             # 清理内容，移除可能存在的标记
-            clean_content = re.sub(r'\s*\[[A-Z]\d+\]', '', content_to_highlight).strip()
-            if clean_content:
-                content_cursor = self.text_display.textCursor()
-                content_cursor.movePosition(content_cursor.Start)
-
-                content_search_count = 0
-                while content_search_count < max_searches:
-                    content_cursor = self.text_document.find(clean_content, content_cursor)
-                    if content_cursor.isNull():
-                        break
-
-                    # 检查是否与编码标记重叠，避免重复高亮
-                    # 设置高亮格式（使用不同颜色区分）
-                    content_highlight_format = content_cursor.charFormat()
-                    content_highlight_format.setBackground(QColor(173, 216, 230))  # 浅蓝色背景
-                    content_highlight_format.setForeground(QColor(0, 0, 139))  # 深蓝色文字
-
-                    # 应用高亮
-                    content_cursor.mergeCharFormat(content_highlight_format)
-
-                    # 移动光标到找到的内容之后，防止重复匹配
-                    content_cursor.movePosition(content_cursor.Right, content_cursor.MoveAnchor, len(clean_content))
-                    content_search_count += 1
-
-        if found:
+            clean_content = _RE_CODE_TAG.sub('', content_to_highlight).strip()
+            if len(clean_content) >= self.MIN_HIGHLIGHT_QUERY_LEN:
+                content_spans = self._find_highlight_spans(clean_content, current_text)
+
+        # re 给出的是 Python 下标，换算为文档位置后再构建光标
+        spans = _to_utf16_spans(current_text, tag_spans + content_spans)
+        tag_spans, content_spans = spans[:len(tag_spans)], spans[len(tag_spans):]
+
+        # 编码标记：黄色背景、红色文字；对应内容：浅蓝色背景、深蓝色文字
+        self.text_display.setExtraSelections(
+            self._make_extra_selections(tag_spans, QColor(255, 255, 0), QColor(255, 0, 0))
+            + self._make_extra_selections(content_spans, QColor(173, 216, 230), QColor(0, 0, 139)))
+
+        if tag_spans:
+            # 定位到第一个编码标记
+            first_cursor = self.text_display.textCursor()
+            first_cursor.setPosition(tag_spans[0][0])
+            first_cursor.setPosition(tag_spans[0][1], QTextCursor.KeepAnchor)
+            self.text_display.setTextCursor(first_cursor)
             self.text_display.ensureCursorVisible()  # 确保光标位置可见
-            self.statusBar().showMessage(f"已高亮编码 {code_id} 及其对应内容")
-        else:
-            self.statusBar().showMessage(f"未找到编码 {code_id} 的标记")
-
-    def highlight_text_content(self, content: str):
-        """在文本中高亮内容"""
-        if not content or len(content) < 5:
-            return
-
-        # 获取当前显示的文本
-        current_text = self.text_display.toPlainText()
-        if not current_text:
-            return
-
-        # 移动光标到文本开始
-        cursor = self.text_display.textCursor()
-        cursor.movePosition(cursor.Start)
-        self.text_display.setTextCursor(cursor)
-
-        # 清除之前的高亮
-        self.clear_text_highlights()
-
-        # 查找文本
-        found = False
-        search_cursor = self.text_display.textCursor()
-        search_cursor.movePosition(cursor.Start)
-
-        # 清理内容，移除可能存在的标记
-        clean_content = re.sub(r'\s*\[[A-Z]\d+\]', '', content)
-
-        while True:
-            search_cursor = self.text_document.find(clean_content, search_cursor)
-            if search_cursor.isNull():
-                break
-
-            # 设置高亮格式
-            highlight_format = search_cursor.charFormat()
-            highlight_format.setBackground(QColor(255, 255, 0))  # 黄色背景
-            highlight_format.setForeground(QColor(255, 0, 0))  # 红色文字
-
-            # 应用高亮
-            search_cursor.mergeCharFormat(highlight_format)
-            found = True
-
-            # 如果是第一个匹配项，滚动到该位置
-            if not found:
-                self.text_display.setTextCursor(search_cursor)
-                found = True
-
-        if found:
-            self.statusBar().showMessage(f"已高亮内容: {clean_content[:50]}...")
+            if len(content_spans) >= self.MAX_HIGHLIGHT_MATCHES:
+                self._status.showMessage(f"已高亮编码 {code_id} 及其对应内容（已达到高亮上限）")
+            else:
+                self._status.showMessage(f"已高亮编码 {code_id} 及其对应内容")
         else:
-            self.statusBar().showMessage(f"未找到内容: {clean_content[:50]}...")
+            self._status.showMessage(f"未找到编码 {code_id} 的标记")
+
+    def _find_highlight_spans(self, needle: str, text: str) -> List[Tuple[int, int]]:
+        """在纯文本中查找内容的所有匹配区间（不区分大小写，与 QTextDocument.find 默认行为一致），
+        最多收集 MAX_HIGHLIGHT_MATCHES 个"""
+        return [m.span() for m in islice(re.finditer(re.escape(needle), text, re.IGNORECASE),
+                                         self.MAX_HIGHLIGHT_MATCHES)]
+
+    def _make_extra_selections(self, spans, background: QColor,
+                               foreground: QColor) -> List[QTextEdit.ExtraSelection]:
+        """按 (起始, 结束) 区间构建高亮用的 ExtraSelection 列表"""
+        document = self.text_display.document()
+        selections = []
+        for start, end in spans:
+            cursor = QTextCursor(document)
+            cursor.setPosition(start)
+            cursor.setPosition(end, QTextCursor.KeepAnchor)
+            selection = QTextEdit.ExtraSelection()
+            selection.cursor = cursor
+            selection.format.setBackground(background)
+            selection.format.setForeground(foreground)
+            selections.append(selection)
+        return selections
 
     def clear_text_highlights(self):
         """清除文本高亮"""
         try:
-            # 清除 ExtraSelection 高亮
+            # 高亮均以 ExtraSelection 呈现，清空即可，无需改写文档格式
             self.text_display.setExtraSelections([])
 
-            # 获取整个文档
-            cursor = self.text_display.textCursor()
-            cursor.select(cursor.Document)
-
-            # 重置格式
-            format = cursor.charFormat()
-            format.setBackground(QColor(255, 255, 255))  # 白色背景
-            format.setForeground(QColor(0, 0, 0))  # 黑色文字
-            cursor.mergeCharFormat(format)
-
-            # 取消选择
-            cursor.clearSelection()
-            self.text_display.setTextCursor(cursor)
-
         except Exception as e:
             logger.error(f"清除高亮失败: {e}")
 
+    def _rebuild_code_id_index(self):
+        """遍历编码树（显式栈，先序），重建 编码ID -> 内容 索引"""
+        index = {}
+        root = self.coding_tree.invisibleRootItem()
+        stack = [root.child(i) for i in range(root.childCount() - 1, -1, -1)]
+        while stack:
+            item = stack.pop()
+            item_data = item.data(0, Qt.UserRole)
+            if isinstance(item_data, dict):
+                code_id = item_data.get("code_id")
+                if code_id and code_id not in index:
+                    value = item_data.get("content", "") or item_data.get("name", "")
+                    if value:
+                        index[code_id] = value
+            stack.extend(item.child(i) for i in range(item.childCount() - 1, -1, -1))
+        self._code_id_to_content = index
+
     def get_content_by_code_id(self, code_id: str) -> str:
         """根据编码ID获取对应的一阶编码内容"""
         try:
-            # 遍历树形结构查找匹配的编码ID
-            def search_tree_item(item):
-                for i in range(item.childCount()):
-                    child = item.child(i)
-                    child_data = child.data(0, Qt.UserRole)
-
-                    if child_data:
-                        # 检查当前节点是否匹配
-                        if child_data.get("code_id") == code_id:
-                            return child_data.get("content", "") or child_data.get("name", "")
-
-                        # 递归搜索子节点
-                        result = search_tree_item(child)
-                        if result:
-                            return result
-
-                return ""
-
-            # 遍历顶层项目
-            for i in range(self.coding_tree.topLevelItemCount()):
-                top_item = self.coding_tree.topLevelItem(i)
-                result = search_tree_item(top_item)
-                if result:
-                    return result
-
-            # 如果在层级结构中没找到，检查顶层未分类的一阶编码
-            for i in range(self.coding_tree.topLevelItemCount()):
-                top_item = self.coding_tree.topLevelItem(i)
-                top_data = top_item.data(0, Qt.UserRole)
-                if top_data and top_data.get("level") == 1 and top_data.get("code_id") == code_id:
-                    return top_data.get("content", "") or top_data.get("name", "")
-
-            return ""
+            # 索引在编码树构建 / update_structured_codes_from_tree 时维护
+            return self._code_id_to_content.get(code_id, "")
         except Exception as e:
             logger.error(f"获取编码内容时出错: {e}")
             return ""
@@ -3756,6 +3848,14 @@ class MainWindow(QMainWindow):
         # 延迟 import 避免循环依赖
         from workspace_page import WorkspacePage
 
+        # 编码树单击高亮防抖：连续点击/键盘浏览时只执行最后一次高亮
+        self._pending_highlight = None
+        # 内容定位缓存：(搜索内容, 文档 id, 文档版本号) -> (起始, 结束)，按插入顺序淘汰
+        self._highlight_cache: Dict[Tuple[str, int, int], Tuple[int, int]] = {}
+        self._highlight_timer = QTimer(self)
+        self._highlight_timer.setSingleShot(True)
+        self._highlight_timer.timeout.connect(self._do_pending_highlight)
+
         # ===== QStackedWidget 架构 =====
         self.stacked_widget = QStackedWidget()
         self.setCentralWidget(self.stacked_widget)
@@ -3780,15 +3880,18 @@ class MainWindow(QMainWindow):
         self.setMenuBar(self.workspace_page.menu_bar)
 
         # 状态栏
-        self.statusBar().showMessage("就绪")
+        self._status.showMessage("就绪")
 
         # 进度条
         self.progress_bar = QProgressBar()
         self.progress_bar.setVisible(False)
-        self.statusBar().addPermanentWidget(self.progress_bar)
+        self._status.addPermanentWidget(self.progress_bar)
 
         # 保持 text_document 引用兼容现有方法
         self.text_document = self.workspace_page.text_display.document()
+        self.text_document.contentsChanged.connect(self._on_document_contents_changed)
+        # 开发者界面的文本框共用同一个文档版本号
+        self._dev_orig_text_display.document().contentsChanged.connect(self._on_document_contents_changed)
 
         # 显示当前加载的模型信息
         model_info = self.model_manager.get_current_model_info()
@@ -3822,16 +3925,19 @@ class MainWindow(QMainWindow):
         splitter.addWidget(center_panel)
 
         # 右侧面板 - 编码结构和训练管理
-        right_panel = self.create_right_panel()
-        splitter.addWidget(right_panel)
+        # 启动默认进入工作台，右侧面板延迟到首次切换到开发者界面时再构建
+        self._right_panel = None
+        self._right_panel_placeholder = QWidget()
+        splitter.addWidget(self._right_panel_placeholder)
+        self._dev_splitter = splitter
 
         # 设置分割比例 - 左侧变窄，中间变宽（与原始完全一致）
         splitter.setSizes([50, 900, 650])
         main_layout.addWidget(splitter)
 
-        # 保存开发者界面原始 widget 引用
+        # 保存开发者界面原始 widget 引用（编码树随右侧面板一起延迟创建）
         self._dev_orig_text_display = self.text_display
-        self._dev_orig_coding_tree = self.coding_tree
+        self._dev_orig_coding_tree = None
         self._dev_orig_file_list = self.file_list
 
         # Developer 独立快捷键 — 仅在 Developer 页面可见时生效
@@ -3845,8 +3951,26 @@ class MainWindow(QMainWindow):
 
         return central_widget
 
+    def _ensure_right_panel(self):
+        """首次进入开发者界面时构建右侧面板，替换占位控件"""
+        if self._right_panel is not None:
+            return
+
+        active_tree = self.coding_tree
+        self._right_panel = self.create_right_panel()
+        self._dev_orig_coding_tree = self.coding_tree
+        self.coding_tree = active_tree
+
+        sizes = self._dev_splitter.sizes()
+        self._dev_splitter.replaceWidget(2, self._right_panel)
+        self._dev_splitter.setSizes(sizes)
+        self._right_panel_placeholder.deleteLater()
+        self._right_panel_placeholder = None
+
     def _switch_to_developer(self):
         """切换到开发者界面"""
+        first_visit = self._right_panel is None
+        self._ensure_right_panel()
         self.menuBar().clear()
         self.create_menus()
         # 在帮助菜单后添加返回工作台入口
@@ -3855,8 +3979,15 @@ class MainWindow(QMainWindow):
         self.menuBar().addAction(back_action)
         self.stacked_widget.setCurrentWidget(self.developer_page)
         self.text_display = self._dev_orig_text_display
+        # 两个页面的文本框各自显示不同内容，切换后不再沿用上一页面记录的显示文件；
+        # 上一页面尚未执行的防抖高亮也一并取消，避免它在旧文本框上重新记录显示文件
+        self._current_displayed_file = None
+        self._highlight_timer.stop()
+        self._pending_highlight = None
         self.coding_tree = self._dev_orig_coding_tree
         self.file_list = self._dev_orig_file_list
+        if first_visit and self.structured_codes:
+            self.update_coding_tree()
         self._update_status_bar()
 
     def _switch_to_workspace(self):
@@ -3865,6 +3996,9 @@ class MainWindow(QMainWindow):
         self._dev_coding_tree = self.coding_tree
         self._dev_file_list = self.file_list
         self.text_display = self.workspace_page.text_display
+        self._current_displayed_file = None
+        self._highlight_timer.stop()
+        self._pending_highlight = None
         self.coding_tree = self.workspace_page.coding_tree
         # 清空开发者菜单并在同一菜单栏上重建工作台菜单
         self.menuBar().clear()
@@ -3885,7 +4019,7 @@ class MainWindow(QMainWindow):
 
         answer_count = len(self.standard_answer_manager.get_current_answers()) if self.standard_answer_manager else 0
 
-        self.statusBar().showMessage(
+        self._status.showMessage(
             f"文件: {file_count} | 编码: {code_count} | 标准答案: {answer_count} | 就绪"
         )
 
@@ -4051,10 +4185,9 @@ class MainWindow(QMainWindow):
         content = result['content']
         if content:
             # 清理内容，移除编号标记
-            import re
-            clean_content = re.sub(r'\s*\[[A-Z]\d+\]', '', content)
-            clean_content = re.sub(r'\s*\[\d+\]', '', clean_content)
-            clean_content = re.sub(r'^[A-Z]\d+\s+', '', clean_content)
+            clean_content = _RE_CODE_TAG.sub('', content)
+            clean_content = _RE_NUM_TAG.sub('', clean_content)
+            clean_content = _RE_LEADING_CODE.sub('', clean_content)
             clean_content = clean_content.strip()
 
             if clean_content:
@@ -4071,10 +4204,9 @@ class MainWindow(QMainWindow):
                 original_content = first_detail.get('text', '') or first_detail.get('original_content', '')
                 if original_content:
                     # 清理内容
-                    import re
-                    clean_content = re.sub(r'\s*\[[A-Z]\d+\]', '', original_content)
-                    clean_content = re.sub(r'\s*\[\d+\]', '', clean_content)
-                    clean_content = re.sub(r'^[A-Z]\d+\s+', '', clean_content)
+                    clean_content = _RE_CODE_TAG.sub('', original_content)
+                    clean_content = _RE_NUM_TAG.sub('', clean_content)
+                    clean_content = _RE_LEADING_CODE.sub('', clean_content)
                     clean_content = clean_content.strip()
 
                     if clean_content:
@@ -4084,14 +4216,6 @@ class MainWindow(QMainWindow):
         # 如果没有original_content，使用原始的高亮方法
         self.highlight_search_result(result)
 
-    def highlight_text_content(self, content):
-        """在文本中高亮内容 - 与手动编码界面一致的精确高亮"""
-        if not content or len(content) < 2:
-            return
-
-        # 使用与手动编码界面相同的精确高亮方法
-        self.navigate_to_sentence_content(content, "")
-
     def show_tree_context_menu(self, position):
         """显示树形控件上下文菜单"""
         from PyQt5.QtWidgets import QMenu, QAction
@@ -4319,8 +4443,8 @@ class MainWindow(QMainWindow):
                 pure_content = pure_content[len(primary_code_id + ': '):]
             elif pure_content.startswith(primary_code_id + ' '):
                 pure_content = pure_content[len(primary_code_id + ' '):]
-        content_without_number = re.sub(r'\s*\[[A-Z]\d+\]', '', pure_content)
-        content_without_number = re.sub(r'\s*\[\d+\]', '', content_without_number)
+        content_without_number = _RE_CODE_TAG.sub('', pure_content)
+        content_without_number = _RE_NUM_TAG.sub('', content_without_number)
         content_without_number = content_without_number.strip()
 
         # 步骤2：确定主编码自身的句子编号（与拖拽逻辑一致）
@@ -4405,8 +4529,8 @@ class MainWindow(QMainWindow):
                     item_content = item_content[len(item_code_id + ': '):]
                 elif item_content.startswith(item_code_id + ' '):
                     item_content = item_content[len(item_code_id + ' '):]
-            clean_item_content = re.sub(r'\s*\[[A-Z]\d+\]', '', item_content)
-            clean_item_content = re.sub(r'\s*\[\d+\]', '', clean_item_content)
+            clean_item_content = _RE_CODE_TAG.sub('', item_content)
+            clean_item_content = _RE_NUM_TAG.sub('', clean_item_content)
             clean_item_content = clean_item_content.strip()
 
             logger.info(f"[合并]     清理后内容: {clean_item_content[:50]}...")
@@ -4637,10 +4761,9 @@ class MainWindow(QMainWindow):
             logger.error(f"自动选中句子失败: {e}")
 
     def find_sentence_number_from_text(self, sentence_text, full_text_content):
-        import re
         sentence_clean = sentence_text.strip()
-        sentence_clean = re.sub(r'\s*\[[A-Z]\d+\]', '', sentence_clean)
-        sentence_clean = re.sub(r'\s*\[\d+\]', '', sentence_clean)
+        sentence_clean = _RE_CODE_TAG.sub('', sentence_clean)
+        sentence_clean = _RE_NUM_TAG.sub('', sentence_clean)
         sentence_clean = sentence_clean.strip()
 
         if len(sentence_clean) < 5:
@@ -4855,7 +4978,6 @@ class MainWindow(QMainWindow):
                     sentences = [dropped_text.strip()]
 
                 associated_code_ids = []
-                import re
                 current_text_content = self.text_display.toPlainText()
 
                 for sentence in sentences:
@@ -4882,8 +5004,8 @@ class MainWindow(QMainWindow):
                     elif pure_content.startswith(code_id + ' '):
                         pure_content = pure_content[len(code_id + ' '):]
 
-                content_without_number = re.sub(r'\s*\[[A-Z]\d+\]', '', pure_content)
-                content_without_number = re.sub(r'\s*\[\d+\]', '', content_without_number)
+                content_without_number = _RE_CODE_TAG.sub('', pure_content)
+                content_without_number = _RE_NUM_TAG.sub('', content_without_number)
                 content_without_number = content_without_number.strip()
 
                 first_code_number = ""
@@ -4924,8 +5046,8 @@ class MainWindow(QMainWindow):
                 for i, sentence in enumerate(sentences):
                     code_id = associated_code_ids[i] if i < len(associated_code_ids) else ""
                     if code_id and code_id.isdigit() and code_id not in existing_numbers:
-                        clean_sentence = re.sub(r'\s*\[[A-Z]\d+\]', '', sentence)
-                        clean_sentence = re.sub(r'\s*\[\d+\]', '', clean_sentence)
+                        clean_sentence = _RE_CODE_TAG.sub('', sentence)
+                        clean_sentence = _RE_NUM_TAG.sub('', clean_sentence)
                         clean_sentence = clean_sentence.strip()
 
                         new_sentence_data = {
@@ -5255,32 +5377,66 @@ class MainWindow(QMainWindow):
         self._save_undo_state("编辑编码")
         item.setText(0, new_text)
 
-        # Update the underlying structured_codes data
-        self._update_code_in_data(old_text, new_text, level, item_data)
-        self.statusBar().showMessage(f"编码已更新: {old_text} → {new_text}")
+        # 只在 structured_codes 中定位并改名该节点，避免整树重建
+        try:
+            renamed = self._rename_in_structured_codes(level, old_text, new_text, item)
+        except Exception as e:
+            logger.error(f"定向更新编码数据失败: {e}")
+            renamed = False
+        if not renamed:
+            self.update_structured_codes_from_tree()
+        self._status.showMessage(f"编码已更新: {old_text} → {new_text}")
+
+    def _rename_in_structured_codes(self, level: int, old_name: str, new_name: str,
+                                    item: QTreeWidgetItem) -> bool:
+        """按树节点的父链定位并原地改名 structured_codes 中的编码，找不到时返回 False"""
+        codes = self.structured_codes
+        if not codes:
+            return False
+        parent = item.parent()
 
-    def _update_code_in_data(self, old_name: str, new_name: str, level: int, item_data: dict):
-        """更新 structured_codes 中的编码名称。"""
-        if not self.structured_codes:
-            return
         if level == 3:
-            if old_name in self.structured_codes:
-                self.structured_codes[new_name] = self.structured_codes.pop(old_name)
-        elif level == 2:
-            for third_cat, second_cats in self.structured_codes.items():
-                if old_name in second_cats:
-                    second_cats[new_name] = second_cats.pop(old_name)
-                    return
-        elif level == 1:
-            for third_cat, second_cats in self.structured_codes.items():
-                for second_cat, first_list in second_cats.items():
-                    for item in first_list:
-                        if isinstance(item, dict) and item.get('code_id') == item_data.get('code_id'):
-                            if 'content' in item:
-                                item['content'] = new_name
-                            if 'code' in item:
-                                item['code'] = new_name
-                            return
+            if old_name not in codes:
+                return False
+            # 保持原有键顺序
+            self.structured_codes = {(new_name if k == old_name else k): v for k, v in codes.items()}
+            return True
+
+        if level == 2:
+            second_cats = codes.get(parent.text(0)) if parent is not None else None
+            if not second_cats or old_name not in second_cats:
+                return False
+            codes[parent.text(0)] = {(new_name if k == old_name else k): v
+                                     for k, v in second_cats.items()}
+            return True
+
+        if level == 1:
+            if parent is None:
+                first_list = codes.get("__unclassified__", {}).get("__unclassified_second__")
+            else:
+                grand = parent.parent()
+                first_list = codes.get(grand.text(0), {}).get(parent.text(0)) if grand is not None else None
+            if first_list is None:
+                return False
+            item_data = item.data(0, Qt.UserRole)
+            code_id = item_data.get('code_id') if isinstance(item_data, dict) else None
+            for entry in first_list:
+                if isinstance(entry, dict) and entry.get('code_id') == code_id:
+                    for key in ('content', 'code'):
+                        if key in entry:
+                            entry[key] = new_name
+                    # 同步节点数据与编号索引，保证后续整树重建不会回退改名
+                    item_data = dict(item_data)
+                    for key in ('content', 'code'):
+                        if key in item_data:
+                            item_data[key] = new_name
+                    item.setData(0, Qt.UserRole, item_data)
+                    if code_id:
+                        self._code_id_to_content[code_id] = entry.get('content') or new_name
+                    return True
+            return False
+
+        return False
 
     def delete_selected_code(self):
         """删除选中的编码 - 支持批量删除"""
@@ -5358,7 +5514,7 @@ class MainWindow(QMainWindow):
 
             # 显示删除成功消息
             deleted_count = len(selected_items)
-            self.statusBar().showMessage(f"已成功删除 {deleted_count} 个编码")
+            self._status.showMessage(f"已成功删除 {deleted_count} 个编码")
             logger.info(f"批量删除 {deleted_count} 个编码")
 
     def update_statistics_after_deletion(self, parent_item, deleted_level):
@@ -5368,7 +5524,7 @@ class MainWindow(QMainWindow):
             total_third = len(self.structured_codes)
             total_second = sum(len(cats) for cats in self.structured_codes.values())
             total_first = sum(len(contents) for cats in self.structured_codes.values() for contents in cats.values())
-            self.statusBar().showMessage(f"编码结构: {total_third}三阶, {total_second}二阶, {total_first}一阶")
+            self._status.showMessage(f"编码结构: {total_third}三阶, {total_second}二阶, {total_first}一阶")
 
     def add_parent_second_for_first(self):
         """为选中的一阶编码添加父节点二阶编码"""
@@ -6066,7 +6222,6 @@ class MainWindow(QMainWindow):
     def generate_second_code_id(self, third_letter="B", parent_node=None):
         """生成二阶编码ID：B01, B02...（修复：独立二阶只在未分类中计数）"""
         existing_second_numbers = []
-        import re
 
         if parent_node:
             # Case 1: 指定了父节点（三阶），统计该节点下的二阶
@@ -6116,7 +6271,6 @@ class MainWindow(QMainWindow):
                 # 提取开头的字母
                 if top_text and len(top_text) > 0:
                     # 分割显示名称，获取编号部分
-                    import re
                     parts = top_text.split(' ', 1)
                     if len(parts) > 0:
                         code_part = parts[0]
@@ -6149,7 +6303,6 @@ class MainWindow(QMainWindow):
                     second_level_items.append(item)
 
             # 按当前编号排序
-            import re
             def get_second_code_number(item):
                 text = item.text(0)
                 match = re.match(r'^[A-Z](\d{2})', text.split(' ')[0])
@@ -6293,7 +6446,6 @@ class MainWindow(QMainWindow):
         二阶 B01/B02...（各自三阶父节点内顺序），
         一阶 A01/A02...（全树从上到下全局顺序）"""
         try:
-            import re
 
             def strip_prefix(text):
                 """剥离编码前缀（如 A01: / B02  / C03 等），返回纯名称"""
@@ -6380,44 +6532,41 @@ class MainWindow(QMainWindow):
 
     def update_structured_codes_from_tree(self):
         """从树形结构更新编码数据"""
-        self.structured_codes = {}
+        deepcopy = copy.deepcopy
+        user_role = Qt.UserRole
+        tree = self.coding_tree
+        structured = {}
 
-        for i in range(self.coding_tree.topLevelItemCount()):
-            third_item = self.coding_tree.topLevelItem(i)
-            item_data = third_item.data(0, Qt.UserRole)
+        for i in range(tree.topLevelItemCount()):
+            third_item = tree.topLevelItem(i)
+            item_data = third_item.data(0, user_role)
 
-            # 检查是否是未分类的一阶编码（直接在树根，level=1）
+            # 检查是否是未分类的一阶编码（直接在树根，level=1），归入 "__unclassified__" 占位分类
             if item_data and item_data.get("level") == 1:
-                # 确保有 "__unclassified__" 占位分类
-                if "__unclassified__" not in self.structured_codes:
-                    self.structured_codes["__unclassified__"] = {}
-                if "__unclassified_second__" not in self.structured_codes["__unclassified__"]:
-                    self.structured_codes["__unclassified__"]["__unclassified_second__"] = []
-                import copy
-                self.structured_codes["__unclassified__"]["__unclassified_second__"].append(copy.deepcopy(item_data))
+                structured.setdefault("__unclassified__", {}).setdefault(
+                    "__unclassified_second__", []).append(deepcopy(item_data))
                 continue
 
-            # 正常的三阶编码
-            third_name = third_item.text(0)
-            self.structured_codes[third_name] = {}
-
+            # 正常的三阶编码：先构建完整的子结构再整体赋值
+            second_codes = {}
             for j in range(third_item.childCount()):
                 second_item = third_item.child(j)
-                second_name = second_item.text(0)
-                self.structured_codes[third_name][second_name] = []
-
+                first_codes = []
                 for k in range(second_item.childCount()):
                     first_item = second_item.child(k)
                     # 优先获取完整的数据结构（字典格式）
-                    first_item_data = first_item.data(0, Qt.UserRole)
+                    first_item_data = first_item.data(0, user_role)
                     if first_item_data and isinstance(first_item_data, dict):
                         # 使用完整的数据结构
-                        import copy
-                        self.structured_codes[third_name][second_name].append(copy.deepcopy(first_item_data))
+                        first_codes.append(deepcopy(first_item_data))
                     else:
                         # 后备方案：使用文本内容
-                        first_content = first_item.text(0)
-                        self.structured_codes[third_name][second_name].append(first_content)
+                        first_codes.append(first_item.text(0))
+                second_codes[second_item.text(0)] = first_codes
+            structured[third_item.text(0)] = second_codes
+
+        self.structured_codes = structured
+        self._rebuild_code_id_index()
 
         # 添加日志，方便调试
         logger.info(f"Updated structured codes from tree. Total third: {len(self.structured_codes)}")
@@ -6484,7 +6633,7 @@ class MainWindow(QMainWindow):
                 'classifier': '分类器训练',
                 'incremental': '增量训练'
             }
-            self.statusBar().showMessage(f"开始训练模型... 模式: {mode_names.get(training_mode, training_mode)}")
+            self._status.showMessage(f"开始训练模型... 模式: {mode_names.get(training_mode, training_mode)}")
 
         except Exception as e:
             logger.error(f"开始训练失败: {e}")
@@ -6558,6 +6707,8 @@ class MainWindow(QMainWindow):
             self.training_progress.setFormat("超参数寻优中... %p%")
             self.training_progress.setValue(0)
 
+            # 延迟导入：依赖 torch/sklearn/optuna，仅在寻优时加载
+            from hyperparameter_optimizer import HyperparameterOptimizer
             optimizer = HyperparameterOptimizer(self.model_manager)
 
             def progress_callback(current, total, params):
@@ -6612,7 +6763,7 @@ class MainWindow(QMainWindow):
         self.training_progress.setValue(value)
         if stage:
             self.training_progress.setFormat(f"{stage} - %p%")
-        self.statusBar().showMessage(f"训练进度: {value}% - {stage}")
+        self._status.showMessage(f"训练进度: {value}% - {stage}")
 
     def update_training_progress(self, value):
         """更新训练进度"""
@@ -6644,7 +6795,7 @@ class MainWindow(QMainWindow):
             self.training_metrics_label.setVisible(False)
 
         if success:
-            self.statusBar().showMessage("模型训练完成")
+            self._status.showMessage("模型训练完成")
             self.model_type_combo.setCurrentText("训练模型编码")
             QMessageBox.information(self, "训练完成", message)
         else:
@@ -6852,29 +7003,32 @@ class MainWindow(QMainWindow):
 
             # 获取绝对路径，使用标准答案管理器的目录
             base_dir = os.path.abspath(self.standard_answer_manager.standard_answers_dir)
-            file_path = os.path.join(base_dir, version)
+
+            # 一次扫描目录，按文件名查找，避免多次 exists/getsize 系统调用
+            try:
+                with os.scandir(base_dir) as it:
+                    entries = {entry.name: entry for entry in it if entry.is_file()}
+            except OSError:
+                entries = {}
 
             # 检查是否需要添加 .json 扩展名
-            if not file_path.endswith('.json'):
-                file_path_json = file_path + '.json'
-                if os.path.exists(file_path_json):
-                    file_path = file_path_json
-
-            # 打印路径信息用于调试
-            print(f"检查文件路径: {file_path}")
-            print(f"文件是否存在: {os.path.exists(file_path)}")
-
-            if not os.path.exists(file_path):
-                # 列出目录内容用于调试
-                dir_path = os.path.join(base_dir, "standard_answers")
-                if os.path.exists(dir_path):
-                    files = os.listdir(dir_path)
-                    print(f"目录内容: {files}")
+            name = version
+            if not name.endswith('.json') and name + '.json' in entries:
+                name += '.json'
+            file_path = os.path.join(base_dir, name)
+            file_entry = entries.get(name)
+
+            logger.debug("检查文件路径: %s, 是否存在: %s", file_path, file_entry is not None)
+
+            if file_entry is None:
+                # 仅在调试日志开启时列出目录内容
+                if logger.isEnabledFor(logging.DEBUG):
+                    logger.debug("目录内容: %s", sorted(entries))
 
                 QMessageBox.critical(self, "错误", f"标准答案文件不存在: {version}\n检查路径: {file_path}\n请检查 standard_answers 目录")
                 return
 
-            if os.path.getsize(file_path) == 0:
+            if file_entry.stat().st_size == 0:
                 QMessageBox.critical(self, "错误", f"标准答案文件为空: {version}")
                 return
 
@@ -6888,7 +7042,7 @@ class MainWindow(QMainWindow):
                     self.update_coding_tree()
                     self.answer_status_label.setText(f"标准答案: {actual_filename}")
                     self.update_training_data_label()
-                    self.statusBar().showMessage(f"已加载标准答案: {actual_filename}")
+                    self._status.showMessage(f"已加载标准答案: {actual_filename}")
                 else:
                     QMessageBox.warning(self, "警告", "标准答案数据格式不完整，缺少 structured_codes 字段")
             else:
@@ -6924,7 +7078,7 @@ class MainWindow(QMainWindow):
             self.update_coding_tree()
             self.answer_status_label.setText(f"标准答案: {version_id}")
             self.update_training_data_label()
-            self.statusBar().showMessage(f"已合并标准答案: {version_id}")
+            self._status.showMessage(f"已合并标准答案: {version_id}")
 
         reply = QMessageBox.question(
             self,
@@ -7019,14 +7173,19 @@ class MainWindow(QMainWindow):
             QMessageBox.warning(self, "警告", "没有编码数据可导出")
             return
 
-        file_path, _ = QFileDialog.getSaveFileName(
-            self, "导出JSON", "扎根理论编码.json", "JSON文件 (*.json)"
+        file_path, selected_filter = QFileDialog.getSaveFileName(
+            self, "导出JSON", "扎根理论编码.json", "JSON文件 (*.json);;紧凑JSON文件 (*.json)"
         )
 
         if file_path:
+            # 默认带缩进；选择“紧凑”时去掉缩进与分隔空格，文件更小、编码更快
+            pretty = not selected_filter.startswith("紧凑")
             try:
-                with open(file_path, 'w', encoding='utf-8') as f:
-                    json.dump(self.structured_codes, f, ensure_ascii=False, indent=2)
+                with open(file_path, 'w', encoding='utf-8', buffering=1 << 20) as f:
+                    json.dump(self.structured_codes, f, ensure_ascii=False,
+                              indent=2 if pretty else None,
+                              separators=None if pretty else (',', ':'),
+                              check_circular=False)
 
                 QMessageBox.information(self, "成功", f"JSON文件已导出: {file_path}")
             except Exception as e:
@@ -7046,19 +7205,19 @@ class MainWindow(QMainWindow):
             try:
                 # 获取合并文本
                 combined_text = self.get_combined_text()
+                # 后台线程导出快照，避免与界面上的编辑并发读写
+                codes = copy.deepcopy(self.structured_codes)
 
                 # 使用增强的导出器
                 from enhanced_word_exporter import EnhancedWordExporter
-                exporter = EnhancedWordExporter()
 
-                success = exporter.export_structured_codes_with_hyperlinks(
-                    file_path, self.structured_codes, combined_text, {}
-                )
+                def _export():
+                    exporter = EnhancedWordExporter()
+                    if exporter.export_structured_codes_with_hyperlinks(file_path, codes, combined_text, {}):
+                        return True, f"Word文档已导出: {file_path}"
+                    return False, "Word文档导出失败"
 
-                if success:
-                    QMessageBox.information(self, "成功", f"Word文档已导出: {file_path}")
-                else:
-                    QMessageBox.critical(self, "错误", "Word文档导出失败")
+                self._start_background_job(_export, "正在导出Word文档...")
 
             except Exception as e:
                 QMessageBox.critical(self, "导出错误", f"导出失败: {str(e)}")
@@ -7075,28 +7234,61 @@ class MainWindow(QMainWindow):
 
         if file_path:
             try:
-                success = self.data_processor.export_structured_codes_to_table(
-                    file_path, self.structured_codes
-                )
+                # 后台线程导出快照，避免与界面上的编辑并发读写
+                codes = copy.deepcopy(self.structured_codes)
+                data_processor = self.data_processor
 
-                if success:
-                    QMessageBox.information(self, "成功", f"Excel文件已导出: {file_path}")
-                else:
-                    QMessageBox.critical(self, "错误", "Excel文件导出失败")
+                def _export():
+                    if data_processor.export_structured_codes_to_table(file_path, codes):
+                        return True, f"Excel文件已导出: {file_path}"
+                    return False, "Excel文件导出失败"
+
+                self._start_background_job(_export, "正在导出Excel文件...")
 
             except Exception as e:
                 QMessageBox.critical(self, "导出错误", f"导出失败: {str(e)}")
 
+    def _start_background_job(self, fn, busy_message: str, on_finished=None):
+        """在项目读写/导出线程池中执行 fn，完成后回到GUI线程：有 on_finished 时交给它处理，否则直接提示结果"""
+        worker = _FunctionWorker(fn)
+        # 持有引用，防止信号对象在任务完成前被回收
+        self._background_workers.add(worker)
+        worker.signals.finished.connect(
+            lambda success, message, w=worker: self._on_background_job_finished(w, success, message, on_finished))
+        self._status.showMessage(busy_message)
+        QApplication.setOverrideCursor(Qt.BusyCursor)
+        self._io_pool.start(worker)
+
+    def _on_background_job_finished(self, worker, success: bool, message: str, on_finished=None):
+        """后台任务完成"""
+        self._background_workers.discard(worker)
+        QApplication.restoreOverrideCursor()
+        self._status.showMessage(message)
+        if on_finished is not None:
+            on_finished(success, message)
+        elif success:
+            QMessageBox.information(self, "成功", message)
+        else:
+            logger.error(message)
+            QMessageBox.critical(self, "错误", message)
+
     def export_results(self):
         """导出结果（综合）"""
         self.export_to_word()
 
     def get_combined_text(self):
-        """获取合并的文本"""
-        combined_text = ""
-        for file_data in self.loaded_files.values():
-            combined_text += f"\n\n=== {file_data['filename']} ===\n\n"
-            combined_text += file_data['content']
+        """获取合并的文本（文件名与内容未变化时复用上次结果）"""
+        # 元组比较先比对象身份，内容字符串未被替换时校验几乎无开销
+        key = tuple((file_data['filename'], file_data['content']) for file_data in self.loaded_files.values())
+        if self._combined_text_cache is not None and self._combined_text_cache[0] == key:
+            return self._combined_text_cache[1]
+
+        parts = []
+        for filename, content in key:
+            parts.append(f"\n\n=== {filename} ===\n\n")
+            parts.append(content)
+        combined_text = ''.join(parts)
+        self._combined_text_cache = (key, combined_text)
         return combined_text
 
     def number_all_imported_text(self):
@@ -7131,9 +7323,9 @@ class MainWindow(QMainWindow):
                 if file_path in self.loaded_files:
                     file_data = self.loaded_files[file_path]
                     if 'numbered_content' in file_data:
-                        self.text_display.setText(file_data['numbered_content'])
+                        self.text_display.setPlainText(file_data['numbered_content'])
 
-            self.statusBar().showMessage(f"已为 {len(self.loaded_files)} 个文件的文本进行编号")
+            self._status.showMessage(f"已为 {len(self.loaded_files)} 个文件的文本进行编号")
 
         except Exception as e:
             logger.error(f"编号所有文本失败: {e}")
@@ -7150,7 +7342,8 @@ class MainWindow(QMainWindow):
         if reply == QMessageBox.Yes:
             self.structured_codes = {}
             self.coding_tree.clear()
-            self.statusBar().showMessage("编码已清空")
+            self._code_id_to_content = {}
+            self._status.showMessage("编码已清空")
 
     def save_project(self):
         """保存项目"""
@@ -7163,19 +7356,29 @@ class MainWindow(QMainWindow):
 
         if ok and project_name.strip():
             try:
+                # 始终保存文件名，加载时无需再从路径推导
+                for file_path, file_data in self.loaded_files.items():
+                    if not file_data.get('filename'):
+                        file_data['filename'] = os.path.basename(file_path)
+
                 # 在保存前，将自动编码缓存中的内容也更新到loaded_files中
                 if hasattr(self, 'auto_coding_cache') and self.auto_coding_cache:
                     for file_path, content in self.auto_coding_cache.items():
                         if file_path in self.loaded_files:
                             self.loaded_files[file_path]['full_marked_content'] = content
 
-                success = self.project_manager.save_project(project_name.strip(), self.loaded_files,
-                                                            self.structured_codes)
-                if success:
-                    QMessageBox.information(self, "成功", f"项目 '{project_name}' 已保存")
-                    self.statusBar().showMessage(f"项目已保存: {project_name}")
-                else:
-                    QMessageBox.critical(self, "错误", "项目保存失败")
+                # 后台线程保存快照，避免与界面上的编辑并发读写
+                name = project_name.strip()
+                loaded_files = copy.deepcopy(self.loaded_files)
+                structured_codes = copy.deepcopy(self.structured_codes)
+                project_manager = self.project_manager
+
+                def _save():
+                    if project_manager.save_project(name, loaded_files, structured_codes):
+                        return True, f"项目 '{project_name}' 已保存"
+                    return False, "项目保存失败"
+
+                self._start_background_job(_save, "正在保存项目...")
             except Exception as e:
                 logger.error(f"保存项目失败: {e}")
                 QMessageBox.critical(self, "错误", f"项目保存失败: {str(e)}")
@@ -7194,57 +7397,64 @@ class MainWindow(QMainWindow):
             project_name, ok = QInputDialog.getItem(self, "加载项目", "请选择要加载的项目:", project_names, 0, False)
 
             if ok and project_name:
-                loaded_files, structured_codes = self.project_manager.load_project(project_name)
-
-                if loaded_files is not None and structured_codes is not None:
-                    # 清空当前数据
-                    self.loaded_files = loaded_files
-                    self.structured_codes = structured_codes
+                project_manager = self.project_manager
+                result = {}
+
+                def _load():
+                    result['data'] = project_manager.load_project(project_name)
+                    if None in result['data']:
+                        return False, "项目加载失败"
+                    return True, f"项目 '{project_name}' 已加载"
+
+                def _on_loaded(success, message):
+                    if not success:
+                        QMessageBox.critical(self, "错误", message)
+                        return
+                    try:
+                        self._apply_loaded_project(project_name, *result['data'])
+                    except Exception as e:
+                        logger.error(f"加载项目失败: {e}")
+                        QMessageBox.critical(self, "错误", f"项目加载失败: {str(e)}")
 
-                    # 更新文件列表
-                    self.file_list.clear()
+                self._start_background_job(_load, "正在加载项目...", _on_loaded)
 
-                    # 恢复自动编码缓存
-                    if not hasattr(self, 'auto_coding_cache'):
-                        self.auto_coding_cache = {}
-                    else:
-                        self.auto_coding_cache.clear()
+        except Exception as e:
+            logger.error(f"加载项目失败: {e}")
+            QMessageBox.critical(self, "错误", f"项目加载失败: {str(e)}")
 
-                    for file_path, file_data in self.loaded_files.items():
-                        filename = file_data.get('filename', os.path.basename(file_path))
-                        item = QListWidgetItem(filename)
-                        item.setData(Qt.UserRole, file_path)
-                        self.file_list.addItem(item)
+    def _apply_loaded_project(self, project_name: str, loaded_files: dict, structured_codes: dict):
+        """将后台读取的项目数据应用到界面"""
+        # 清空当前数据
+        self.loaded_files = loaded_files
+        self.structured_codes = structured_codes
 
-                        # 如果存在已保存的完整标记内容，恢复到缓存中
-                        if 'full_marked_content' in file_data:
-                            self.auto_coding_cache[file_path] = file_data['full_marked_content']
+        # 更新文件列表
+        self._rebuild_file_list(
+            (file_path, file_data.get('filename') or os.path.basename(file_path))
+            for file_path, file_data in self.loaded_files.items())
 
-                    # 更新编码树
-                    self.update_coding_tree()
+        # 恢复自动编码缓存
+        if not hasattr(self, 'auto_coding_cache'):
+            self.auto_coding_cache = {}
+        else:
+            self.auto_coding_cache.clear()
 
-                    # 自动选择第一个文件并显示
-                    if self.file_list.count() > 0:
-                        first_item = self.file_list.item(0)
-                        self.file_list.setCurrentItem(first_item)
-                        self.on_file_selected(first_item)
+        for file_path, file_data in self.loaded_files.items():
+            # 如果存在已保存的完整标记内容，恢复到缓存中
+            if 'full_marked_content' in file_data:
+                self.auto_coding_cache[file_path] = file_data['full_marked_content']
 
-                    QMessageBox.information(self, "成功", f"项目 '{project_name}' 已加载")
-                    self.statusBar().showMessage(f"项目已加载: {project_name}")
+        # 更新编码树
+        self.update_coding_tree()
 
-                    # 如果有选中的文件，显示其内容
-                    if self.file_list.count() > 0:
-                        first_item = self.file_list.item(0)
-                        self.on_file_selected(first_item)
+        # 自动选择第一个文件并显示（只显示一次）
+        if self.file_list.count() > 0:
+            first_item = self.file_list.item(0)
+            self.file_list.setCurrentItem(first_item)
+            self.on_file_selected(first_item)
 
-                    QMessageBox.information(self, "成功", f"项目 '{project_name}' 已加载")
-                    self.statusBar().showMessage(f"项目已加载: {project_name}")
-                else:
-                    QMessageBox.critical(self, "错误", "项目加载失败")
-
-        except Exception as e:
-            logger.error(f"加载项目失败: {e}")
-            QMessageBox.critical(self, "错误", f"项目加载失败: {str(e)}")
+        QMessageBox.information(self, "成功", f"项目 '{project_name}' 已加载")
+        self._status.showMessage(f"项目已加载: {project_name}")
 
     def import_coding_tree(self):
         """导入编码树 - 从项目文件中导入完整的编码结构"""
@@ -7260,10 +7470,21 @@ class MainWindow(QMainWindow):
             project_name, ok = QInputDialog.getItem(self, "导入编码树", "请选择要导入编码树的项目:", project_names, 0, False)
 
             if ok and project_name:
-                # 只加载项目的编码结构，不覆盖文件数据
-                _, structured_codes = self.project_manager.load_project(project_name)
+                project_manager = self.project_manager
+                result = {}
+
+                def _load():
+                    # 只加载项目的编码结构，不覆盖文件数据
+                    _, result['structured_codes'] = project_manager.load_project(project_name)
+                    if result['structured_codes'] is None:
+                        return False, "编码树导入失败"
+                    return True, f"已读取项目 '{project_name}' 的编码树"
+
+                def _on_loaded(success, message):
+                    if not success:
+                        QMessageBox.critical(self, "错误", message)
+                        return
 
-                if structured_codes is not None:
                     # 询问用户是否确认导入编码树
                     reply = QMessageBox.question(
                         self, "确认导入",
@@ -7272,22 +7493,20 @@ class MainWindow(QMainWindow):
                     )
 
                     if reply == QMessageBox.Yes:
-                        # 保存当前文件数据
-                        current_loaded_files = self.loaded_files
-
-                        # 更新编码结构
-                        self.structured_codes = structured_codes
+                        try:
+                            # 更新编码结构（文件数据保持不变）
+                            self.structured_codes = result['structured_codes']
 
-                        # 恢复文件数据
-                        self.loaded_files = current_loaded_files
+                            # 更新编码树界面
+                            self.update_coding_tree()
 
-                        # 更新编码树界面
-                        self.update_coding_tree()
+                            QMessageBox.information(self, "成功", f"编码树已从项目 '{project_name}' 导入")
+                            self._status.showMessage(f"编码树已导入: {project_name}")
+                        except Exception as e:
+                            logger.error(f"导入编码树失败: {e}")
+                            QMessageBox.critical(self, "错误", f"导入编码树失败: {str(e)}")
 
-                        QMessageBox.information(self, "成功", f"编码树已从项目 '{project_name}' 导入")
-                        self.statusBar().showMessage(f"编码树已导入: {project_name}")
-                else:
-                    QMessageBox.critical(self, "错误", "编码树导入失败")
+                self._start_background_job(_load, "正在读取编码树...", _on_loaded)
 
         except Exception as e:
             logger.error(f"导入编码树失败: {e}")
@@ -7295,20 +7514,7 @@ class MainWindow(QMainWindow):
 
     def show_about(self):
         """显示关于信息"""
-        about_text = """
-        <h2>扎根理论编码分析系统 v3.0</h2>
-        <p>基于人工智能的扎根理论三级编码分析工具</p>
-        <p>主要功能：</p>
-        <ul>
-        <li>支持多文件导入（TXT、Word）</li>
-        <li>手动和自动编码生成</li>
-        <li>模型训练和优化</li>
-        <li>标准答案管理</li>
-        <li>多种格式导出</li>
-        </ul>
-        <p>© 2025 质性研究实验室</p>
-        """
-        QMessageBox.about(self, "关于", about_text)
+        QMessageBox.about(self, "关于", _ABOUT_HTML)
 
     def open_governance_dashboard(self):
         """打开语义治理仪表盘"""
@@ -7322,93 +7528,42 @@ class MainWindow(QMainWindow):
 
     def load_settings(self):
         """加载设置"""
+        # 记录已保存的窗口几何/状态，关闭时未变化则不再写入
+        self._last_geom = None
+        self._last_state = None
         try:
-            self.restoreGeometry(self.settings.value("geometry", bytes()))
-            self.restoreState(self.settings.value("windowState", bytes()))
+            geometry = self.settings.value("geometry", bytes())
+            state = self.settings.value("windowState", bytes())
+            self.restoreGeometry(geometry)
+            self.restoreState(state)
+            self._last_geom = bytes(geometry)
+            self._last_state = bytes(state)
         except:
             pass
 
     def closeEvent(self, event):
         """关闭事件"""
+        # 等待进行中的后台任务（如项目保存）完成，避免写到一半退出
+        if self._background_workers:
+            self._io_pool.waitForDone()
         try:
-            self.settings.setValue("geometry", self.saveGeometry())
-            self.settings.setValue("windowState", self.saveState())
+            changed = False
+            geometry = self.saveGeometry()
+            if bytes(geometry) != getattr(self, '_last_geom', None):
+                self.settings.setValue("geometry", geometry)
+                self._last_geom = bytes(geometry)
+                changed = True
+            state = self.saveState()
+            if bytes(state) != getattr(self, '_last_state', None):
+                self.settings.setValue("windowState", state)
+                self._last_state = bytes(state)
+                changed = True
+            if changed:
+                self.settings.sync()
         except:
             pass
         event.accept()
 
-    def get_sentences_by_code_id(self, code_id: str) -> list:
-        """根据编码ID获取对应的句子详情列表"""
-        try:
-            sentences = []
-
-            # 遍历编码树查找匹配的编码ID
-            def search_tree_for_sentences(item):
-                for i in range(item.childCount()):
-                    child = item.child(i)
-                    child_data = child.data(0, Qt.UserRole)
-
-                    if child_data and child_data.get("level") == 1:  # 一阶编码
-                        if child_data.get("code_id") == code_id:
-                            # 找到匹配的编码，返回其句子详情
-                            sentence_details = child_data.get("sentence_details", [])
-                            if sentence_details:
-                                # 规范化句子对象，确保有 text 字段
-                                normalized_sentences = []
-                                for sent in sentence_details:
-                                    if isinstance(sent, dict):
-                                        # 优先使用原始句子内容，而不是抽象后的内容
-                                        text = sent.get('original_content', '') or sent.get('content', '') or sent.get(
-                                            'text', '')
-                                        if text:
-                                            # 创建规范化的句子对象
-                                            normalized_sent = {
-                                                'text': text,
-                                                'code_id': code_id,
-                                                'original': sent,  # 保留原始对象
-                                                'original_content': sent.get('original_content', '')  # 保存原始内容
-                                            }
-                                            normalized_sentences.append(normalized_sent)
-                                return normalized_sentences
-                            else:
-                                # 如果没有sentence_details，使用内容创建基本结构
-                                content = child_data.get("content", "")
-                                if content:
-                                    return [{"text": content, "code_id": code_id}]
-
-                    # 递归搜索子节点
-                    result = search_tree_for_sentences(child)
-                    if result:
-                        return result
-
-                return []
-
-            # 遍历顶层项目
-            for i in range(self.coding_tree.topLevelItemCount()):
-                top_item = self.coding_tree.topLevelItem(i)
-                result = search_tree_for_sentences(top_item)
-                if result:
-                    sentences.extend(result)
-                    break
-
-            # 如果在层级结构中没找到，检查顶层未分类的一阶编码
-            if not sentences:
-                for i in range(self.coding_tree.topLevelItemCount()):
-                    top_item = self.coding_tree.topLevelItem(i)
-                    top_data = top_item.data(0, Qt.UserRole)
-                    if top_data and top_data.get("level") == 1 and top_data.get("code_id") == code_id:
-                        content = top_data.get("content", "")
-                        if content:
-                            sentences.append({"text": content, "code_id": code_id})
-                        break
-
-            logger.info(f"编码 {code_id} 找到 {len(sentences)} 个句子")
-            return sentences
-
-        except Exception as e:
-            logger.error(f"获取句子详情失败: {e}")
-            return []
-
     def show_sentence_details_dialog(self, sentence_details, content, code_id, sentence_ids=None):
         """显示句子详情对话框 - 支持编辑功能，保持TextNumbering编号不变"""
         try:
@@ -7448,11 +7603,10 @@ class MainWindow(QMainWindow):
                     pure_content = pure_content[len(code_id + ' '):]
 
             # 对纯内容进行清理，移除可能的编号标记和编码标识符，获取不含编号的内容
-            import re
-            content_without_number = re.sub(r'\s*\[[A-Z]\d+\]', '', pure_content)
-            content_without_number = re.sub(r'\s*\[\d+\]', '', content_without_number)
+            content_without_number = _RE_CODE_TAG.sub('', pure_content)
+            content_without_number = _RE_NUM_TAG.sub('', content_without_number)
             # 修复：移除句子开头的编码标识符（如"A01 "、"B02 "等）
-            content_without_number = re.sub(r'^[A-Z]\d+\s+', '', content_without_number)
+            content_without_number = _RE_LEADING_CODE.sub('', content_without_number)
             content_without_number = content_without_number.strip()
 
             # 处理句子详情，获取所有句子
@@ -7466,10 +7620,10 @@ class MainWindow(QMainWindow):
                             'original_content', '')
                         if sent_text:
                             # 清理内容，移除编号标记和编码标识符
-                            clean_text = re.sub(r'\s*\[[A-Z]\d+\]', '', sent_text)
-                            clean_text = re.sub(r'\s*\[\d+\]', '', clean_text)
+                            clean_text = _RE_CODE_TAG.sub('', sent_text)
+                            clean_text = _RE_NUM_TAG.sub('', clean_text)
                             # 修复：移除句子开头的编码标识符
-                            clean_text = re.sub(r'^[A-Z]\d+\s+', '', clean_text)
+                            clean_text = _RE_LEADING_CODE.sub('', clean_text)
                             clean_text = clean_text.strip()
 
                             # 优先使用句子详情中的编号
@@ -7560,7 +7714,7 @@ class MainWindow(QMainWindow):
                 # 一阶编码文本行显示纯内容和编号标记
                 if first_code_number:
                     # 修复：确保显示的内容不包含编码标识符
-                    first_code_content_with_number = re.sub(r'^[A-Z]\d+\s+', '', content_without_number).strip()
+                    first_code_content_with_number = _RE_LEADING_CODE.sub('', content_without_number).strip()
                     first_code_content_with_number += f" [{first_code_number}]"
                     display_html += f"<div>{first_code_content_with_number}</div><br>"
                 else:
@@ -7576,9 +7730,9 @@ class MainWindow(QMainWindow):
                         # 修复：确保句子内容是原始句子，而不是target_abstract
                         sentence_content = sentences_list[0].get('text', content_without_number)
                         # 清理句子内容，移除编号标记和编码标识符
-                        sentence_content = re.sub(r'\s*\[[A-Z]\d+\]', '', sentence_content)
-                        sentence_content = re.sub(r'\s*\[\d+\]', '', sentence_content)
-                        sentence_content = re.sub(r'^[A-Z]\d+\s+', '', sentence_content)  # 修复：移除开头编码标识符
+                        sentence_content = _RE_CODE_TAG.sub('', sentence_content)
+                        sentence_content = _RE_NUM_TAG.sub('', sentence_content)
+                        sentence_content = _RE_LEADING_CODE.sub('', sentence_content)  # 修复：移除开头编码标识符
                         sentence_content = sentence_content.strip()
                         # 使用实际的句子编号而不是编码标识符(如A01)
                         sentence_number = first_code_number if first_code_number and first_code_number.isdigit() else ""
@@ -7587,9 +7741,9 @@ class MainWindow(QMainWindow):
                         # 后续句子：显示拖拽的文本内容和对应的编号
                         sentence_content = sentence.get('text', content_without_number)
                         # 清理句子内容，移除编号标记和编码标识符
-                        sentence_content = re.sub(r'\s*\[[A-Z]\d+\]', '', sentence_content)
-                        sentence_content = re.sub(r'\s*\[\d+\]', '', sentence_content)
-                        sentence_content = re.sub(r'^[A-Z]\d+\s+', '', sentence_content)  # 修复：移除开头编码标识符
+                        sentence_content = _RE_CODE_TAG.sub('', sentence_content)
+                        sentence_content = _RE_NUM_TAG.sub('', sentence_content)
+                        sentence_content = _RE_LEADING_CODE.sub('', sentence_content)  # 修复：移除开头编码标识符
                         sentence_content = sentence_content.strip()
                         sentence_number = sentence.get('number', '')
                         logger.info(f"弹出对话框句子{i} - 编号: {sentence_number}, 内容前30字: {sentence_content[:30]}...")
@@ -7911,7 +8065,6 @@ class MainWindow(QMainWindow):
                 # 三阶编码
                 third_display_name = top_item.text(0)
                 # 解析显示名称，获取原始名称（去掉编号）
-                import re
                 third_parts = third_display_name.split(' ', 1)
                 if len(third_parts) > 1 and re.match(r'^[A-Z]\d{2}$', third_parts[0]):
                     third_name = third_parts[1]
@@ -7924,7 +8077,6 @@ class MainWindow(QMainWindow):
                     second_item = top_item.child(j)
                     second_display_name = second_item.text(0)
                     # 解析二阶编码名称，获取原始名称（去掉编号）
-                    import re
                     second_parts = second_display_name.split(' ', 1)
                     if len(second_parts) > 1 and re.match(r'^[A-Z]\d{2}$', second_parts[0]):
                         second_name = second_parts[1]
@@ -7947,7 +8099,6 @@ class MainWindow(QMainWindow):
                             # 关联编号是句子编号列表（如"2538, 2539"），应该单独保存
                             if "code_id" not in first_item_data or not first_item_data["code_id"]:
                                 # 只有当code_id不存在时才尝试从显示文本中提取
-                                import re
                                 first_display_text = first_item.text(0)
                                 match = re.match(r'^(A\d+)', first_display_text)
                                 if match:
@@ -7969,7 +8120,6 @@ class MainWindow(QMainWindow):
                         # 注意：不要用关联编号（第5列）覆盖code_id
                         if "code_id" not in item_data or not item_data["code_id"]:
                             # 只有当code_id不存在时才尝试从显示文本中提取
-                            import re
                             top_display_text = top_item.text(0)
                             match = re.match(r'^(A\d+)', top_display_text)
                             if match:
@@ -7992,7 +8142,6 @@ class MainWindow(QMainWindow):
         if self._is_undo_operation:
             return
         try:
-            import copy
             state = {
                 'action': action_name,
                 'current_codes': copy.deepcopy(self.current_codes),
@@ -8014,7 +8163,7 @@ class MainWindow(QMainWindow):
         try:
             if not self._undo_stack:
                 if hasattr(self, 'statusBar'):
-                    self.statusBar().showMessage("没有可撤回的操作")
+                    self._status.showMessage("没有可撤回的操作")
                 return
 
             self._is_undo_operation = True
@@ -8043,7 +8192,7 @@ class MainWindow(QMainWindow):
             self.update_structured_codes_from_tree()
 
             if hasattr(self, 'statusBar'):
-                self.statusBar().showMessage(f"已撤回: {state['action']}")
+                self._status.showMessage(f"已撤回: {state['action']}")
             logger.info(f"已撤回操作: {state['action']}")
 
         except Exception as e:
@@ -8103,7 +8252,6 @@ class MainWindow(QMainWindow):
         将搜索内容中的每个字符/词之间插入可选的标签匹配模式，
         然后逐行扫描文档的纯文本进行匹配。
         """
-        import re
         from PyQt5.QtGui import QTextCursor
         
         full_text = document.toPlainText()
@@ -8190,7 +8338,6 @@ class MainWindow(QMainWindow):
                 logger.warning("文本内容为空")
                 return
 
-            import re
             found_pos = -1
             found_length = 0
 
@@ -8199,9 +8346,9 @@ class MainWindow(QMainWindow):
             sentence_number = sentence_number if sentence_number else ""
 
             # 清理内容，移除编号标记
-            clean_content = re.sub(r'\s*\[[A-Z]\d+\]', '', sentence_content)
-            clean_content = re.sub(r'\s*\[\d+\]', '', clean_content)
-            clean_content = re.sub(r'^[A-Z]\d+\s+', '', clean_content)
+            clean_content = _RE_CODE_TAG.sub('', sentence_content)
+            clean_content = _RE_NUM_TAG.sub('', clean_content)
+            clean_content = _RE_LEADING_CODE.sub('', clean_content)
             clean_content = clean_content.strip()
 
             if not clean_content:
@@ -8216,21 +8363,10 @@ class MainWindow(QMainWindow):
                     break
 
             # 如果找到目标文件且不是当前显示的文件，切换文件
-            if target_file:
-                current_items = self.file_list.selectedItems()
-                current_file = current_items[0].data(Qt.UserRole) if current_items else None
-
-                if current_file != target_file:
-                    # 在文件列表中查找并选中目标文件
-                    for i in range(self.file_list.count()):
-                        item = self.file_list.item(i)
-                        if item.data(Qt.UserRole) == target_file:
-                            self.file_list.setCurrentItem(item)
-                            # 显式触发文件加载
-                            self.on_file_selected(item)
-                            # 等待文件显示更新
-                            QApplication.processEvents()
-                            break
+            if target_file and target_file != self._current_displayed_file:
+                # 通过索引直接定位并同步显示目标文件
+                if self._switch_to_file(target_file):
+                    current_text = self.text_display.toPlainText()
 
             # 直接搜索编码对应的完整内容
             document = self.text_display.document()
@@ -8239,13 +8375,36 @@ class MainWindow(QMainWindow):
             search_content = clean_content.strip()
             logger.info(f"搜索内容: {search_content[:50]}...")
 
-            # 尝试完整匹配
-            content_cursor = document.find(search_content)
+            # 同一文档版本中重复点击同一内容时直接复用上次的匹配区间（不对整篇文本求哈希）
+            cache_key = (search_content, id(document), self._document_generation)
+            cached_span = self._highlight_cache.get(cache_key)
+            if cached_span is not None:
+                content_cursor = QTextCursor(document)
+                content_cursor.setPosition(cached_span[0])
+                content_cursor.setPosition(cached_span[1], QTextCursor.KeepAnchor)
+            else:
+                # 尝试完整匹配：先在纯文本上用 str.find 定位，只为命中位置构建光标
+                found_at = current_text.find(search_content)
+                if found_at >= 0:
+                    # str.find 给出的是 Python 下标，换算为文档位置
+                    start, end = _to_utf16_spans(current_text, [(found_at, found_at + len(search_content))])[0]
+                    content_cursor = QTextCursor(document)
+                    content_cursor.setPosition(start)
+                    content_cursor.setPosition(end, QTextCursor.KeepAnchor)
+                else:
+                    # 大小写不同等情况仍交给 QTextDocument.find（默认不区分大小写）
+                    content_cursor = document.find(search_content)
 
-            if content_cursor.isNull():
-                # 如果完整匹配失败，使用正则表达式搜索（允许标签出现在任意位置）
-                logger.info("完整匹配失败，使用正则表达式搜索...")
-                content_cursor = self._find_content_with_regex(document, search_content)
+                if content_cursor.isNull():
+                    # 如果完整匹配失败，使用正则表达式搜索（允许标签出现在任意位置）
+                    logger.info("完整匹配失败，使用正则表达式搜索...")
+                    content_cursor = self._find_content_with_regex(document, search_content)
+
+                if not content_cursor.isNull():
+                    self._highlight_cache[cache_key] = (content_cursor.selectionStart(),
+                                                        content_cursor.selectionEnd())
+                    if len(self._highlight_cache) > self.HIGHLIGHT_CACHE_SIZE:
+                        self._highlight_cache.pop(next(iter(self._highlight_cache)))
 
             if content_cursor.isNull():
                 # 如果正则搜索失败，尝试分句搜索
@@ -8285,7 +8444,6 @@ class MainWindow(QMainWindow):
 
     def split_into_sentences(self, content):
         """将内容分割成句子"""
-        import re
         # 按句号、问号、感叹号分割
         sentences = re.split(r'[。！？\n]', content)
         # 过滤空句子并去除前后空白
@@ -8305,7 +8463,6 @@ class MainWindow(QMainWindow):
                     continue
 
                 # 清理句子
-                import re
                 clean_sentence = re.sub(r'\s*\[\d+\]\s*', ' ', sentence)
                 clean_sentence = re.sub(r'^\s*[①②③④⑤⑥⑦⑧⑨⑩]\s*', '', clean_sentence)
                 clean_sentence = clean_sentence.strip()
@@ -8440,188 +8597,9 @@ class MainWindow(QMainWindow):
             logger.error(f"查找句子开始位置失败: {e}")
             return mark_position
 
-    def highlight_text_by_code_id_precise(self, code_id: str):
-        """通过编码ID精确高亮文本和对应内容（基于sentence_details）"""
-        try:
-            if not code_id:
-                return
-
-            # 获取编码对应的精确句子内容
-            sentences_to_highlight = self.get_sentences_by_code_id(code_id)
-
-            if not sentences_to_highlight:
-                self.statusBar().showMessage(f"未找到编码 {code_id} 的句子详情")
-                return
-
-            # 查找包含该句子的文件并切换显示
-            target_file = None
-            for sentence_info in sentences_to_highlight:
-                # 优先使用原始内容，而不是抽象后的内容
-                sentence_content = sentence_info.get('original_content', '') or sentence_info.get('text', '').strip()
-                if not sentence_content:
-                    continue
-
-                # 清理句子内容
-                sentence_clean = re.sub(r'\s*\[[A-Z]\d+\]', '', sentence_content)
-                sentence_clean = re.sub(r'^[A-Z]\d+\s+', '', sentence_clean)
-                sentence_clean = re.sub(r'\s*\[\d+\]', '', sentence_clean).strip()
-
-                # 在所有已加载的文件中查找
-                for file_path, file_data in self.loaded_files.items():
-                    file_text = file_data.get('numbered_content', '') or file_data.get('content', '')
-                    if sentence_clean in file_text:
-                        target_file = file_path
-                        break
-
-                if target_file:
-                    break
-
-            # 如果找到目标文件且不是当前显示的文件，切换文件
-            if target_file:
-                current_items = self.file_list.selectedItems()
-                current_file = current_items[0].data(Qt.UserRole) if current_items else None
-
-                if current_file != target_file:
-                    # 在文件列表中查找并选中目标文件
-                    for i in range(self.file_list.count()):
-                        item = self.file_list.item(i)
-                        if item.data(Qt.UserRole) == target_file:
-                            self.file_list.setCurrentItem(item)
-                            # 显式触发文件加载
-                            self.on_file_selected(item)
-                            # 等待文件显示更新
-                            QApplication.processEvents()
-                            break
-
-            # 获取当前显示的文本
-            current_text = self.text_display.toPlainText()
-            if not current_text:
-                return
-
-            # 移动光标到文本开始
-            cursor = self.text_display.textCursor()
-            cursor.movePosition(cursor.Start)
-            self.text_display.setTextCursor(cursor)
-
-            # 清除之前的高亮
-            self.clear_text_highlights()
-
-            # 精确高亮每个句子
-            found_count = 0
-            first_match_position = None  # 记录第一个匹配项的位置
-            extra_selections = []  # 用于存储临时高亮的选择
-
-            # 获取一阶编码的精确内容
-            code_content = self.get_content_by_code_id(code_id)
-            code_clean = ""
-            if code_content:
-                # 清理编码内容，移除可能存在的标记，例如 [A1], A1等
-                code_clean = re.sub(r'\s*\[[A-Z]\d+\]', '', code_content)
-                code_clean = re.sub(r'^[A-Z]\d+\s+', '', code_clean)
-                code_clean = re.sub(r'\s*\[\d+\]', '', code_clean).strip()
-                # 去除可能的关联编号前缀，例如 "1:"
-                code_clean = re.sub(r'^\d+\s*:\s*', '', code_clean).strip()
-
-            # 优先高亮一阶编码的精确内容 (短语)
-            if code_clean:
-                search_cursor = self.text_display.textCursor()
-                search_cursor.movePosition(cursor.Start)
-
-                # 策略1：直接查找编码内容
-                found_cursor = self.text_document.find(code_clean, search_cursor)
-
-                # 策略2：如果策略1失败，尝试使用正则表达式查找（忽略空白差异）
-                if found_cursor.isNull():
-                    # 限制正则表达式长度，避免性能问题
-                    if len(code_clean) > 100:
-                        code_clean = code_clean[:100]
-                    # 转换为正则模式，将多个空白符视为一个
-                    pattern = re.sub(r'\s+', r'\\s+', re.escape(code_clean))
-                    regex = QRegularExpression(pattern)
-                    found_cursor = self.text_document.find(regex, search_cursor)
-
-                if not found_cursor.isNull():
-                    # 使用 ExtraSelection 进行临时高亮
-                    selection = QTextEdit.ExtraSelection()
-                    selection.cursor = found_cursor
-                    selection.format.setBackground(QColor(173, 216, 230))  # 浅蓝色背景
-                    selection.format.setForeground(QColor(0, 0, 139))  # 深蓝色文字
-                    extra_selections.append(selection)
-
-                    found_count += 1
-
-                    # 记录第一个匹配项的位置用于滚动
-                    if first_match_position is None:
-                        first_match_position = found_cursor.selectionStart()
-                        logger.info(f"记录第一个匹配位置: {first_match_position}")
-
-            if found_count == 0:
-                for sentence_info in sentences_to_highlight:
-                    # 优先使用原始内容，而不是抽象后的内容
-                    sentence_content = sentence_info.get('original_content', '') or sentence_info.get('text',
-                                                                                                      '').strip()
-                    if not sentence_content:
-                        continue
-
-                    # 清理句子内容：移除可能存在的编号标记
-                    sentence_clean = re.sub(r'\s*\[[A-Z]\d+\]', '', sentence_content)
-                    sentence_clean = re.sub(r'^[A-Z]\d+\s+', '', sentence_clean)
-                    sentence_clean = re.sub(r'\s*\[\d+\]', '', sentence_clean).strip()
-
-                    # 在文本中查找并高亮这个精确句子
-                    search_cursor = self.text_display.textCursor()
-                    search_cursor.movePosition(cursor.Start)
-
-                # 策略1：直接查找清理后的文本
-                found_cursor = self.text_document.find(sentence_clean, search_cursor)
-
-                # 策略2：如果策略1失败，尝试查找前50个字符
-                if found_cursor.isNull() and len(sentence_clean) > 50:
-                    found_cursor = self.text_document.find(sentence_clean[:50], search_cursor)
-
-                # 策略3：如果还失败，尝试使用正则表达式查找（忽略空白差异）
-                if found_cursor.isNull():
-                    # 转换为正则模式，将多个空白符视为一个
-                    pattern = re.sub(r'\s+', r'\\s+', re.escape(sentence_clean))
-                    regex = QRegularExpression(pattern)
-                    found_cursor = self.text_document.find(regex, search_cursor)
-
-                if not found_cursor.isNull():
-                    # 使用 ExtraSelection 进行临时高亮
-                    selection = QTextEdit.ExtraSelection()
-                    selection.cursor = found_cursor
-                    selection.format.setBackground(QColor(173, 216, 230))  # 浅蓝色背景
-                    selection.format.setForeground(QColor(0, 0, 139))  # 深蓝色文字
-                    extra_selections.append(selection)
-
-                    found_count += 1
-
-                    # 记录第一个匹配项的位置用于滚动
-                    if first_match_position is None:
-                        first_match_position = found_cursor.selectionStart()
-                        logger.info(f"记录第一个匹配位置: {first_match_position}")
-
-            if found_count > 0 and first_match_position is not None:
-                # 应用临时高亮
-                self.text_display.setExtraSelections(extra_selections)
-
-                # 创建新的光标并定位到第一个匹配项的位置
-                new_cursor = self.text_display.textCursor()
-                new_cursor.setPosition(first_match_position)
-
-                # 设置光标并确保可见
-                self.text_display.setTextCursor(new_cursor)
-                self.text_display.ensureCursorVisible()
-
-                logger.info(f"已定位到位置: {first_match_position}")
-                self.statusBar().showMessage(f"已高亮编码 {code_id} 的 {found_count} 个句子")
-            else:
-                logger.warning(f"未找到编码 {code_id} 对应的句子内容")
-                self.statusBar().showMessage(f"未找到编码 {code_id} 对应的句子内容")
-
-        except Exception as e:
-            logger.error(f"精确高亮文本失败: {e}", exc_info=True)
-            self.statusBar().showMessage(f"高亮失败: {str(e)}")
+    def _on_document_contents_changed(self):
+        """文档内容变化：推进文档版本号，使按旧内容记录的缓存失效"""
+        self._document_generation += 1
 
     def open_excel_processor(self):
         """打开Excel处理器对话框"""
@@ -8793,10 +8771,10 @@ class MainWindow(QMainWindow):
                 original_content = content_text[len(code_id + ' '):]
             else:
                 original_content = content_text
-            original_content = re.sub(r'^[A-Z]\d+\s+', '', original_content)
+            original_content = _RE_LEADING_CODE.sub('', original_content)
             original_content = re.sub(r'^\d+\s*,\s*\d+\s*', '', original_content)
             original_content = re.sub(r'^(?:\[\d+\]|\d+)\s+', '', original_content)
-            original_content = re.sub(r'\s*\[\d+\]', '', original_content)
+            original_content = _RE_NUM_TAG.sub('', original_content)
             display_content = f"{code_id} {original_content}"
         else:
             display_content = numbered_content if numbered_content else content
@@ -8812,7 +8790,7 @@ class MainWindow(QMainWindow):
         self.update_structured_codes_from_tree()
         self.coding_tree.setCurrentItem(target_item)
 
-        self.statusBar().showMessage("一阶编码已合并为关联文本")
+        self._status.showMessage("一阶编码已合并为关联文本")
         return True
 
 
@@ -9175,7 +9153,6 @@ class MainWindow(QMainWindow):
 
     def validate_first_level_quality(self, content):
         """验证一阶编码质量：无语气词、无你我他、无吗疑问词"""
-        import re
         modal_particles = ["啊", "呀", "呢", "吧", "嘛", "哦", "哟", "哈", "哇", "喽",
                           "哎", "唉", "呵", "嘻", "嘿", "喂", "嗯", "呃", "噢", "咧",
                           "咯", "呗", "啦", "嘞", "哩", "呐", "么", "罢", "哉", "矣",
@@ -9202,7 +9179,6 @@ class MainWindow(QMainWindow):
     def generate_first_code_id(self):
         """生成一阶编码ID：A01, A02...（A开头，数字递增）"""
         existing_numbers = []
-        import re
         for i in range(self.coding_tree.topLevelItemCount()):
             top_item = self.coding_tree.topLevelItem(i)
             top_data = top_item.data(0, Qt.UserRole)
@@ -9242,7 +9218,6 @@ class MainWindow(QMainWindow):
             if top_data and top_data.get("level") == 4:
                 top_text = top_item.text(0)
                 if top_text and len(top_text) > 0:
-                    import re
                     parts = top_text.split(' ', 1)
                     if len(parts) > 0:
                         code_part = parts[0]
@@ -9268,7 +9243,6 @@ class MainWindow(QMainWindow):
             if top_data and top_data.get("level") == 5:
                 top_text = top_item.text(0)
                 if top_text and len(top_text) > 0:
-                    import re
                     parts = top_text.split(' ', 1)
                     if len(parts) > 0:
                         code_part = parts[0]
@@ -9294,7 +9268,6 @@ class MainWindow(QMainWindow):
             if top_data and top_data.get("level") == 6:
                 top_text = top_item.text(0)
                 if top_text and len(top_text) > 0:
-                    import re
                     parts = top_text.split(' ', 1)
                     if len(parts) > 0:
                         code_part = parts[0]
@@ -9389,7 +9362,7 @@ class MainWindow(QMainWindow):
                 else:
                     QMessageBox.warning(self, "警告", "请选择有意义的文本（至少1个字符）")
             else:
-                self.statusBar().showMessage("请先在文本中选择需要编码的内容")
+                self._status.showMessage("请先在文本中选择需要编码的内容")
 
         except Exception as e:
             logger.error(f"选择句子失败: {e}")
@@ -9453,7 +9426,6 @@ class MainWindow(QMainWindow):
             # 所有验证通过后才保存撤回状态
             self._save_undo_state("添加一阶编码")
 
-            import re
             sentence_id = code_id
             detail_text = clean_content
 
@@ -9496,11 +9468,9 @@ class MainWindow(QMainWindow):
             else:
                 if str(sentence_id).isdigit():
                     doc = self.text_display.document()
-                    search_cursor = self.text_display.textCursor()
-                    search_cursor.movePosition(QTextCursor.Start)
 
                     target_marker = f"[{sentence_id}]"
-                    found_cursor = doc.find(target_marker, search_cursor)
+                    found_cursor = doc.find(target_marker, 0)
 
                     if not found_cursor.isNull():
                         current_text = self.text_display.toPlainText()
@@ -9564,7 +9534,6 @@ class MainWindow(QMainWindow):
         try:
             cursor = self.text_display.textCursor()
             selection_end = cursor.selectionEnd()
-            import re
 
             check_pos = selection_end
             current_text = self.text_display.toPlainText()
@@ -9615,7 +9584,7 @@ class MainWindow(QMainWindow):
         """执行撤回操作"""
         try:
             if not self._undo_stack:
-                self.statusBar().showMessage("没有可撤回的操作")
+                self._status.showMessage("没有可撤回的操作")
                 return
 
             self._is_undo_operation = True
@@ -9626,16 +9595,14 @@ class MainWindow(QMainWindow):
             self.auto_coding_cache = state['auto_coding_cache']
             self.code_markers_map = state['code_markers_map']
 
-            # 快速重建：暂停重绘 → 清空重建 → 恢复重绘
-            self.coding_tree.setUpdatesEnabled(False)
+            # 快速重建（update_coding_tree 内部已暂停重绘并批量挂载）
             self.update_coding_tree()
-            self.coding_tree.setUpdatesEnabled(True)
 
             current_file = self.get_current_file_path()
             if current_file and current_file in self.loaded_files:
                 self.text_display.setPlainText(state['text_content'])
 
-            self.statusBar().showMessage(f"已撤回: {state['action']}")
+            self._status.showMessage(f"已撤回: {state['action']}")
             logger.info(f"已撤回操作: {state['action']}")
 
         except Exception as e:
@@ -9738,7 +9705,7 @@ class MainWindow(QMainWindow):
 
             QMessageBox.information(self, "成功", f"编码已保存到: {file_path}")
             logger.info(f"编码已保存: {file_path}")
-            self.statusBar().showMessage(f"编码已保存: {os.path.basename(file_path)}")
+            self._status.showMessage(f"编码已保存: {os.path.basename(file_path)}")
             return True
 
         except Exception as e:
@@ -9786,12 +9753,9 @@ class MainWindow(QMainWindow):
             if loaded_files:
                 self.loaded_files = loaded_files
                 # 重建文件列表 UI
-                self.file_list.clear()
-                for fpath, fdata in loaded_files.items():
-                    fname = fdata.get('filename', os.path.basename(fpath))
-                    item = QListWidgetItem(fname)
-                    item.setData(Qt.UserRole, fpath)
-                    self.file_list.addItem(item)
+                self._rebuild_file_list(
+                    (fpath, fdata.get('filename') or os.path.basename(fpath))
+                    for fpath, fdata in loaded_files.items())
                 # 选中第一个文件
                 if self.file_list.count() > 0:
                     self.file_list.setCurrentRow(0)
@@ -9815,7 +9779,7 @@ class MainWindow(QMainWindow):
             if hasattr(self, 'workspace_page'):
                 self.workspace_page.refresh_file_tree()
             QMessageBox.information(self, "成功", f"编码结果已导入: {os.path.basename(file_path)}")
-            self.statusBar().showMessage(f"编码结果已导入: {os.path.basename(file_path)}")
+            self._status.showMessage(f"编码结果已导入: {os.path.basename(file_path)}")
 
         except Exception as e:
             logger.error(f"导入编码结果失败: {e}")
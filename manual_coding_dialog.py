@@ -1,6 +1,10 @@
 import os
 import json
 import re
+import time
+import traceback
+from collections import deque
+from functools import lru_cache
 from datetime import datetime
 from PyQt5.QtWidgets import (QDialog, QVBoxLayout, QHBoxLayout, QFormLayout,
                              QGroupBox, QTextEdit, QLineEdit, QPushButton, QWidget,
@@ -16,6 +20,45 @@ from path_manager import PathManager
 
 logger = logging.getLogger(__name__)
 
+# 三阶编码编号，如 "C01"（捕获数字部分）
+_RE_THIRD_CODE_ID = re.compile(r'^C(\d{2})$')
+
+# 编号文本中的句子编号标记，如 "[12]"（捕获编号）
+_RE_SENTENCE_TAG = re.compile(r'\[(\d+)\]')
+
+# 编码名称长度上限：层级 -> (最大字符数, 层级名称)
+_NAME_LENGTH_LIMITS = {
+    "first": (300, "一阶"),
+    "second": (100, "二阶"),
+    "third": (100, "三阶"),
+}
+
+
+@lru_cache(maxsize=1024)
+def _validate_category_name(name, level):
+    """验证编码名称，返回 (是否有效, 清理后的名称, 错误信息)；纯函数，重复输入直接命中缓存"""
+    if not name:
+        return False, "", "编码名称不能为空"
+
+    limit = _NAME_LENGTH_LIMITS.get(level)
+    if limit and len(name) > limit[0]:
+        return False, "", f"{limit[1]}编码名称不能超过{limit[0]}个字符"
+
+    return True, name.strip(), ""
+
+
+def _whitespace_tolerant_pattern(text):
+    """文本 -> 正则模式：各词按字面匹配，词间连续空白可匹配任意空白"""
+    return r'\s+'.join(re.escape(part) for part in text.split())
+
+
+@lru_cache(maxsize=256)
+def _whitespace_tolerant_regex(text):
+    """文本 -> 预编译的查找正则：连续空白可匹配任意空白、不区分大小写；同一文本重复查找直接命中缓存"""
+    regex = QRegularExpression(_whitespace_tolerant_pattern(text), QRegularExpression.CaseInsensitiveOption)
+    regex.optimize()
+    return regex
+
 
 class DragDropTreeWidget(QTreeWidget):
     """支持拖放功能的树形控件"""
@@ -28,6 +71,8 @@ class DragDropTreeWidget(QTreeWidget):
         self.setAcceptDrops(True)
         self.setDropIndicatorShown(True)
         self.setDragDropMode(QTreeWidget.InternalMove)
+        # 各行均为单行文本、同一字体，统一行高可让展开/滚动时跳过逐行测量
+        self.setUniformRowHeights(True)
 
     def dragEnterEvent(self, event):
         """处理拖拽进入事件"""
@@ -136,7 +181,6 @@ class DragDropTreeWidget(QTreeWidget):
             else:
                 event.ignore()
         except Exception:
-            import traceback
             traceback.print_exc()
             try:
                 super().dropEvent(event)
@@ -213,17 +257,119 @@ class ManualCodingDialog(QDialog):
         self.existing_codes = existing_codes or {}
         self.auto_coding_cache = auto_coding_cache or {}
         self.code_markers_map = code_markers_map or {}
+        # 编码树已修改、current_codes 等尚未同步；读取时才统一重建一次（见 _mark_codes_dirty）
+        self._codes_dirty = False
         self.current_codes = {}
         # 未分类的一阶编码临时存储
         self.unclassified_first_codes = []
+        # 一阶编码内容索引（current_codes 与未分类列表中的字符串条目），None 表示需要重建
+        self._first_content_set = None
+        # 编码ID -> 非顶层一阶节点数据列表（先序），None 表示需要重建（编码树模型变化时置 None）
+        self._code_id_node_index = None
+        # 句子编号 -> 首个包含该编号标记的已加载文件，None 表示需要重建（替换 loaded_files 时置 None）
+        self._sentence_file_index = None
+        # 文本框文档内容每变化一次加一，用于判断按文档内容记录的缓存是否仍然有效
+        self._document_generation = 0
+        # 精确高亮位置缓存：编码ID -> (文档版本号, 选区列表)，编码树变化时清空
+        self._precise_highlight_cache = {}
         # 高阶编码数据（4-6阶）
         self.higher_level_data = []
+        # 文本框当前显示的文件（由 on_file_selected 设置），其他途径改写文本框时置 None
+        self._current_text_path = None
+        # 未编号文件的显示内容：file_path -> (原始内容, 编号后的内容)，原始内容不变时直接复用
+        self._numbered_display_cache = {}
         # 撤回功能相关
         self._undo_stack = []
         self._max_undo_steps = 50
         self._is_undo_operation = False
+        # 编码数据已加载、编码树尚待构建（见 load_existing_codes）
+        self._coding_tree_pending = False
         self.init_ui()
-        self.load_existing_codes()
+        # 编码数据同步加载，get_coding_result() 等随时可读；只把编码树推迟到对话框显示后再构建，
+        # 窗口先出现，大编码集不再阻塞 show()/exec_()
+        self.load_existing_codes(defer_tree=True)
+
+    # current_codes / unclassified_first_codes / higher_level_data 由编码树派生：
+    # 读写前先把挂起的树修改同步过来
+    @property
+    def current_codes(self):
+        self._flush_codes()
+        return self._current_codes
+
+    @current_codes.setter
+    def current_codes(self, value):
+        self._flush_codes()
+        self._current_codes = value
+
+    @property
+    def unclassified_first_codes(self):
+        self._flush_codes()
+        return self._unclassified_first_codes
+
+    @unclassified_first_codes.setter
+    def unclassified_first_codes(self, value):
+        self._flush_codes()
+        self._unclassified_first_codes = value
+
+    @property
+    def higher_level_data(self):
+        self._flush_codes()
+        return self._higher_level_data
+
+    @higher_level_data.setter
+    def higher_level_data(self, value):
+        self._flush_codes()
+        self._higher_level_data = value
+
+    def _mark_codes_dirty(self):
+        """编码树已修改：推迟 update_structured_codes_from_tree，连续修改只在下次读取时重建一次"""
+        self._codes_dirty = True
+        self._invalidate_first_content_set()
+
+    def _flush_codes(self):
+        """如有挂起的树修改，从编码树重建编码数据"""
+        if self._codes_dirty:
+            self._codes_dirty = False
+            self.update_structured_codes_from_tree()
+
+    # 以下 _apply_add_* 在新节点追加为最后一个子节点后，直接同步 current_codes 的对应位置，
+    # 结果与 update_structured_codes_from_tree 整树重建一致；数据已挂起重建或结构不符时退回 _mark_codes_dirty。
+    # 被修改的内层字典/列表先复制再替换回去，不改动可能与调用方共享的容器
+    def _apply_add_third(self, third_item):
+        """三阶节点已追加到树顶层末尾"""
+        key = third_item.text(0)
+        if self._codes_dirty or key in self._current_codes:
+            self._mark_codes_dirty()
+            return
+        self._current_codes[key] = {}
+
+    def _apply_add_second(self, third_item, second_item):
+        """二阶节点已追加到三阶节点末尾"""
+        seconds = None if self._codes_dirty else self._current_codes.get(third_item.text(0))
+        key = second_item.text(0)
+        if not isinstance(seconds, dict) or key in seconds:
+            self._mark_codes_dirty()
+            return
+        seconds = dict(seconds)
+        seconds[key] = []
+        self._current_codes[third_item.text(0)] = seconds
+
+    def _apply_add_first(self, second_item, first_item):
+        """一阶节点已追加到二阶节点末尾（二阶不在三阶下时不属于 current_codes，同样退回重建）"""
+        third_item = second_item.parent()
+        seconds = firsts = None
+        if not self._codes_dirty and third_item is not None \
+                and (third_item.data(0, Qt.UserRole) or {}).get("level") == 3:
+            seconds = self._current_codes.get(third_item.text(0))
+            if isinstance(seconds, dict):
+                firsts = seconds.get(second_item.text(0))
+        if not isinstance(firsts, list):
+            self._mark_codes_dirty()
+            return
+        seconds = dict(seconds)
+        seconds[second_item.text(0)] = firsts + [first_item.data(0, Qt.UserRole)]
+        self._current_codes[third_item.text(0)] = seconds
+        self._invalidate_first_content_set()
 
     def init_ui(self):
         self.setWindowTitle("手动编码工具 - 全屏版")
@@ -302,6 +448,7 @@ class ManualCodingDialog(QDialog):
 
         # 保存文本文档引用
         self.text_document = self.text_display.document()
+        self.text_document.contentsChanged.connect(self._on_document_contents_changed)
 
         # 不再自动弹出恢复编码进度对话框，用户可以通过导入功能手动恢复
         # self.check_and_restore_last_coding_position()
@@ -347,15 +494,17 @@ class ManualCodingDialog(QDialog):
         file_layout = QVBoxLayout(file_group)
 
         self.file_list = QListWidget()
+        # 各行均为单行文件名，统一尺寸可跳过逐项测量
+        self.file_list.setUniformItemSizes(True)
         self.file_list.itemClicked.connect(self.on_file_selected)
         file_layout.addWidget(self.file_list)
 
-        # 加载文件到列表
-        for file_path, file_data in self.loaded_files.items():
-            filename = file_data.get('filename', os.path.basename(file_path))
-            item = QListWidgetItem(filename)
-            item.setData(Qt.UserRole, file_path)
-            self.file_list.addItem(item)
+        # 加载文件到列表：一次性添加全部文件名，再补挂路径数据
+        file_paths = list(self.loaded_files)
+        self.file_list.addItems([self.loaded_files[file_path].get('filename', os.path.basename(file_path))
+                                 for file_path in file_paths])
+        for row, file_path in enumerate(file_paths):
+            self.file_list.item(row).setData(Qt.UserRole, file_path)
 
         layout.addWidget(file_group)
 
@@ -502,6 +651,11 @@ class ManualCodingDialog(QDialog):
         self.coding_tree.setSelectionMode(QTreeWidget.ExtendedSelection)  # 支持多选
         self.coding_tree.itemDoubleClicked.connect(self.on_tree_item_double_clicked)
         self.coding_tree.itemClicked.connect(self.on_tree_item_clicked)  # 添加点击事件
+        # 节点增删、移动、改数据都会使编码ID索引失效
+        tree_model = self.coding_tree.model()
+        for signal in (tree_model.rowsInserted, tree_model.rowsRemoved, tree_model.rowsMoved,
+                       tree_model.dataChanged, tree_model.modelReset, tree_model.layoutChanged):
+            signal.connect(self._invalidate_code_id_node_index)
 
         # 设置上下文菜单
         self.coding_tree.setContextMenuPolicy(Qt.CustomContextMenu)
@@ -587,11 +741,19 @@ class ManualCodingDialog(QDialog):
 
         return panel
 
-    def load_existing_codes(self):
-        """加载现有编码"""
+    def load_existing_codes(self, defer_tree=False):
+        """加载现有编码；defer_tree 为 True 时编码树在下一轮事件循环中构建"""
         if self.existing_codes:
             # 增强对自动生成编码结构的解析
-            self.current_codes = self.existing_codes.copy()
+            # 复制到一阶列表这一层：对话框原地增删二阶/一阶时不会改动调用方的 structured_codes；
+            # 一阶条目字典本身仍共享，复制成本与编码条数成正比
+            self.current_codes = {
+                third: ({second: (list(firsts) if isinstance(firsts, list) else firsts)
+                         for second, firsts in seconds.items()}
+                        if isinstance(seconds, dict) else seconds)
+                for third, seconds in self.existing_codes.items()
+            }
+            self._invalidate_first_content_set()
 
             # 为自动生成的编码添加标识，便于用户识别
             self._mark_auto_generated_codes()
@@ -599,7 +761,16 @@ class ManualCodingDialog(QDialog):
             self.update_category_combos()
             # 只有当树形控件已经创建后才更新
             if hasattr(self, 'coding_tree'):
-                self.update_coding_tree()
+                if defer_tree:
+                    self._coding_tree_pending = True
+                    QTimer.singleShot(0, self._build_pending_coding_tree)
+                else:
+                    self.update_coding_tree()
+
+    def _build_pending_coding_tree(self):
+        """构建推迟的编码树；已被其他入口提前构建时不再重复"""
+        if self._coding_tree_pending:
+            self.update_coding_tree()
 
     def _mark_auto_generated_codes(self):
         """为自动生成的编码添加标识，便于用户识别"""
@@ -630,6 +801,11 @@ class ManualCodingDialog(QDialog):
             new_file_path = item.data(Qt.UserRole)
             logger.info(f"选择了文件: {new_file_path}")
 
+            # 重复点击当前文件且文本未被改动：显示内容不变，跳过保存比对与 setPlainText 重排
+            if new_file_path == self._current_text_path and not self.text_display.document().isModified():
+                return
+            self._current_text_path = None
+
             # 在切换文件前，先保存之前文件的编码标记状态
             self.save_previous_file_coding_marks(new_file_path)
 
@@ -642,6 +818,7 @@ class ManualCodingDialog(QDialog):
 
                 if display_content and display_content != "文件内容为空":
                     self.text_display.setPlainText(display_content)
+                    self._current_text_path = new_file_path
                     self.select_sentence_btn.setEnabled(True)
                     logger.info("文本内容显示成功")
                 else:
@@ -762,16 +939,20 @@ class ManualCodingDialog(QDialog):
                 logger.info(f"使用已有的编号内容: {os.path.basename(file_path)}")
                 return numbered_content
 
-            # 4. 获取原始内容并进行编号
+            # 4. 获取原始内容并进行编号（每个文件只编号一次）
             content = file_data.get('content', '') or file_data.get('original_content', '') or file_data.get(
                 'original_text', '')
             if content:
+                cached = self._numbered_display_cache.get(file_path)
+                if cached and cached[0] == content:
+                    return cached[1]
                 try:
                     from data_processor import DataProcessor
                     processor = DataProcessor()
                     filename = os.path.basename(file_path)
                     display_content, number_mapping = processor.numbering_manager.number_text(content, filename)
                     logger.info(f"对原始内容进行编号: {os.path.basename(file_path)}")
+                    self._numbered_display_cache[file_path] = (content, display_content)
                     return display_content
                 except Exception as e:
                     logger.error(f"内容编号失败: {e}")
@@ -1197,7 +1378,6 @@ class ManualCodingDialog(QDialog):
                     continue
 
                 # 清理句子
-                import re
                 clean_sentence = re.sub(r'\s*\[\d+\]\s*', ' ', sentence)
                 clean_sentence = re.sub(r'^\s*[①②③④⑤⑥⑦⑧⑨⑩]\s*', '', clean_sentence)
                 clean_sentence = clean_sentence.strip()
@@ -1245,7 +1425,6 @@ class ManualCodingDialog(QDialog):
                     continue
 
                 # 清理行内容
-                import re
                 clean_line = re.sub(r'^\s*[①②③④⑤⑥⑦⑧⑨⑩]\s*', '', line)
                 clean_line = re.sub(r'\s*\[\d+\]\s*', '', clean_line)
                 clean_line = clean_line.strip()
@@ -1498,24 +1677,6 @@ class ManualCodingDialog(QDialog):
         except Exception as e:
             logger.error(f"通过标记高亮内容失败: {e}")
 
-    def validate_category_name(self, name, level):
-        """验证编码名称"""
-        if not name:
-            return False, "", "编码名称不能为空"
-
-        if level == "first":
-            if len(name) > 300:
-                return False, "", "一阶编码名称不能超过300个字符"
-        elif level == "second":
-            if len(name) > 100:
-                return False, "", "二阶编码名称不能超过100个字符"
-        elif level == "third":
-            if len(name) > 100:
-                return False, "", "三阶编码名称不能超过100个字符"
-
-        clean_name = name.strip()
-        return True, clean_name.strip(), ""
-
     def generate_first_code_id(self):
         """生成一阶编码ID：A01, A02, A03...（A开头，数字递增）"""
         # 如果有恢复的编码计数器，从那里继续
@@ -1656,7 +1817,6 @@ class ManualCodingDialog(QDialog):
             logger.info(f"已为 {len(unclassified_second_items)} 个未分类二阶编码重新编序")
         except Exception as e:
             logger.error(f"重新编序未分类二阶编码失败: {e}")
-            import traceback
             traceback.print_exc()
 
     def add_third_category(self):
@@ -1697,17 +1857,14 @@ class ManualCodingDialog(QDialog):
                     QMessageBox.warning(dialog, "验证错误", error_msg)
                     return
 
-                # 生成三阶编码ID
-                code_id = self.generate_third_code_id()
+                # 生成三阶编码ID，同一次遍历收集已有三阶名称用于查重
+                code_id, third_names = self._scan_top_level_thirds()
                 numbered_name = f"{code_id} {clean_name}"
 
                 # 检查是否已存在（检查带编号的完整名称）
-                for i in range(self.coding_tree.topLevelItemCount()):
-                    top_item = self.coding_tree.topLevelItem(i)
-                    item_data = top_item.data(0, Qt.UserRole)
-                    if item_data and item_data.get("level") == 3 and top_item.text(0) == numbered_name:
-                        QMessageBox.warning(dialog, "警告", "该三阶编码已存在")
-                        return
+                if numbered_name in third_names:
+                    QMessageBox.warning(dialog, "警告", "该三阶编码已存在")
+                    return
 
                 # 创建三阶节点
                 third_item = QTreeWidgetItem(self.coding_tree)
@@ -1719,7 +1876,7 @@ class ManualCodingDialog(QDialog):
                 third_item.setText(5, code_id)  # 关联编号
                 third_item.setData(0, Qt.UserRole, {"level": 3, "name": clean_name, "code_id": code_id})
 
-                self.update_structured_codes_from_tree()
+                self._apply_add_third(third_item)
                 logger.info(f"添加三阶编码: {clean_name}")
                 QMessageBox.information(self, "成功", f"已添加三阶编码: {clean_name}")
                 dialog.accept()
@@ -1730,7 +1887,6 @@ class ManualCodingDialog(QDialog):
             dialog.exec_()
         except Exception as e:
             logger.error(f"添加三阶编码失败: {e}")
-            import traceback
             traceback.print_exc()
             QMessageBox.critical(self, "错误", f"添加三阶编码失败:\n{str(e)}")
 
@@ -1815,7 +1971,7 @@ class ManualCodingDialog(QDialog):
                 current_item.setExpanded(True)
                 current_item.setText(2, str(current_item.childCount()))
 
-                self.update_structured_codes_from_tree()
+                self._apply_add_second(current_item, second_item)
                 logger.info(f"在三阶'{third_name}'下添加二阶编码: {clean_name}")
                 QMessageBox.information(self, "成功", f"已添加二阶编码: {clean_name}")
                 dialog.accept()
@@ -1827,7 +1983,6 @@ class ManualCodingDialog(QDialog):
 
         except Exception as e:
             logger.error(f"添加二阶编码失败: {e}")
-            import traceback
             traceback.print_exc()
             QMessageBox.critical(self, "错误", f"添加失败:\n{str(e)}")
 
@@ -2000,14 +2155,13 @@ class ManualCodingDialog(QDialog):
             self.update_statistics_for_item(current_item)
 
             self.first_content_edit.clear()
-            self.update_structured_codes_from_tree()
+            self._apply_add_first(current_item, first_item)
 
             logger.info(f"在二阶'{second_name}'下添加一阶编码: {clean_content}")
             QMessageBox.information(self, "成功", f"已添加一阶编码: {clean_content}")
 
         except Exception as e:
             logger.error(f"添加一阶编码失败: {e}")
-            import traceback
             traceback.print_exc()
             QMessageBox.critical(self, "错误", f"添加失败:\n{str(e)}")
 
@@ -2144,44 +2298,50 @@ class ManualCodingDialog(QDialog):
                     "code_id": code_id
                 })
 
-                # 移动一阶编码到二阶下
-                for item in first_level_items:
-                    # 从原位置移除
-                    parent = item.parent()
-                    if parent:
-                        parent.removeChild(item)
-                    else:
-                        index = self.coding_tree.indexOfTopLevelItem(item)
-                        self.coding_tree.takeTopLevelItem(index)
-
-                    # 添加到新的二阶下
-                    second_item.addChild(item)
-
-                    # 更新一阶的数据
-                    item_data = item.data(0, Qt.UserRole)
-                    item_data["classified"] = True
-                    item_data["category"] = clean_name
-
-                    # 如果三阶父节点存在，更新核心类别
-                    grandparent = second_item.parent()
-                    if grandparent and grandparent.data(0, Qt.UserRole) and grandparent.data(0, Qt.UserRole).get(
-                            "level") == 3:
-                        grandparent_text = grandparent.text(0)
-                        import re
-                        parts = grandparent_text.split(' ', 1)
-                        if len(parts) > 1:
-                            item_data["core_category"] = parts[1]
+                # 批量移动期间暂停重绘与信号，结束后一次性刷新
+                self.coding_tree.setUpdatesEnabled(False)
+                self.coding_tree.blockSignals(True)
+                try:
+                    # 移动一阶编码到二阶下
+                    for item in first_level_items:
+                        # 从原位置移除
+                        old_parent = item.parent()
+                        if old_parent:
+                            old_parent.removeChild(item)
                         else:
-                            item_data["core_category"] = grandparent_text
+                            self.coding_tree.takeTopLevelItem(self.coding_tree.indexOfTopLevelItem(item))
+
+                        # 添加到新的二阶下
+                        second_item.addChild(item)
+
+                        # 更新一阶的数据
+                        item_data = item.data(0, Qt.UserRole)
+                        item_data["classified"] = True
+                        item_data["category"] = clean_name
+
+                        # 如果三阶父节点存在，更新核心类别
+                        grandparent = second_item.parent()
+                        if grandparent and grandparent.data(0, Qt.UserRole) and grandparent.data(0, Qt.UserRole).get(
+                                "level") == 3:
+                            grandparent_text = grandparent.text(0)
+                            parts = grandparent_text.split(' ', 1)
+                            if len(parts) > 1:
+                                item_data["core_category"] = parts[1]
+                            else:
+                                item_data["core_category"] = grandparent_text
 
-                    item.setData(0, Qt.UserRole, item_data)
+                        item.setData(0, Qt.UserRole, item_data)
 
-                # 更新统计信息（包括句子来源数）
-                self.update_statistics_for_item(second_item)
+                    # 更新统计信息（包括句子来源数）
+                    self.update_statistics_for_item(second_item)
 
-                second_item.setExpanded(True)
+                    second_item.setExpanded(True)
+                finally:
+                    self.coding_tree.blockSignals(False)
+                    self.coding_tree.setUpdatesEnabled(True)
+                    self.coding_tree.viewport().update()
 
-                self.update_structured_codes_from_tree()
+                self._mark_codes_dirty()
                 logger.info(f"为 {len(first_level_items)} 个一阶编码添加了父节点二阶编码: {clean_name}")
                 QMessageBox.information(self, "成功", f"已为 {len(first_level_items)} 个一阶编码添加二阶编码: {clean_name}")
                 dialog.accept()
@@ -2193,7 +2353,6 @@ class ManualCodingDialog(QDialog):
 
         except Exception as e:
             logger.error(f"添加父节点二阶编码失败: {e}")
-            import traceback
             traceback.print_exc()
             QMessageBox.critical(self, "错误", f"添加失败:\n{str(e)}")
 
@@ -2276,53 +2435,60 @@ class ManualCodingDialog(QDialog):
                     "code_id": code_id  # 添加编号ID
                 })
 
-                # 移动二阶编码到三阶下
-                for item in second_level_items:
-                    # 从原位置移除
-                    parent = item.parent()
-                    if parent:
-                        parent.removeChild(item)
-                    else:
-                        index = self.coding_tree.indexOfTopLevelItem(item)
-                        self.coding_tree.takeTopLevelItem(index)
+                # 批量移动期间暂停重绘与信号，结束后一次性刷新
+                self.coding_tree.setUpdatesEnabled(False)
+                self.coding_tree.blockSignals(True)
+                try:
+                    # 移动二阶编码到三阶下
+                    for item in second_level_items:
+                        # 从原位置移除
+                        old_parent = item.parent()
+                        if old_parent:
+                            old_parent.removeChild(item)
+                        else:
+                            self.coding_tree.takeTopLevelItem(self.coding_tree.indexOfTopLevelItem(item))
 
-                    # 添加到新的三阶下
-                    third_item.addChild(item)
+                        # 添加到新的三阶下
+                        third_item.addChild(item)
 
-                    # 更新二阶的数据
-                    item_data = item.data(0, Qt.UserRole)
-                    item_data["parent"] = clean_name
-                    item.setData(0, Qt.UserRole, item_data)
+                        # 更新二阶的数据
+                        item_data = item.data(0, Qt.UserRole)
+                        item_data["parent"] = clean_name
+                        item.setData(0, Qt.UserRole, item_data)
 
-                    # 更新所有一阶子节点的core_category
-                    for i in range(item.childCount()):
-                        first_item = item.child(i)
-                        first_data = first_item.data(0, Qt.UserRole)
-                        first_data["core_category"] = clean_name
-                        first_item.setData(0, Qt.UserRole, first_data)
+                        # 更新所有一阶子节点的core_category
+                        for child_index in range(item.childCount()):
+                            first_item = item.child(child_index)
+                            first_data = first_item.data(0, Qt.UserRole)
+                            first_data["core_category"] = clean_name
+                            first_item.setData(0, Qt.UserRole, first_data)
 
-                # 为新添加的二阶编码重新编号，确保每个三阶编码下的二阶编码都从 B01 开始递增
-                for i, item in enumerate(second_level_items):
-                    # 生成新的二阶编码ID
-                    new_code_id = f"B{i + 1:02d}"
+                    # 为新添加的二阶编码重新编号，确保每个三阶编码下的二阶编码都从 B01 开始递增
+                    for position, item in enumerate(second_level_items):
+                        # 生成新的二阶编码ID
+                        new_code_id = f"B{position + 1:02d}"
 
-                    # 更新二阶编码的显示名称
-                    item_data = item.data(0, Qt.UserRole)
-                    clean_name = item_data.get("name", "")
-                    new_numbered_name = f"{new_code_id} {clean_name}"
-                    item.setText(0, new_numbered_name)
-                    item.setText(5, new_code_id)  # 更新关联编号
+                        # 更新二阶编码的显示名称（不能复用 clean_name：其后的提示要显示新三阶名称）
+                        item_data = item.data(0, Qt.UserRole)
+                        second_name = item_data.get("name", "")
+                        new_numbered_name = f"{new_code_id} {second_name}"
+                        item.setText(0, new_numbered_name)
+                        item.setText(5, new_code_id)  # 更新关联编号
 
-                    # 更新二阶编码的数据
-                    item_data["code_id"] = new_code_id
-                    item.setData(0, Qt.UserRole, item_data)
+                        # 更新二阶编码的数据
+                        item_data["code_id"] = new_code_id
+                        item.setData(0, Qt.UserRole, item_data)
 
-                # 更新统计信息
-                self.update_statistics_for_item(third_item)
+                    # 更新统计信息
+                    self.update_statistics_for_item(third_item)
 
-                third_item.setExpanded(True)
+                    third_item.setExpanded(True)
+                finally:
+                    self.coding_tree.blockSignals(False)
+                    self.coding_tree.setUpdatesEnabled(True)
+                    self.coding_tree.viewport().update()
 
-                self.update_structured_codes_from_tree()
+                self._mark_codes_dirty()
                 logger.info(f"为 {len(second_level_items)} 个二阶编码添加了父节点三阶编码: {clean_name}")
                 QMessageBox.information(self, "成功", f"已为 {len(second_level_items)} 个二阶编码添加三阶编码: {clean_name}")
                 dialog.accept()
@@ -2334,7 +2500,6 @@ class ManualCodingDialog(QDialog):
 
         except Exception as e:
             logger.error(f"添加父节点三阶编码失败: {e}")
-            import traceback
             traceback.print_exc()
             QMessageBox.critical(self, "错误", f"添加失败:\n{str(e)}")
 
@@ -2439,7 +2604,7 @@ class ManualCodingDialog(QDialog):
 
                 self.update_statistics_for_item(fourth_item)
                 fourth_item.setExpanded(True)
-                self.update_structured_codes_from_tree()
+                self._mark_codes_dirty()
                 logger.info(f"为 {len(third_level_items)} 个三阶编码添加了父节点四阶编码: {clean_name}")
                 QMessageBox.information(self, "成功", f"已为 {len(third_level_items)} 个三阶编码添加四阶编码: {clean_name}")
                 dialog.accept()
@@ -2450,7 +2615,6 @@ class ManualCodingDialog(QDialog):
 
         except Exception as e:
             logger.error(f"添加父节点四阶编码失败: {e}")
-            import traceback
             traceback.print_exc()
             QMessageBox.critical(self, "错误", f"添加失败:\n{str(e)}")
 
@@ -2543,7 +2707,7 @@ class ManualCodingDialog(QDialog):
 
                 self.update_statistics_for_item(fifth_item)
                 fifth_item.setExpanded(True)
-                self.update_structured_codes_from_tree()
+                self._mark_codes_dirty()
                 logger.info(f"为 {len(fourth_level_items)} 个四阶编码添加了父节点五阶编码: {clean_name}")
                 QMessageBox.information(self, "成功", f"已为 {len(fourth_level_items)} 个四阶编码添加五阶编码: {clean_name}")
                 dialog.accept()
@@ -2554,7 +2718,6 @@ class ManualCodingDialog(QDialog):
 
         except Exception as e:
             logger.error(f"添加父节点五阶编码失败: {e}")
-            import traceback
             traceback.print_exc()
             QMessageBox.critical(self, "错误", f"添加失败:\n{str(e)}")
 
@@ -2647,7 +2810,7 @@ class ManualCodingDialog(QDialog):
 
                 self.update_statistics_for_item(sixth_item)
                 sixth_item.setExpanded(True)
-                self.update_structured_codes_from_tree()
+                self._mark_codes_dirty()
                 logger.info(f"为 {len(fifth_level_items)} 个五阶编码添加了父节点六阶编码: {clean_name}")
                 QMessageBox.information(self, "成功", f"已为 {len(fifth_level_items)} 个五阶编码添加六阶编码: {clean_name}")
                 dialog.accept()
@@ -2658,7 +2821,6 @@ class ManualCodingDialog(QDialog):
 
         except Exception as e:
             logger.error(f"添加父节点六阶编码失败: {e}")
-            import traceback
             traceback.print_exc()
             QMessageBox.critical(self, "错误", f"添加失败:\n{str(e)}")
 
@@ -2743,7 +2905,6 @@ class ManualCodingDialog(QDialog):
                     font.setBold(True)
                     t_item.setFont(0, font)
                     parent_node = t_item
-                    t_item.setExpanded(True)
 
                 for sec in second_list:
                     if sec is old_parent:
@@ -2752,6 +2913,7 @@ class ManualCodingDialog(QDialog):
                     s_item.setText(0, "    " + sec.text(0))
                     item_to_second_map[id(s_item)] = sec
 
+            # 填充完成后一次性展开，不逐个节点 setExpanded
             tree.expandAll()
             layout.addWidget(tree)
 
@@ -2821,7 +2983,6 @@ class ManualCodingDialog(QDialog):
 
         except Exception as e:
             logger.error(f"修改一阶对应父节点失败: {e}")
-            import traceback
             traceback.print_exc()
             QMessageBox.critical(self, "错误", f"操作失败:\n{str(e)}")
 
@@ -2952,7 +3113,6 @@ class ManualCodingDialog(QDialog):
 
         except Exception as e:
             logger.error(f"修改二阶对应父节点失败: {e}")
-            import traceback
             traceback.print_exc()
             QMessageBox.critical(self, "错误", f"操作失败:\n{str(e)}")
 
@@ -3048,7 +3208,6 @@ class ManualCodingDialog(QDialog):
 
         except Exception as e:
             logger.error(f"renumber_all_codes 失败: {e}")
-            import traceback
             traceback.print_exc()
 
     def update_first_codes_display(self):
@@ -3056,18 +3215,48 @@ class ManualCodingDialog(QDialog):
         self.update_coding_tree()
 
     def is_content_exists(self, content):
-        """检查内容是否已存在"""
-        # 检查未分类列表
-        if content in self.unclassified_first_codes:
-            return True
-
-        # 检查已分类编码
-        for third_cat, second_cats in self.current_codes.items():
-            for second_cat, first_codes in second_cats.items():
-                if content in first_codes:
-                    return True
-
-        return False
+        """检查内容是否已存在（查索引，编码数据变化后首次查询时重建一次）"""
+        if self._first_content_set is None:
+            self._first_content_set = self._build_first_content_set()
+        return content in self._first_content_set
+
+    def _build_first_content_set(self) -> set:
+        """收集未分类列表与已分类编码中的字符串条目（字典条目不会与内容字符串相等）"""
+        contents = {code for code in self.unclassified_first_codes if isinstance(code, str)}
+        for second_cats in self.current_codes.values():
+            for first_codes in second_cats.values():
+                contents.update(code for code in first_codes if isinstance(code, str))
+        return contents
+
+    def _invalidate_first_content_set(self):
+        """current_codes / 未分类列表被替换或修改后调用，下次查询时重建索引"""
+        self._first_content_set = None
+
+    def _invalidate_code_id_node_index(self, *args):
+        """编码树模型变化时调用，下次按编码ID查询时重建索引"""
+        self._code_id_node_index = None
+        # 编码内容或句子详情可能已变，按编码记录的高亮位置一并失效
+        self._precise_highlight_cache.clear()
+
+    def _on_document_contents_changed(self):
+        """文档内容变化：推进文档版本号，使按旧内容记录的缓存失效"""
+        self._document_generation += 1
+
+    def _build_code_id_node_index(self) -> dict:
+        """迭代先序遍历（显式栈）顶层节点以下的各节点，按先序记录每个编码ID匹配的一阶节点数据"""
+        index = {}
+        tree = self.coding_tree
+        stack = []
+        for i in range(tree.topLevelItemCount() - 1, -1, -1):
+            top_item = tree.topLevelItem(i)
+            stack.extend(top_item.child(k) for k in range(top_item.childCount() - 1, -1, -1))
+        while stack:
+            node = stack.pop()
+            stack.extend(node.child(k) for k in range(node.childCount() - 1, -1, -1))
+            node_data = node.data(0, Qt.UserRole)
+            if node_data and node_data.get("level") == 1 and node_data.get("code_id"):
+                index.setdefault(node_data["code_id"], []).append(node_data)
+        return index
 
     def on_tree_item_double_clicked(self, item, column):
         """树节点双击事件 - 双击一阶编码时弹出句子详情对话框"""
@@ -3316,21 +3505,17 @@ class ManualCodingDialog(QDialog):
                 try:
                     # 查找所有该编号的出现位置
                     pattern = r'\[' + re.escape(sentence_number) + r'\]'
-                    matches = list(re.finditer(pattern, current_text))
+                    # 为了容错，搜索范围设为内容长度 + 200字符
+                    search_range = len(sentence_content) + 200
 
-                    for match in matches:
+                    for match in re.finditer(pattern, current_text):
                         num_start = match.start()
-                        # 在编号前搜索内容
-                        # 为了容错，搜索范围设为内容长度 + 200字符
-                        search_range = len(sentence_content) + 200
+                        # 在编号前的窗口内搜索内容（直接按区间查找，不切片复制）
                         search_start = max(0, num_start - search_range)
-                        text_before = current_text[search_start:num_start]
-
-                        # 检查内容是否在编号前的文本中
-                        idx = text_before.rfind(sentence_content)
+                        idx = current_text.rfind(sentence_content, search_start, num_start)
                         if idx != -1:
                             # 找到了！
-                            found_pos = search_start + idx
+                            found_pos = idx
                             found_length = len(sentence_content)
                             logger.info(f"策略1成功: 找到特定编号 [{sentence_number}] 前的内容")
                             break
@@ -3433,7 +3618,6 @@ class ManualCodingDialog(QDialog):
 
         except Exception as e:
             logger.error(f"导航过程发生严重错误: {e}")
-            import traceback
             traceback.print_exc()
 
     def _highlight_and_scroll_to_position(self, start_pos, length):
@@ -3493,7 +3677,6 @@ class ManualCodingDialog(QDialog):
 
         except Exception as e:
             logger.error(f"高亮和滚动到位置时出错: {e}")
-            import traceback
             traceback.print_exc()
             # 不要抛出异常，避免闪退
             # 不要抛出异常，避免闪退
@@ -3620,83 +3803,48 @@ class ManualCodingDialog(QDialog):
         try:
             sentences = []
 
-            # 遍历编码树查找匹配的编码ID
-            def search_tree_for_sentences(item):
-                for i in range(item.childCount()):
-                    child = item.child(i)
-                    child_data = child.data(0, Qt.UserRole)
-
-                    if child_data:
-                        if child_data.get("level") == 1:  # 一阶编码
-                            if child_data.get("code_id") == code_id:
-                                # 找到匹配的编码，返回其句子详情
-                                sentence_details = child_data.get("sentence_details", [])
-                                if sentence_details:
-                                    # 确保每个sentence_details都有必要的字段
-                                    for detail in sentence_details:
-                                        if isinstance(detail, dict):
-                                            # 确保detail有original_content字段
-                                            if 'original_content' not in detail:
-                                                # 尝试从其他字段获取原始内容
-                                                detail['original_content'] = detail.get('content', '') or detail.get(
-                                                    'text', '')
-                                            # 确保detail有text字段
-                                            if 'text' not in detail:
-                                                # 尝试从其他字段获取文本
-                                                detail['text'] = detail.get('content', '') or detail.get(
-                                                    'original_content', '')
-                                            # 确保detail有code_id字段
-                                            if 'code_id' not in detail:
-                                                detail['code_id'] = code_id
-                                            # 确保detail有sentence_id字段
-                                            if 'sentence_id' not in detail:
-                                                # 尝试从text中提取编号
-                                                import re
-                                                number_match = re.search(r'\[(\d+)\]', detail.get('text', ''))
-                                                if number_match:
-                                                    detail['sentence_id'] = number_match.group(1)
-                                        sentences.append(detail)
-                                else:
-                                    # 如果没有sentence_details，使用内容创建基本结构
-                                    content = child_data.get("content", "")
-                                    if content:
-                                        # 从内容中提取可能的句子编号
-                                        import re
-                                        sentence_numbers = re.findall(r'\[(\d+)\]', content)
-                                        if sentence_numbers:
-                                            # 创建包含编号的句子详情
-                                            sentences.append(
-                                                {"text": content, "original_content": content, "code_id": code_id,
-                                                 "sentence_id": sentence_numbers[0]})
-                                        else:
-                                            sentences.append(
-                                                {"text": content, "original_content": content, "code_id": code_id})
-
-                    # 递归搜索子节点
-                    search_tree_for_sentences(child)
-
-            # 遍历顶层项目
-            for i in range(self.coding_tree.topLevelItemCount()):
-                top_item = self.coding_tree.topLevelItem(i)
-                search_tree_for_sentences(top_item)
-
-            # 如果仍然没有找到，尝试从编码树的所有一阶编码中查找
-            if not sentences:
-                def find_all_first_level_codes(item):
-                    for i in range(item.childCount()):
-                        child = item.child(i)
-                        child_data = child.data(0, Qt.UserRole)
-                        if child_data and child_data.get("level") == 1:
-                            if child_data.get("code_id") == code_id:
-                                content = child_data.get("content", "")
-                                if content:
-                                    sentences.append({"text": content, "original_content": content, "code_id": code_id})
-                        # 递归搜索子节点
-                        find_all_first_level_codes(child)
-
-                for i in range(self.coding_tree.topLevelItemCount()):
-                    top_item = self.coding_tree.topLevelItem(i)
-                    find_all_first_level_codes(top_item)
+            # 编码ID -> 一阶节点数据 索引：编码树未变化时重复点击直接查表
+            if self._code_id_node_index is None:
+                self._code_id_node_index = self._build_code_id_node_index()
+            for node_data in self._code_id_node_index.get(code_id, ()):
+                if sentences:
+                    break
+                # 找到匹配的编码，返回其句子详情
+                sentence_details = node_data.get("sentence_details", [])
+                if sentence_details:
+                    # 确保每个sentence_details都有必要的字段
+                    for detail in sentence_details:
+                        if isinstance(detail, dict):
+                            # 确保detail有original_content字段
+                            if 'original_content' not in detail:
+                                # 尝试从其他字段获取原始内容
+                                detail['original_content'] = detail.get('content', '') or detail.get('text', '')
+                            # 确保detail有text字段
+                            if 'text' not in detail:
+                                # 尝试从其他字段获取文本
+                                detail['text'] = detail.get('content', '') or detail.get('original_content', '')
+                            # 确保detail有code_id字段
+                            if 'code_id' not in detail:
+                                detail['code_id'] = code_id
+                            # 确保detail有sentence_id字段
+                            if 'sentence_id' not in detail:
+                                # 尝试从text中提取编号
+                                number_match = re.search(r'\[(\d+)\]', detail.get('text', ''))
+                                if number_match:
+                                    detail['sentence_id'] = number_match.group(1)
+                        sentences.append(detail)
+                else:
+                    # 如果没有sentence_details，使用内容创建基本结构
+                    content = node_data.get("content", "")
+                    if content:
+                        # 从内容中提取可能的句子编号
+                        number_match = re.search(r'\[(\d+)\]', content)
+                        if number_match:
+                            # 创建包含编号的句子详情
+                            sentences.append({"text": content, "original_content": content, "code_id": code_id,
+                                              "sentence_id": number_match.group(1)})
+                        else:
+                            sentences.append({"text": content, "original_content": content, "code_id": code_id})
 
             # 去重处理，避免重复的句子
             seen_texts = set()
@@ -3714,6 +3862,17 @@ class ManualCodingDialog(QDialog):
             logger.error(f"获取句子详情失败: {e}")
             return []
 
+    def _get_sentence_file_index(self):
+        """句子编号 -> 首个包含 [编号] 标记的已加载文件；每次加载文件后只扫描一遍"""
+        if self._sentence_file_index is None:
+            index = {}
+            for file_path, file_data in self.loaded_files.items():
+                file_text = file_data.get('numbered_content', '') or file_data.get('content', '')
+                for sentence_id in _RE_SENTENCE_TAG.findall(file_text):
+                    index.setdefault(sentence_id, file_path)
+            self._sentence_file_index = index
+        return self._sentence_file_index
+
     def highlight_text_by_code_id_precise(self, code_id: str):
         """通过编码ID精确高亮文本和对应内容（基于sentence_details）"""
         try:
@@ -3721,10 +3880,12 @@ class ManualCodingDialog(QDialog):
                 return False
 
             # 限制处理时间，避免长时间阻塞
-            import time
             start_time = time.time()
             max_execution_time = 2.0  # 2秒超时
 
+            # 清除旧高亮、切换文件到应用新选区期间暂停文本框重绘，结束时只刷新一次视口
+            self.text_display.setUpdatesEnabled(False)
+
             # 清除之前的高亮
             self.clear_text_highlights()
 
@@ -3738,7 +3899,6 @@ class ManualCodingDialog(QDialog):
             # 获取一阶编码的精确内容
             code_content = self.get_content_by_code_id(code_id)
             code_clean = ""
-            import re
             if code_content:
                 # 清理编码内容，移除可能存在的标记，例如 [A1], A1等
                 code_clean = re.sub(r'\s*\[[A-Z]\d+\]', '', code_content)
@@ -3751,7 +3911,6 @@ class ManualCodingDialog(QDialog):
             target_file = None
             best_match_score = 0
             best_match_file = None
-            best_match_sentence = None
             target_sentence_id = None  # 记录关联的句子ID
 
             # 策略0：优先检查sentence_details中是否直接包含file_path或filename
@@ -3799,29 +3958,31 @@ class ManualCodingDialog(QDialog):
                             target_file = file_path
                             break
 
-            # 如果没找到，尝试通过句子ID匹配文件
+            # 如果没找到，尝试通过句子ID匹配文件（查索引，不再逐个文件搜索编号标记）
             if not target_file and target_sentence_id:
-                sentence_tag = f"[{target_sentence_id}]"
-                for file_path, file_data in self.loaded_files.items():
-                    file_text = file_data.get('numbered_content', '') or file_data.get('content', '')
-                    if sentence_tag in file_text:
-                        target_file = file_path
-                        break
+                target_file = self._get_sentence_file_index().get(str(target_sentence_id))
 
             # 如果没有找到，使用句子内容进行匹配
             if not target_file:
+                sentence_file_index = self._get_sentence_file_index()
                 for sentence_info in sentences_to_highlight:
                     if time.time() - start_time > max_execution_time:
                         logger.warning("句子匹配超时")
                         return False
 
+                    # 带编号的句子直接查索引确定文件
+                    indexed_file = sentence_file_index.get(str(sentence_info.get('sentence_id', '')))
+                    if indexed_file:
+                        best_match_score = 100
+                        best_match_file = indexed_file
+                        break
+
                     # 优先使用原始内容，而不是抽象后的内容
                     sentence_content = sentence_info.get('text', '').strip()
                     if not sentence_content:
                         continue
 
                     # 清理句子内容
-                    import re
                     sentence_clean = re.sub(r'\s*\[[A-Z]\d+\]', '', sentence_content)
                     sentence_clean = re.sub(r'^[A-Z]\d+\s+', '', sentence_clean)
                     sentence_clean = re.sub(r'\s*\[\d+\]', '', sentence_clean).strip()
@@ -3856,7 +4017,10 @@ class ManualCodingDialog(QDialog):
                         if score > best_match_score:
                             best_match_score = score
                             best_match_file = file_path
-                            best_match_sentence = sentence_info
+
+                    # 已完全匹配，后续句子与文件不可能更优
+                    if best_match_score >= 100:
+                        break
 
                 # 使用最佳匹配的文件
                 if best_match_file and best_match_score > 30:  # 最低匹配分数阈值
@@ -3879,48 +4043,25 @@ class ManualCodingDialog(QDialog):
                             QApplication.processEvents()
                             break
 
-            # 获取当前显示的文本
-            current_text = self.text_display.toPlainText()
-            if not current_text:
+            # 文本框为空时无可高亮内容（isEmpty 不必导出整篇文本）
+            if self.text_document.isEmpty():
                 return False
 
-            # 移动光标到文本开始
-            cursor = self.text_display.textCursor()
-            cursor.movePosition(cursor.Start)
-            self.text_display.setTextCursor(cursor)
+            # 文档与编码树均未变化时，直接复用该编码上次找到的选区
+            cached = self._precise_highlight_cache.get(code_id)
+            cached_selections = cached[1] if cached and cached[0] == self._document_generation else None
 
             # 精确高亮一阶编码对应的短语
             found_count = 0
-            first_match_position = None  # 记录第一个匹配项的位置
             extra_selections = []  # 用于存储临时高亮的选择
+            if cached_selections is not None:
+                extra_selections = list(cached_selections)
+                found_count = len(extra_selections)
 
             # 优先高亮一阶编码的精确内容
-            if code_clean:
-                search_cursor = self.text_display.textCursor()
-                search_cursor.movePosition(cursor.Start)
-
-                # 策略1：直接查找编码内容
-                found_cursor = self.text_document.find(code_clean, search_cursor)
-
-                # 策略2：如果策略1失败，尝试使用正则表达式查找（忽略空白差异）
-                if found_cursor.isNull():
-                    # 限制正则表达式长度，避免性能问题
-                    if len(code_clean) > 100:
-                        code_clean = code_clean[:100]
-                    # 转换为正则模式，将多个空白符视为一个
-                    pattern = re.sub(r'\s+', r'\\s+', re.escape(code_clean))
-                    regex = QRegularExpression(pattern)
-                    found_cursor = self.text_document.find(regex, search_cursor)
-
-                # 策略3：如果还失败，尝试查找关键词
-                if found_cursor.isNull():
-                    # 提取关键词
-                    words = [word for word in code_clean.split() if len(word) > 2]
-                    if words and len(words) <= 5:
-                        # 尝试查找前几个关键词
-                        keyword_pattern = r'\b' + r'\b.*\b'.join(words[:3]) + r'\b'
-                        regex = QRegularExpression(keyword_pattern, QRegularExpression.CaseInsensitiveOption)
-                        found_cursor = self.text_document.find(regex, search_cursor)
+            if code_clean and cached_selections is None:
+                # 一次查找：忽略空白差异的预编译正则（限制长度，避免性能问题）
+                found_cursor = self.text_document.find(_whitespace_tolerant_regex(code_clean[:200]), 0)
 
                 if not found_cursor.isNull():
                     # 使用 ExtraSelection 进行临时高亮
@@ -3932,41 +4073,33 @@ class ManualCodingDialog(QDialog):
 
                     found_count += 1
 
-                    # 记录第一个匹配项的位置用于滚动
-                    if first_match_position is None:
-                        first_match_position = found_cursor.selectionStart()
-                        logger.info(f"记录第一个匹配位置: {first_match_position}")
-
             # 如果没有找到编码内容，尝试高亮句子内容
-            if found_count == 0:
+            if found_count == 0 and cached_selections is None:
                 # 尝试使用句子ID精确定位（针对自动编码产生的数字ID）
                 # 这是最可靠的定位方式，特别是对于纯文本内容匹配失败的情况
                 if sentences_to_highlight:
                     for sentence_info in sentences_to_highlight:
                         sentence_id = sentence_info.get('id', '')
                         if sentence_id:
-                            # 构造精确的ID查找正则表达式 [ID]
+                            # 构造精确的ID查找正则表达式 [ID]，直接在文档中查找（位置即文档位置）
                             id_pattern = r'\[' + re.escape(str(sentence_id)) + r'\]'
-                            id_regex = QRegularExpression(id_pattern)
-                            id_match = id_regex.match(current_text)
+                            id_cursor = self.text_document.find(QRegularExpression(id_pattern))
 
-                            if id_match.hasMatch():
+                            if not id_cursor.isNull():
                                 # 找到ID位置
-                                match_start = id_match.capturedStart()
-                                match_end = id_match.capturedEnd()
+                                match_end = id_cursor.selectionEnd()
 
                                 # 将光标移动到ID之后
-                                cursor = self.text_display.textCursor()
+                                cursor = QTextCursor(self.text_document)
                                 cursor.setPosition(match_end)
 
                                 # 尝试查找该句子的结束位置（下一个 [ID] 或段落结束）
                                 next_id_pattern = r'\[\w+\d+\]|\[\d+\]'  # 匹配下一个ID标记
-                                next_regex = QRegularExpression(next_id_pattern)
-                                next_match = next_regex.match(current_text, match_end)
+                                next_cursor = self.text_document.find(QRegularExpression(next_id_pattern), match_end)
 
                                 end_pos = -1
-                                if next_match.hasMatch():
-                                    end_pos = next_match.capturedStart()
+                                if not next_cursor.isNull():
+                                    end_pos = next_cursor.selectionStart()
                                 else:
                                     # 如果没有下一个ID，则高亮到段落结束或一定长度
                                     block = cursor.block()
@@ -3983,86 +4116,56 @@ class ManualCodingDialog(QDialog):
                                     extra_selections.append(selection)
 
                                     found_count += 1
-                                    if first_match_position is None:
-                                        first_match_position = match_start
 
                                     # 如果找到了，就跳出循环，避免重复处理
                                     break
 
-                # 如果ID定位也失败，继续尝试原来的内容匹配逻辑
-                if found_count == 0:
-                    # 限制处理的句子数量
-                    max_sentences = 3
-                processed_sentences = 0
-
-                for sentence_info in sentences_to_highlight:
-                    if processed_sentences >= max_sentences:
-                        break
-
-                    if time.time() - start_time > max_execution_time:
-                        logger.warning("句子高亮超时")
-                        break
+                # 如果ID定位也失败，继续尝试原来的内容匹配逻辑（限制处理的句子数量）
+                max_sentences = 3 if found_count == 0 else 0
 
+                # 查找前先清理并去重句子内容：清理后相同（仅空白不同）的句子只查找一次
+                search_items = []
+                seen_texts = set()
+                for sentence_info in (sentences_to_highlight if max_sentences else ()):
                     # 优先使用原始内容，而不是抽象后的内容
                     sentence_content = sentence_info.get('original_content', '') or sentence_info.get('text',
                                                                                                       '').strip()
                     if not sentence_content:
                         continue
 
-                    # 清理句子内容：移除可能存在的编号标记
+                    # 清理句子内容：移除可能存在的编号标记；限制搜索长度
                     sentence_clean = re.sub(r'\s*\[[A-Z]\d+\]', '', sentence_content)
                     sentence_clean = re.sub(r'^[A-Z]\d+\s+', '', sentence_clean)
                     sentence_clean = re.sub(r'\s*\[\d+\]', '', sentence_clean).strip()
+                    search_text = ' '.join(sentence_clean[:200].split())
+                    if search_text and search_text not in seen_texts:
+                        seen_texts.add(search_text)
+                        search_items.append(search_text)
+
+                if search_items:
+                    # 所有句子合并为一个正则（每个句子一个分组），在当前文档上单次扫描；
+                    # 目标文件已在上面切换好，每个句子只取首次出现
+                    combined_regex = QRegularExpression(
+                        '|'.join(f'({_whitespace_tolerant_pattern(text)})' for text in search_items),
+                        QRegularExpression.CaseInsensitiveOption)
+                    # QRegularExpression 的位置按 UTF-16 计数，与文档位置一致
+                    match_iterator = combined_regex.globalMatch(self.text_document.toPlainText())
+                    matched_groups = set()
+                    while match_iterator.hasNext() and len(matched_groups) < max_sentences:
+                        if time.time() - start_time > max_execution_time:
+                            logger.warning("句子高亮超时")
+                            break
 
-                    # 尝试从sentence_info中获取file_path，如果有的话
-                    file_path = sentence_info.get('file_path', '')
-                    if file_path and file_path in self.loaded_files:
-                        # 如果指定了文件路径，确保当前显示的是该文件
-                        current_items = self.file_list.selectedItems()
-                        current_file = current_items[0].data(Qt.UserRole) if current_items else None
-                        if current_file != file_path:
-                            for i in range(self.file_list.count()):
-                                item = self.file_list.item(i)
-                                if item.data(Qt.UserRole) == file_path:
-                                    self.file_list.setCurrentItem(item)
-                                    QApplication.processEvents()
-                                    current_text = self.text_display.toPlainText()
-                                    break
+                        match = match_iterator.next()
+                        group = match.lastCapturedIndex()
+                        if group in matched_groups:
+                            continue
+                        matched_groups.add(group)
 
-                    # 在文本中查找并高亮这个精确句子
-                    search_cursor = self.text_display.textCursor()
-                    search_cursor.movePosition(cursor.Start)
-
-                    # 策略1：直接查找清理后的文本
-                    if len(sentence_clean) > 200:
-                        sentence_clean = sentence_clean[:200]  # 限制搜索长度
-                    found_cursor = self.text_document.find(sentence_clean, search_cursor)
-
-                    # 策略2：如果策略1失败，尝试查找前50个字符
-                    if found_cursor.isNull() and len(sentence_clean) > 50:
-                        found_cursor = self.text_document.find(sentence_clean[:50], search_cursor)
-
-                    # 策略3：如果还失败，尝试使用正则表达式查找（忽略空白差异）
-                    if found_cursor.isNull():
-                        # 限制正则表达式长度
-                        if len(sentence_clean) > 100:
-                            sentence_clean = sentence_clean[:100]
-                        # 转换为正则模式，将多个空白符视为一个
-                        pattern = re.sub(r'\s+', r'\\s+', re.escape(sentence_clean))
-                        regex = QRegularExpression(pattern)
-                        found_cursor = self.text_document.find(regex, search_cursor)
-
-                    # 策略4：如果还失败，尝试查找关键词
-                    if found_cursor.isNull():
-                        # 提取关键词
-                        words = [word for word in sentence_clean.split() if len(word) > 2]
-                        if words and len(words) <= 5:
-                            # 尝试查找前几个关键词
-                            keyword_pattern = r'\b' + r'\b.*\b'.join(words[:3]) + r'\b'
-                            regex = QRegularExpression(keyword_pattern, QRegularExpression.CaseInsensitiveOption)
-                            found_cursor = self.text_document.find(regex, search_cursor)
+                        found_cursor = QTextCursor(self.text_document)
+                        found_cursor.setPosition(match.capturedStart())
+                        found_cursor.setPosition(match.capturedEnd(), QTextCursor.KeepAnchor)
 
-                    if not found_cursor.isNull():
                         # 使用 ExtraSelection 进行临时高亮
                         selection = QTextEdit.ExtraSelection()
                         selection.cursor = found_cursor
@@ -4071,22 +4174,19 @@ class ManualCodingDialog(QDialog):
                         extra_selections.append(selection)
 
                         found_count += 1
-                        processed_sentences += 1
-
-                        # 记录第一个匹配项的位置用于滚动
-                        if first_match_position is None:
-                            first_match_position = found_cursor.selectionStart()
-                            logger.info(f"记录第一个匹配位置: {first_match_position}")
 
-            if found_count > 0 and first_match_position is not None:
-                # 限制高亮数量，避免内存问题
-                if len(extra_selections) > 5:
-                    extra_selections = extra_selections[:5]
+            # 限制高亮数量，避免内存问题
+            if len(extra_selections) > 5:
+                extra_selections = extra_selections[:5]
+            if cached_selections is None:
+                self._precise_highlight_cache[code_id] = (self._document_generation, extra_selections)
 
-                # 应用临时高亮
+            if extra_selections:
+                # 一次性应用全部临时高亮
                 self.text_display.setExtraSelections(extra_selections)
 
-                # 创建新的光标并定位到第一个匹配项的位置
+                # 定位到第一个匹配项的开头（不选中）
+                first_match_position = extra_selections[0].cursor.selectionStart()
                 new_cursor = self.text_display.textCursor()
                 new_cursor.setPosition(first_match_position)
 
@@ -4105,7 +4205,6 @@ class ManualCodingDialog(QDialog):
 
         except Exception as e:
             logger.error(f"精确高亮文本失败: {e}")
-            import traceback
             traceback.print_exc()
             # 发生异常时确保清除高亮
             try:
@@ -4114,41 +4213,30 @@ class ManualCodingDialog(QDialog):
                 pass
             self.statusBar().showMessage(f"高亮失败: {str(e)}") if hasattr(self, 'statusBar') else None
             return False
+        finally:
+            if not self.text_display.updatesEnabled():
+                self.text_display.setUpdatesEnabled(True)
+                self.text_display.viewport().update()
 
     def get_content_by_code_id(self, code_id: str) -> str:
         """根据编码ID获取对应的一阶编码内容"""
         try:
-            # 遍历树形结构查找匹配的编码ID
-            def search_tree_item(item):
-                for i in range(item.childCount()):
-                    child = item.child(i)
-                    child_data = child.data(0, Qt.UserRole)
-
-                    if child_data:
-                        # 检查当前节点是否匹配
-                        if child_data.get("code_id") == code_id:
-                            return child_data.get("content", "") or child_data.get("name", "")
-
-                        # 递归搜索子节点
-                        result = search_tree_item(child)
+            # 迭代先序遍历（显式栈），顶层节点本身也参与匹配（含未分类的一阶编码）
+            tree = self.coding_tree
+            stack = deque(tree.topLevelItem(i) for i in range(tree.topLevelItemCount() - 1, -1, -1))
+
+            while stack:
+                node = stack.pop()
+                node_data = node.data(0, Qt.UserRole)
+                if node_data:
+                    if node_data.get("code_id") == code_id:
+                        result = node_data.get("content", "") or node_data.get("name", "")
                         if result:
                             return result
-
-                return ""
-
-            # 遍历顶层项目
-            for i in range(self.coding_tree.topLevelItemCount()):
-                top_item = self.coding_tree.topLevelItem(i)
-                result = search_tree_item(top_item)
-                if result:
-                    return result
-
-            # 如果在层级结构中没找到，检查顶层未分类的一阶编码
-            for i in range(self.coding_tree.topLevelItemCount()):
-                top_item = self.coding_tree.topLevelItem(i)
-                top_data = top_item.data(0, Qt.UserRole)
-                if top_data and top_data.get("level") == 1 and top_data.get("code_id") == code_id:
-                    return top_data.get("content", "") or top_data.get("name", "")
+                elif node.parent() is not None:
+                    # 无数据的子节点不再向下搜索；顶层节点总是展开
+                    continue
+                stack.extend(node.child(k) for k in range(node.childCount() - 1, -1, -1))
 
             return ""
         except Exception as e:
@@ -4389,25 +4477,10 @@ class ManualCodingDialog(QDialog):
             if not content or len(content) < 2:  # 减少最小长度要求
                 return
 
-            # 获取当前显示的文本
-            current_text = self.text_display.toPlainText()
-            if not current_text:
+            # 文档为空时无需查找（不复制整篇文本，直接询问文档）
+            if self.text_document.isEmpty():
                 return
 
-            # 移动光标到文本开始
-            cursor = self.text_display.textCursor()
-            cursor.movePosition(cursor.Start)
-            self.text_display.setTextCursor(cursor)
-
-            # 清除之前的高亮
-            self.clear_text_highlights()
-
-            # 查找文本
-            found = False
-            first_match_cursor = None  # 记录第一个匹配项的光标位置
-            search_cursor = self.text_display.textCursor()
-            search_cursor.movePosition(cursor.Start)
-
             # 清理内容，移除可能存在的标记
             clean_content = re.sub(r'\s*\[[A-Z]\d+\]', '', content).strip()
 
@@ -4415,68 +4488,42 @@ class ManualCodingDialog(QDialog):
             if not clean_content:
                 return
 
-            # 使用while循环查找所有匹配项，但添加安全计数器防止无限循环
-            search_count = 0
+            # 先收集全部匹配项（最多 max_searches 个），再一次性应用
             max_searches = 100  # 设置最大搜索次数防止无限循环
-
             extra_selections = []
-
-            while search_count < max_searches:
+            search_cursor = QTextCursor(self.text_document)
+            while len(extra_selections) < max_searches:
                 search_cursor = self.text_document.find(clean_content, search_cursor, QTextDocument.FindCaseSensitively)
                 if search_cursor.isNull():
                     break
 
-                # 设置高亮格式
+                # 设置高亮格式：浅蓝色背景、深蓝色文字
                 selection = QTextEdit.ExtraSelection()
                 selection.cursor = search_cursor
-                selection.format.setBackground(QColor(173, 216, 230))  # 浅蓝色背景
-                selection.format.setForeground(QColor(0, 0, 139))  # 深蓝色文字
-
-                # 应用高亮
+                selection.format.setBackground(QColor(173, 216, 230))
+                selection.format.setForeground(QColor(0, 0, 139))
                 extra_selections.append(selection)
-                found = True
 
-                # 记录第一个匹配项的位置
-                if first_match_cursor is None:
-                    first_match_cursor = self.text_display.textCursor()
-                    first_match_cursor.setPosition(search_cursor.selectionStart())
+            # 清除旧高亮、设置新高亮、滚动定位合并为一次重绘
+            self.text_display.setUpdatesEnabled(False)
+            try:
+                self.clear_text_highlights()
+                if extra_selections:
+                    self.text_display.setExtraSelections(extra_selections)
 
-                # 移动光标到找到的内容之后，防止重复匹配
-                search_cursor.movePosition(search_cursor.Right, search_cursor.MoveAnchor, len(clean_content))
-                search_count += 1
+                # 滚动到第一个匹配项的位置，无匹配时回到文本开始
+                cursor = self.text_display.textCursor()
+                if extra_selections:
+                    cursor.setPosition(extra_selections[0].cursor.selectionStart())
+                else:
+                    cursor.movePosition(QTextCursor.Start)
+                self.text_display.setTextCursor(cursor)
+                self.text_display.ensureCursorVisible()  # 确保光标位置可见
+            finally:
+                self.text_display.setUpdatesEnabled(True)
+                self.text_display.viewport().update()
 
             if extra_selections:
-                self.text_display.setExtraSelections(extra_selections)
-
-            # 如果内容与某个编码相关，也高亮编码标记
-            code_id = self.get_code_id_by_content(clean_content)
-            if code_id:
-                pattern = f"[{code_id}]"
-                code_cursor = self.text_display.textCursor()
-                code_cursor.movePosition(code_cursor.Start)
-
-                code_search_count = 0
-                while code_search_count < max_searches:
-                    code_cursor = self.text_document.find(pattern, code_cursor, QTextDocument.FindCaseSensitively)
-                    if code_cursor.isNull():
-                        break
-
-                    # 设置编码标记的高亮格式 - 保持默认样式，不进行高亮
-                    # code_highlight_format = code_cursor.charFormat()
-                    # code_highlight_format.setBackground(QColor(255, 255, 255))  # 白色背景
-                    # code_highlight_format.setForeground(QColor(0, 0, 0))  # 黑色文字
-                    # code_cursor.mergeCharFormat(code_highlight_format)
-
-                    # 保持编码标记的默认样式，不进行任何高亮
-
-                    # 移动光标到找到的内容之后，防止重复匹配
-                    code_cursor.movePosition(code_cursor.Right, code_cursor.MoveAnchor, len(pattern))
-                    code_search_count += 1
-
-            if found and first_match_cursor:
-                # 滚动到第一个匹配项的位置
-                self.text_display.setTextCursor(first_match_cursor)
-                self.text_display.ensureCursorVisible()  # 确保光标位置可见
                 self.statusBar().showMessage(f"已高亮内容: {clean_content[:50]}...，并定位到第一个匹配项") if hasattr(self,
                                                                                                       'statusBar') else None
             else:
@@ -4652,6 +4699,7 @@ class ManualCodingDialog(QDialog):
                 self.current_codes = tree_data["current_codes"]
             if "unclassified_first_codes" in tree_data:
                 self.unclassified_first_codes = tree_data["unclassified_first_codes"]
+            self._invalidate_first_content_set()
 
             # 从序列化的树结构重建树
             if "tree_structure" in tree_data:
@@ -4663,7 +4711,6 @@ class ManualCodingDialog(QDialog):
 
         except Exception as e:
             logger.error(f"重建树形结构失败: {e}")
-            import traceback
             traceback.print_exc()
             # 回退到使用update_coding_tree方法
             self.update_coding_tree()
@@ -4795,6 +4842,7 @@ class ManualCodingDialog(QDialog):
                             self.current_codes = imported_data['current_codes']
                         if 'unclassified_first_codes' in imported_data:
                             self.unclassified_first_codes = imported_data['unclassified_first_codes']
+                        self._invalidate_first_content_set()
 
                     # 刷新当前文件显示（以显示恢复的编码标记）
                     if files_with_marks:
@@ -4864,6 +4912,7 @@ class ManualCodingDialog(QDialog):
 
                     if 'unclassified_first_codes' in coding_data:
                         self.unclassified_first_codes = coding_data['unclassified_first_codes']
+                    self._invalidate_first_content_set()
 
                     if 'higher_level_data' in coding_data:
                         self.higher_level_data = coding_data['higher_level_data']
@@ -5178,15 +5227,12 @@ class ManualCodingDialog(QDialog):
 
                 except Exception as e:
                     logger.error(f"处理句子链接点击时出错: {e}")
-                    import traceback
                     traceback.print_exc()
                     # 不要弹出错误对话框，避免影响用户体验
 
             text_display.anchorClicked.connect(handle_link_clicked)
 
             # ========== 右键菜单功能 ==========
-            from PyQt5.QtWidgets import QMenu
-
             # 存储当前点击的句子信息
             current_sentence_key = None
 
@@ -5401,7 +5447,6 @@ class ManualCodingDialog(QDialog):
 
                 except Exception as e:
                     logger.error(f"更新sentence_details失败: {e}")
-                    import traceback
                     traceback.print_exc()
 
             # 设置右键菜单
@@ -5426,7 +5471,6 @@ class ManualCodingDialog(QDialog):
 
         except Exception as e:
             logger.error(f"显示句子详情对话框时出错: {e}")
-            import traceback
             traceback.print_exc()
             # 不弹出错误消息框，避免闪退
             try:
@@ -5538,8 +5582,6 @@ class ManualCodingDialog(QDialog):
 
     def show_tree_context_menu(self, position):
         """显示树形控件上下文菜单"""
-        from PyQt5.QtWidgets import QMenu, QAction
-
         menu = QMenu()
 
         edit_action = QAction("编辑", self)
@@ -6201,152 +6243,68 @@ class ManualCodingDialog(QDialog):
         level = item_data.get("level")
         old_content = current_item.text(0)
 
-        if level == 1:
-            dialog = QDialog(self)
-            dialog.setWindowTitle("编辑一阶编码")
-            dialog.resize(600, 600)  # 增大对话框尺寸
-
-            layout = QVBoxLayout(dialog)
-
-            label = QLabel(f"编辑一阶编码 (当前: {old_content[:20]}{'...' if len(old_content) > 20 else ''}):")
-            layout.addWidget(label)
-
-            text_edit = QTextEdit()
-            text_edit.setPlainText(old_content)
-            text_edit.setMinimumHeight(250)
-            text_edit.setMaximumHeight(350)
-            layout.addWidget(text_edit)
-
-            button_layout = QHBoxLayout()
-            ok_button = QPushButton("确定")
-            cancel_button = QPushButton("取消")
-            button_layout.addWidget(ok_button)
-            button_layout.addWidget(cancel_button)
-            layout.addLayout(button_layout)
-
-            def on_ok():
-                new_content = text_edit.toPlainText().strip()
-                if not new_content:
-                    QMessageBox.warning(dialog, "警告", "一阶编码内容不能为空")
-                    return
-
-                is_valid, clean_content, error_msg = self.validate_category_name(new_content, "first")
-                if not is_valid:
-                    QMessageBox.warning(dialog, "验证错误", error_msg)
-                    return
-
-                if clean_content != old_content:
-                    current_item.setText(0, clean_content)
-                    item_data["content"] = clean_content
-                    item_data["numbered_content"] = clean_content  # 更新带编号的内容
-                    current_item.setData(0, Qt.UserRole, item_data)
-                    self.update_structured_codes_from_tree()
-                    logger.info(f"修改一阶编码: {old_content} → {clean_content}")
-
-                dialog.accept()
-
-            ok_button.clicked.connect(on_ok)
-            cancel_button.clicked.connect(dialog.reject)
-
-            dialog.exec_()
-
-        elif level == 2:
-            # 编辑二阶编码
-            dialog = QDialog(self)
-            dialog.setWindowTitle("编辑二阶编码")
-            dialog.resize(600, 500)  # 增大对话框尺寸
-
-            layout = QVBoxLayout(dialog)
-
-            label = QLabel(f"编辑二阶编码 (当前: {old_content[:20]}{'...' if len(old_content) > 20 else ''}):")
-            layout.addWidget(label)
-
-            text_edit = QTextEdit()
-            text_edit.setPlainText(old_content)
-            text_edit.setMinimumHeight(250)  # 增加最小高度
-            text_edit.setMaximumHeight(350)  # 设置最大高度
-            layout.addWidget(text_edit)
-
-            button_layout = QHBoxLayout()
-            ok_button = QPushButton("确定")
-            cancel_button = QPushButton("取消")
-            button_layout.addWidget(ok_button)
-            button_layout.addWidget(cancel_button)
-            layout.addLayout(button_layout)
-
-            def on_ok():
-                new_name = text_edit.toPlainText().strip()
-                if not new_name:
-                    QMessageBox.warning(dialog, "警告", "二阶编码名称不能为空")
-                    return
-
-                is_valid, clean_name, error_msg = self.validate_category_name(new_name, "second")
-                if not is_valid:
-                    QMessageBox.warning(dialog, "验证错误", error_msg)
-                    return
-
-                if clean_name != old_content:
-                    current_item.setText(0, clean_name)
-                    item_data["name"] = clean_name
-                    current_item.setData(0, Qt.UserRole, item_data)
-                    self.update_structured_codes_from_tree()
-                    logger.info(f"修改二阶编码: {old_content} → {clean_name}")
-
-                dialog.accept()
-
-            ok_button.clicked.connect(on_ok)
-            cancel_button.clicked.connect(dialog.reject)
+        level_name = {1: "一阶", 2: "二阶", 3: "三阶"}.get(level)
+        if not level_name:
+            return
 
-            dialog.exec_()
+        dialog, text_edit, ok_button = self._make_edit_dialog(
+            f"编辑{level_name}编码", old_content, 600 if level == 1 else 500)
 
-        elif level == 3:
-            # 编辑三阶编码
-            dialog = QDialog(self)
-            dialog.setWindowTitle("编辑三阶编码")
-            dialog.resize(600, 500)  # 增大对话框尺寸
+        def on_ok():
+            new_value = text_edit.toPlainText().strip()
+            if not new_value:
+                QMessageBox.warning(dialog, "警告",
+                                    f"{level_name}编码{'内容' if level == 1 else '名称'}不能为空")
+                return
 
-            layout = QVBoxLayout(dialog)
+            is_valid, clean_value, error_msg = self.validate_category_name(
+                new_value, {1: "first", 2: "second", 3: "third"}[level])
+            if not is_valid:
+                QMessageBox.warning(dialog, "验证错误", error_msg)
+                return
 
-            label = QLabel(f"编辑三阶编码 (当前: {old_content[:20]}{'...' if len(old_content) > 20 else ''}):")
-            layout.addWidget(label)
+            if clean_value != old_content:
+                current_item.setText(0, clean_value)
+                if level == 1:
+                    item_data["content"] = clean_value
+                    item_data["numbered_content"] = clean_value  # 更新带编号的内容
+                else:
+                    item_data["name"] = clean_value
+                current_item.setData(0, Qt.UserRole, item_data)
+                self.update_structured_codes_from_tree()
+                logger.info(f"修改{level_name}编码: {old_content} → {clean_value}")
 
-            text_edit = QTextEdit()
-            text_edit.setPlainText(old_content)
-            text_edit.setMinimumHeight(250)  # 增加最小高度
-            text_edit.setMaximumHeight(350)  # 设置最大高度
-            layout.addWidget(text_edit)
+            dialog.accept()
 
-            button_layout = QHBoxLayout()
-            ok_button = QPushButton("确定")
-            cancel_button = QPushButton("取消")
-            button_layout.addWidget(ok_button)
-            button_layout.addWidget(cancel_button)
-            layout.addLayout(button_layout)
+        ok_button.clicked.connect(on_ok)
+        dialog.exec_()
 
-            def on_ok():
-                new_name = text_edit.toPlainText().strip()
-                if not new_name:
-                    QMessageBox.warning(dialog, "警告", "三阶编码名称不能为空")
-                    return
+    def _make_edit_dialog(self, title: str, initial: str, height: int):
+        """构建编码编辑对话框，返回 (对话框, 文本框, 确定按钮)，确定按钮由调用方连接"""
+        dialog = QDialog(self)
+        dialog.setWindowTitle(title)
+        dialog.resize(600, height)  # 增大对话框尺寸
 
-                is_valid, clean_name, error_msg = self.validate_category_name(new_name, "third")
-                if not is_valid:
-                    QMessageBox.warning(dialog, "验证错误", error_msg)
-                    return
+        layout = QVBoxLayout(dialog)
 
-                if clean_name != old_content:
-                    current_item.setText(0, clean_name)
-                    item_data["name"] = clean_name
-                    current_item.setData(0, Qt.UserRole, item_data)
-                    self.update_structured_codes_from_tree()
-                    logger.info(f"修改三阶编码: {old_content} → {clean_name}")
+        label = QLabel(f"{title} (当前: {initial[:20]}{'...' if len(initial) > 20 else ''}):")
+        layout.addWidget(label)
 
-                dialog.accept()
+        text_edit = QTextEdit()
+        text_edit.setPlainText(initial)
+        text_edit.setMinimumHeight(250)  # 增加最小高度
+        text_edit.setMaximumHeight(350)  # 设置最大高度
+        layout.addWidget(text_edit)
 
-            ok_button.clicked.connect(on_ok)
-            cancel_button.clicked.connect(dialog.reject)
+        button_layout = QHBoxLayout()
+        ok_button = QPushButton("确定")
+        cancel_button = QPushButton("取消")
+        button_layout.addWidget(ok_button)
+        button_layout.addWidget(cancel_button)
+        layout.addLayout(button_layout)
 
-            dialog.exec_()
+        cancel_button.clicked.connect(dialog.reject)
+        return dialog, text_edit, ok_button
 
     def batch_edit_tree_items(self, items):
         """批量编辑多个选中的编码节点"""
@@ -6582,9 +6540,16 @@ class ManualCodingDialog(QDialog):
 
     def update_structured_codes_from_tree(self):
         """从树形结构更新编码数据"""
-        self.current_codes = {}
-        self.unclassified_first_codes = []
-        self.higher_level_data = []
+        # 编码树尚未构建时先按已加载的数据构建，否则会用空树覆盖编码数据
+        if self._coding_tree_pending:
+            self.update_coding_tree()
+        # 本次即整树重建：清除挂起标记，结果直接写入底层字段并绑定到局部变量，
+        # 循环中不再反复经过属性的挂起检查
+        self._codes_dirty = False
+        codes = self._current_codes = {}
+        unclassified_codes = self._unclassified_first_codes = []
+        higher_level_data = self._higher_level_data = []
+        self._invalidate_first_content_set()
 
         for i in range(self.coding_tree.topLevelItemCount()):
             top_item = self.coding_tree.topLevelItem(i)
@@ -6596,7 +6561,7 @@ class ManualCodingDialog(QDialog):
             level = item_data.get("level")
 
             if level in (4, 5, 6):
-                self.higher_level_data.append(self._extract_item_data(top_item))
+                higher_level_data.append(self._extract_item_data(top_item))
                 self._process_subtree(top_item)
             elif level == 3:
                 # 三阶编码
@@ -6609,7 +6574,7 @@ class ManualCodingDialog(QDialog):
                 else:
                     third_name = third_display_name
 
-                self.current_codes[third_display_name] = {}
+                second_codes = codes[third_display_name] = {}
 
                 for j in range(top_item.childCount()):
                     second_item = top_item.child(j)
@@ -6622,7 +6587,7 @@ class ManualCodingDialog(QDialog):
                     else:
                         second_name = second_display_name
 
-                    self.current_codes[third_display_name][second_display_name] = []
+                    first_codes = second_codes[second_display_name] = []
 
                     for k in range(second_item.childCount()):
                         first_item = second_item.child(k)
@@ -6644,11 +6609,11 @@ class ManualCodingDialog(QDialog):
                                 if match:
                                     first_item_data["code_id"] = match.group(1)
                             # 修复：应该添加到正确的嵌套结构中，而不是未分类编码
-                            self.current_codes[third_display_name][second_display_name].append(first_item_data)
+                            first_codes.append(first_item_data)
                         else:
                             # 后备方案：使用文本内容
                             first_content = first_item.text(0)
-                            self.current_codes[third_display_name][second_display_name].append(first_content)
+                            first_codes.append(first_content)
 
             elif level == 1:
                 # 未分类的一阶编码
@@ -6665,18 +6630,12 @@ class ManualCodingDialog(QDialog):
                             match = re.match(r'^(A\d+)', top_display_text)
                             if match:
                                 item_data["code_id"] = match.group(1)
-                        self.unclassified_first_codes.append(item_data)
+                        unclassified_codes.append(item_data)
                     else:
                         content = top_item.text(0)
-                        self.unclassified_first_codes.append(content)
+                        unclassified_codes.append(content)
 
-        # 调试输出
-        print(f"DEBUG: 更新后 current_codes 结构:")
-        for third_cat, second_cats in self.current_codes.items():
-            print(f"  {third_cat}: {len(second_cats)} 个二阶编码")
-            for second_cat, first_contents in second_cats.items():
-                print(f"    {second_cat}: {len(first_contents)} 个一阶编码")
-        print(f"DEBUG: 未分类一阶编码: {len(self.unclassified_first_codes)} 个")
+        logger.debug(f"更新后 current_codes: {len(codes)} 个三阶编码，未分类一阶编码: {len(unclassified_codes)} 个")
 
     def _extract_item_data(self, item):
         """递归提取树形节点数据"""
@@ -6720,15 +6679,15 @@ class ManualCodingDialog(QDialog):
         existing_names = set()
         for i in range(self.coding_tree.topLevelItemCount()):
             existing_names.add(self.coding_tree.topLevelItem(i).text(0))
-        for item_data in higher_items:
-            if item_data.get('text', '') not in existing_names:
-                item = self._rebuild_item_from_data(item_data)
-                self.coding_tree.addTopLevelItem(item)
+        self.coding_tree.addTopLevelItems([
+            self._rebuild_item_from_data(item_data) for item_data in higher_items
+            if item_data.get('text', '') not in existing_names])
 
     def _process_subtree(self, parent_item):
         """递归处理高阶编码下的子树，将3阶及以下内容提取到current_codes"""
         if not parent_item:
             return
+        codes = self._current_codes
         for i in range(parent_item.childCount()):
             child = parent_item.child(i)
             child_data = child.data(0, Qt.UserRole) or {}
@@ -6745,7 +6704,7 @@ class ManualCodingDialog(QDialog):
                 else:
                     third_name = third_display_name
 
-                self.current_codes[third_display_name] = {}
+                second_codes = codes[third_display_name] = {}
 
                 for j in range(child.childCount()):
                     second_item = child.child(j)
@@ -6756,17 +6715,17 @@ class ManualCodingDialog(QDialog):
                     else:
                         second_name = second_display_name
 
-                    self.current_codes[third_display_name][second_display_name] = []
+                    first_codes = second_codes[second_display_name] = []
 
                     for k in range(second_item.childCount()):
                         first_item = second_item.child(k)
                         first_item_data = first_item.data(0, Qt.UserRole)
                         if first_item_data and isinstance(first_item_data, dict):
                             import copy
-                            self.current_codes[third_display_name][second_display_name].append(copy.deepcopy(first_item_data))
+                            first_codes.append(copy.deepcopy(first_item_data))
                         else:
                             first_content = first_item.text(0)
-                            self.current_codes[third_display_name][second_display_name].append(first_content)
+                            first_codes.append(first_content)
 
     def _collect_third_names(self, item_data, covered: set):
         """递归收集高阶编码下已有的三阶编码名称"""
@@ -6781,7 +6740,14 @@ class ManualCodingDialog(QDialog):
 
     def update_coding_tree(self):
         """更新编码结构树"""
+        # 整树按 current_codes 重建，推迟的首次构建随之完成
+        self._coding_tree_pending = False
+        tree = self.coding_tree
+        signals_were_blocked = tree.signalsBlocked()
         try:
+            # 下面会把字符串条目原地转换为字典，索引需要重建
+            self._invalidate_first_content_set()
+
             # 保存高阶编码数据以便重建后恢复
             higher_items = self._save_higher_level_items()
 
@@ -6885,7 +6851,11 @@ class ManualCodingDialog(QDialog):
                     existing_a_ids.add(new_id)
             # ---------------------------------------------------------
 
-            self.coding_tree.clear()
+            # 批量重建：暂停重绘与信号，节点先离线构建，最后一次性挂载到树上
+            tree.setUpdatesEnabled(False)
+            tree.blockSignals(True)
+            tree.clear()
+            top_items = []
 
             # 添加三阶编码及其子节点
             for third_cat, second_cats in self.current_codes.items():
@@ -6902,7 +6872,8 @@ class ManualCodingDialog(QDialog):
                     third_code_id = "C01"  # 默认ID
                     third_name = third_cat
 
-                third_item = QTreeWidgetItem(self.coding_tree)
+                third_item = QTreeWidgetItem()
+                top_items.append(third_item)
                 third_item.setText(0, third_cat)  # 显示带编号的名称
                 third_item.setText(1, "三阶编码")
                 third_item.setData(0, Qt.UserRole, {"level": 3, "name": third_name, "code_id": third_code_id})
@@ -7196,7 +7167,8 @@ class ManualCodingDialog(QDialog):
 
             # 添加未分类的一阶编码
             for first_code in self.unclassified_first_codes:
-                first_item = QTreeWidgetItem(self.coding_tree)
+                first_item = QTreeWidgetItem()
+                top_items.append(first_item)
 
                 # 处理first_code，它可能是一个字典或字符串
                 if isinstance(first_code, dict):
@@ -7283,7 +7255,8 @@ class ManualCodingDialog(QDialog):
                         "classified": False
                     })
 
-            self.coding_tree.expandAll()
+            tree.addTopLevelItems(top_items)
+            tree.expandAll()
 
             # 恢复高阶编码（4-6阶）
             self._restore_higher_level_items(higher_items)
@@ -7291,24 +7264,13 @@ class ManualCodingDialog(QDialog):
         except Exception as e:
             logger.error(f"更新编码结构树时出错: {e}")
             QMessageBox.critical(self, "错误", f"更新编码结构树时出错: {e}")
+        finally:
+            tree.blockSignals(signals_were_blocked)
+            tree.setUpdatesEnabled(True)
 
     def validate_category_name(self, name, level):
         """验证编码名称"""
-        if not name:
-            return False, "", "编码名称不能为空"
-
-        if level == "first":
-            if len(name) > 300:
-                return False, "", "一阶编码名称不能超过300个字符"
-        elif level == "second":
-            if len(name) > 100:
-                return False, "", "二阶编码名称不能超过100个字符"
-        elif level == "third":
-            if len(name) > 100:
-                return False, "", "三阶编码名称不能超过100个字符"
-
-        clean_name = name.strip()
-        return True, clean_name.strip(), ""
+        return _validate_category_name(name, level)
 
     def validate_first_level_quality(self, content):
         import re
@@ -7377,36 +7339,28 @@ class ManualCodingDialog(QDialog):
 
     def generate_third_code_id(self):
         """生成三阶编码ID：C01, C02, C03...（C开头，数字递增）"""
+        return self._scan_top_level_thirds()[0]
+
+    def _scan_top_level_thirds(self):
+        """遍历一次顶层节点，返回 (下一个三阶编码ID, 已有顶层三阶编码显示名称集合)"""
         # 统计所有已存在的三阶编码ID，找到最大的编号
         existing_numbers = []
+        third_names = set()
         for i in range(self.coding_tree.topLevelItemCount()):
             top_item = self.coding_tree.topLevelItem(i)
             top_data = top_item.data(0, Qt.UserRole)
             if top_data and top_data.get("level") == 3:
                 top_text = top_item.text(0)
-                # 提取开头的字母
-                if top_text and len(top_text) > 0:
-                    # 分割显示名称，获取编号部分
-                    import re
-                    parts = top_text.split(' ', 1)
-                    if len(parts) > 0:
-                        code_part = parts[0]
-                        # 检查编号是否以字母开头并有两位数字
-                        match = re.match(r'^([A-Z])(\d{2})$', code_part)
-                        if match:
-                            letter_part = match.group(1)
-                            number_part = match.group(2)
-                            # 如果是C开头的编号，则记录数字
-                            if letter_part == 'C':
-                                existing_numbers.append(int(number_part))
-
-        # 找到下一个可用的编号
-        if existing_numbers:
-            next_number = max(existing_numbers) + 1
-        else:
-            next_number = 1  # 从1开始
+                third_names.add(top_text)
+                # 分割显示名称，检查编号是否为 C 开头加两位数字
+                if top_text:
+                    match = _RE_THIRD_CODE_ID.match(top_text.split(' ', 1)[0])
+                    if match:
+                        existing_numbers.append(int(match.group(1)))
 
-        return f"C{next_number:02d}"
+        # 找到下一个可用的编号（从1开始）
+        next_number = max(existing_numbers) + 1 if existing_numbers else 1
+        return f"C{next_number:02d}", third_names
 
     def generate_fourth_code_id(self):
         """生成四阶编码ID：D01, D02, D03...（D开头，数字递增）"""
@@ -7809,14 +7763,12 @@ class ManualCodingDialog(QDialog):
                             QMessageBox.critical(self, "错误", "导出失败")
                     except Exception as e:
                         logger.error(f"导出标准答案时出错: {e}")
-                        import traceback
                         traceback.print_exc()
                         QMessageBox.critical(self, "错误", f"导出失败: {str(e)}")
                 else:
                     QMessageBox.critical(self, "错误", "父窗口缺少 standard_answer_manager\n\n请通过主界面启动手动编码功能")
         except Exception as e:
             logger.error(f"导出标准答案失败: {e}")
-            import traceback
             traceback.print_exc()
             QMessageBox.critical(self, "错误", f"导出失败: {str(e)}")
 
@@ -8040,7 +7992,6 @@ class ManualCodingDialog(QDialog):
             self.first_content_edit.clear()
 
             # 更新结构化编码数据
-            print("DEBUG: 添加编码后更新数据结构")
             self.update_structured_codes_from_tree()
 
             logger.info(f"添加一阶编码(未分类): {code_id} - {clean_content}")
@@ -8049,7 +8000,6 @@ class ManualCodingDialog(QDialog):
 
         except Exception as e:
             logger.error(f"添加一阶编码失败: {e}")
-            import traceback
             traceback.print_exc()
             QMessageBox.critical(self, "错误", f"添加一阶编码失败:\n{str(e)}")
 
@@ -8121,6 +8071,7 @@ class ManualCodingDialog(QDialog):
                     if old_content in self.unclassified_first_codes:
                         index = self.unclassified_first_codes.index(old_content)
                         self.unclassified_first_codes[index] = clean_content
+                        self._invalidate_first_content_set()
                         self.update_first_codes_display()
                         logger.info(f"修改未分类一阶编码: {old_content} → {clean_content}")
                 else:
@@ -8137,6 +8088,7 @@ class ManualCodingDialog(QDialog):
                             old_content in self.current_codes[third_name][parent_name]):
                         index = self.current_codes[third_name][parent_name].index(old_content)
                         self.current_codes[third_name][parent_name][index] = clean_content
+                        self._invalidate_first_content_set()
                         self.update_first_codes_display()
                         logger.info(f"修改一阶编码: {old_content} → {clean_content}")
 
@@ -8180,6 +8132,7 @@ class ManualCodingDialog(QDialog):
                 # 删除未分类编码
                 if content in self.unclassified_first_codes:
                     self.unclassified_first_codes.remove(content)
+                    self._invalidate_first_content_set()
                     self.update_first_codes_display()
                     logger.info(f"删除未分类一阶编码: {content}")
                     QMessageBox.information(self, "成功", "一阶编码已删除")
@@ -8189,6 +8142,7 @@ class ManualCodingDialog(QDialog):
                         parent_name in self.current_codes[third_name] and
                         content in self.current_codes[third_name][parent_name]):
                     self.current_codes[third_name][parent_name].remove(content)
+                    self._invalidate_first_content_set()
                     self.update_first_codes_display()
                     logger.info(f"删除一阶编码: {content} (在 {third_name}/{parent_name} 下)")
                     QMessageBox.information(self, "成功", "一阶编码已删除")
@@ -8313,6 +8267,7 @@ class ManualCodingDialog(QDialog):
             # 从未分类列表移除
             if content in self.unclassified_first_codes:
                 self.unclassified_first_codes.remove(content)
+                self._invalidate_first_content_set()
 
             # 添加到指定位置
             if content not in self.current_codes[clean_third][clean_second]:
@@ -8517,7 +8472,6 @@ class ManualCodingDialog(QDialog):
 
         except Exception as e:
             logger.error(f"更新父级句子来源数失败: {e}")
-            import traceback
             traceback.print_exc()
 
     def handle_drop_on_tree(self, event):
@@ -8893,7 +8847,6 @@ class ManualCodingDialog(QDialog):
                     event.ignore()
         except Exception as e:
             logger.error(f"处理拖放事件失败: {e}")
-            import traceback
             traceback.print_exc()
             event.ignore()
 
@@ -8952,7 +8905,6 @@ class ManualCodingDialog(QDialog):
 
         except Exception as e:
             logger.error(f"添加编码标记失败: {e}")
-            import traceback
             traceback.print_exc()
 
     def get_coding_result(self):
@@ -9080,10 +9032,12 @@ class ManualCodingDialog(QDialog):
             # 更新文本显示
             if display_content and display_content != "文件内容为空":
                 self.text_display.setPlainText(display_content)
+                self._current_text_path = file_path
                 self.select_sentence_btn.setEnabled(True)
                 logger.info(f"已刷新文件显示: {os.path.basename(file_path)}")
             else:
                 self.text_display.setPlainText("文件内容为空")
+                self._current_text_path = None
                 self.select_sentence_btn.setEnabled(False)
 
         except Exception as e:
@@ -9112,6 +9066,7 @@ class ManualCodingDialog(QDialog):
                         if file_path == current_file_path:
                             display_content = file_data['content_with_marks']
                             self.text_display.setPlainText(display_content)
+                            self._current_text_path = file_path
                             if display_content and display_content != "文件内容为空":
                                 self.select_sentence_btn.setEnabled(True)
                             else:
@@ -9193,6 +9148,7 @@ class ManualCodingDialog(QDialog):
 
             if 'unclassified_first_codes' in coding_data:
                 self.unclassified_first_codes = coding_data['unclassified_first_codes']
+            self._invalidate_first_content_set()
 
             if 'higher_level_data' in coding_data:
                 self.higher_level_data = coding_data['higher_level_data']
@@ -9248,14 +9204,17 @@ class ManualCodingDialog(QDialog):
 
             self.current_codes = state['current_codes']
             self.unclassified_first_codes = state['unclassified_first_codes']
+            self._invalidate_first_content_set()
             self.higher_level_data = state.get('higher_level_data', [])
             self.loaded_files = state['loaded_files']
+            self._sentence_file_index = None
 
             self.rebuild_tree_from_data(state['tree_data'])
 
             current_file = self.get_current_file_path()
             if current_file and current_file in self.loaded_files:
                 self.text_display.setPlainText(state['text_content'])
+                self._current_text_path = None
 
             self.update_structured_codes_from_tree()
 
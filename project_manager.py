@@ -32,6 +32,9 @@ class ProjectManager:
         os.makedirs(self.manual_coding_dir, exist_ok=True)
         os.makedirs(self.coding_tree_dir, exist_ok=True)
 
+        # 项目列表缓存：(主界面项目目录的 mtime_ns, 项目列表)
+        self._projects_cache = None
+
     def save_project(self, project_name: str, loaded_files: Dict[str, Any], structured_codes: Dict[str, Any]) -> bool:
         """保存项目到主界面项目保存文件夹"""
         try:
@@ -94,6 +97,7 @@ class ProjectManager:
                     # 保存文档
                     doc.save(numbered_docx_path)
 
+            self.invalidate_cache()
             logger.info(f"项目已保存: {project_name} 到 {project_dir}")
             return True
 
@@ -128,8 +132,19 @@ class ProjectManager:
             logger.error(f"加载项目失败: {e}")
             return None, None
 
+    def invalidate_cache(self):
+        """清除项目列表缓存"""
+        self._projects_cache = None
+
     def get_projects_list(self) -> list:
-        """获取主界面项目列表"""
+        """获取主界面项目列表（目录未变化时复用上次扫描结果）"""
+        try:
+            mtime = os.stat(self.main_projects_dir).st_mtime_ns
+        except OSError:
+            mtime = None
+        if mtime is not None and self._projects_cache is not None and self._projects_cache[0] == mtime:
+            return list(self._projects_cache[1])
+
         projects = []
         if os.path.exists(self.main_projects_dir):
             for item in os.listdir(self.main_projects_dir):
@@ -159,7 +174,8 @@ class ProjectManager:
 
         # 按更新时间排序，最新的在前
         projects.sort(key=lambda x: x.get("updated_at", ""), reverse=True)
-        return projects
+        self._projects_cache = (mtime, projects) if mtime is not None else None
+        return list(projects)
 
     def get_latest_project(self) -> str:
         """获取最新的项目名称"""
@@ -0,0 +1,65 @@
+import pytest
+
+pytest.importorskip("PyQt5")
+main_window = pytest.importorskip("main_window")
+
+MainWindow = main_window.MainWindow
+
+
+def _merge(auto_codes, manual_codes):
+    # _merge_coding_results 只通过 self 调用静态方法 _merge_dedup_key，传入类即可
+    return MainWindow._merge_coding_results(MainWindow, auto_codes, manual_codes)
+
+
+def test_merge_dedups_same_content_from_different_files():
+    auto = {"C01 三阶": {"B01 二阶": [{"content": "审批流程繁琐", "file_path": "a.docx"}]}}
+    manual = {"C01 三阶": {"B01 二阶": [{"content": "审批流程繁琐", "file_path": "b.docx"},
+                                    {"content": "沟通成本高", "file_path": "b.docx"}]}}
+
+    merged = _merge(auto, manual)
+
+    contents = [entry["content"] for entry in merged["C01 三阶"]["B01 二阶"]]
+    assert contents == ["审批流程繁琐", "沟通成本高"]
+
+
+def test_merge_handles_unhashable_entries_without_collisions():
+    auto = {"C01": {"B01": ["[1, 2]"]}}
+    manual = {"C01": {"B01": [[1, 2], [1, 2], {"content": ["x"]}, {"content": ["x"]}]}}
+
+    merged = _merge(auto, manual)
+
+    # 列表与内容相同的 JSON 字符串不相撞；重复的不可哈希条目只保留一次
+    assert merged["C01"]["B01"] == ["[1, 2]", [1, 2], {"content": ["x"]}]
+
+
+def test_merge_dedup_key_is_hashable():
+    assert MainWindow._merge_dedup_key("abc") == "abc"
+    key = MainWindow._merge_dedup_key({"b": [1], "a": 2})
+    hash(key)
+    assert key == MainWindow._merge_dedup_key({"a": 2, "b": [1]})
+    assert key != MainWindow._merge_dedup_key('{"a": 2, "b": [1]}')
+
+
+def test_format_sentence_ids_sorts_numbers_numerically_before_others():
+    assert MainWindow._format_sentence_ids({"10", "2", "[A01]", "1"}) == "1, 2, 10, A01"
+    assert MainWindow._format_sentence_ids([]) == ""
+
+
+def test_scan_sentence_positions_plain_text():
+    text = "第一句。[1] 第二句。[2][A01] 第三句。[3]"
+
+    positions = MainWindow._scan_sentence_positions(text)
+
+    assert positions["1"] == [(0, text.index("[1]") + 3)]
+    # 下一句从上一个编号之后开始，句末包含紧随的编码标记
+    assert positions["2"] == [(text.index("[1]") + 3, text.index("[A01]") + 5)]
+
+
+def test_scan_sentence_positions_counts_non_bmp_characters_as_two():
+    text = "😀开头。[1] 𠀀第二句。[2]"
+
+    positions = MainWindow._scan_sentence_positions(text)
+
+    # QTextDocument 位置按 UTF-16 计数：每个 BMP 以外字符之后的位置都要加一
+    assert positions["1"] == [(0, text.index("[1]") + 3 + 1)]
+    assert positions["2"] == [(text.index("[1]") + 3 + 1, text.index("[2]") + 3 + 2)]
@@ -269,16 +269,19 @@ class WorkspacePage(QWidget):
         if not file_path:
             return
 
+        # 记录当前显示的文件，主窗口据此跳过重复的文件切换
+        self.mw._current_displayed_file = file_path
+
         if hasattr(self.mw, 'auto_coding_cache') and file_path in self.mw.auto_coding_cache:
-            self.text_display.setText(self.mw.auto_coding_cache[file_path])
+            self.text_display.setPlainText(self.mw.auto_coding_cache[file_path])
             return
 
         if file_path in self.mw.loaded_files:
             file_data = self.mw.loaded_files[file_path]
             if 'numbered_content' in file_data and file_data['numbered_content']:
-                self.text_display.setText(file_data['numbered_content'])
+                self.text_display.setPlainText(file_data['numbered_content'])
             else:
-                self.text_display.setText(file_data['content'])
+                self.text_display.setPlainText(file_data['content'])
 
     def _on_file_tree_context_menu(self, tree, pos):
         """文件树右键菜单"""